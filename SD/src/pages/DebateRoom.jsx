@@ -13,6 +13,7 @@ const GameStyleCourtroom = () => {
   const [isTimerRunning, setIsTimerRunning] = useState(false);
   const [setJudgmentInProgress] = useState(false);
   const [finalJudgment, setFinalJudgment] = useState(null);
+  const [debateId, setDebateId] = useState(null);
 
   const messagesEndRef = useRef(null);
   const timerRef = useRef(null);
@@ -28,6 +29,27 @@ const GameStyleCourtroom = () => {
     "Should there be stricter regulation of news media to combat misinformation?"
   ];
   
+  // POST to a debate endpoint with just the debate ID, falling back to the
+  // full history if the server no longer has the debate (e.g. it restarted)
+  const postDebate = async (path, sessionBody, fullBody) => {
+    const post = (body) => fetch(`${BACKEND_URL}${path}`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify(body)
+    });
+    
+    if (debateId) {
+      const response = await post({ debate_id: debateId, ...sessionBody });
+      if (response.status !== 404) {
+        return response;
+      }
+      setDebateId(null);
+    }
+    return post(fullBody);
+  };
+  
   // Format time as MM:SS
   const formatTime = (seconds) => {
     const mins = Math.floor(seconds / 60).toString().padStart(2, '0');
@@ -110,6 +132,7 @@ const GameStyleCourtroom = () => {
       const data = await response.json();
       
       if (data.success) {
+        setDebateId(data.debate_id || null);
         setGameState('debating');
         setIsTimerRunning(true);
         
@@ -160,15 +183,11 @@ const GameStyleCourtroom = () => {
     
     try {
       // Call the debate response API
-      const response = await fetch(`${BACKEND_URL}/api/debate/respond`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json'
-        },
-        body: JSON.stringify({
-          topic: topic,
-          messages: messages.concat(userMessage)
-        })
+      const response = await postDebate('/api/debate/respond', {
+        message: userMessage.content
+      }, {
+        topic: topic,
+        messages: messages.concat(userMessage)
       });
       
       if (!response.ok) {
@@ -206,15 +225,9 @@ const GameStyleCourtroom = () => {
     
     try {
       // Call the debate judge API
-      const response = await fetch(`${BACKEND_URL}/api/debate/judge`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json'
-        },
-        body: JSON.stringify({
-          topic: topic,
-          messages: messages
-        })
+      const response = await postDebate('/api/debate/judge', {}, {
+        topic: topic,
+        messages: messages
       });
       
       if (!response.ok) {
@@ -257,6 +270,7 @@ const GameStyleCourtroom = () => {
     setDebateTime(300);
     setIsTimerRunning(false);
     setFinalJudgment(null);
+    setDebateId(null);
   };
   
   return (
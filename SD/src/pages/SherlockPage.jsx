@@ -231,6 +231,9 @@ const SherlockPage = () => {
         claim: item.claim,
         assessment: mapResultToAssessment(item.result),
         explanation: item.additional_context || generateExplanation(item.claim, item.result),
+        result: item.result,
+        summary: item.summary || "",
+        contextStatus: item.additional_context ? 'loaded' : (item.result === 'PENDING' ? 'unavailable' : 'idle'),
         type: mapResultToType(item.result),
         detailed_analysis: item.detailed_analysis || "",
         sourceNames: item.source_names || [],
@@ -247,6 +250,37 @@ const SherlockPage = () => {
     }
   };
   
+  // Additional context is generated on demand, so only fetch it when the user expands a claim
+  const loadAdditionalContext = (index) => {
+    const check = factChecks[index];
+    if (!check || check.contextStatus !== 'idle') return;
+
+    const setContextStatus = (status, explanation) => setFactChecks(checks => checks.map((c, i) =>
+      i === index ? { ...c, contextStatus: status, explanation: explanation || c.explanation } : c
+    ));
+
+    setContextStatus('loading');
+    fetch('http://localhost:5002/additional-context', {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ claim: check.claim, result: check.result, summary: check.summary }),
+    })
+      .then(res => res.ok ? res.json() : null)
+      .then(contextData => {
+        if (!contextData || !contextData.additional_context) {
+          setContextStatus('unavailable');
+          return;
+        }
+        setContextStatus('loaded', contextData.additional_context);
+      })
+      .catch(err => {
+        console.error('Error loading additional context:', err);
+        setContextStatus('idle');
+      });
+  };
+  
   // Map backend result to frontend assessment terminology
   const mapResultToAssessment = (result) => {
     switch (result) {
@@ -720,6 +754,15 @@ const SherlockPage = () => {
                             }`}>
                               {check.explanation}
                             </p>
+                            {(check.contextStatus === 'idle' || check.contextStatus === 'loading') && (
+                              <button
+                                onClick={() => loadAdditionalContext(index)}
+                                disabled={check.contextStatus === 'loading'}
+                                className="mt-1 text-xs font-medium text-indigo-700 hover:underline disabled:opacity-50"
+                              >
+                                {check.contextStatus === 'loading' ? 'Loading context...' : 'More context'}
+                              </button>
+                            )}
                             
                             {/* Detailed Analysis */}
                             {check.detailed_analysis && (
@@ -0,0 +1,62 @@
+import os
+import subprocess
+from deadline import stage_timeout
+from youtube_media import FFMPEG_LOCATION
+
+AUDIO_SAMPLE_RATE = 16000
+AUDIO_BITRATE = os.environ.get("AUDIO_BITRATE", "24k")
+AUDIO_TRIM_SILENCE = os.environ.get("AUDIO_TRIM_SILENCE", "1") == "1"
+SILENCE_THRESHOLD = "-40dB"
+SILENCE_MAX_SECONDS = 1.0
+SILENCE_KEEP_SECONDS = 0.6
+PREPARED_AUDIO_EXTENSION = ".ogg"
+
+def ffmpeg_binary(name):
+    """
+    Resolve ffmpeg/ffprobe next to FFMPEG_LOCATION, falling back to PATH
+    """
+    location = FFMPEG_LOCATION
+    if os.path.isdir(location):
+        candidate = os.path.join(location, name)
+    else:
+        candidate = os.path.join(os.path.dirname(location), name)
+    return candidate if os.path.exists(candidate) else name
+
+def probe_duration(audio_file):
+    result = subprocess.run(
+        [ffmpeg_binary("ffprobe"), "-v", "error", "-show_entries", "format=duration",
+         "-of", "default=noprint_wrappers=1:nokey=1", audio_file],
+        capture_output=True, text=True, check=True, timeout=stage_timeout(stage="probing audio")
+    )
+    return float(result.stdout.strip())
+
+def prepared_path_for(audio_file):
+    base, extension = os.path.splitext(audio_file)
+    if extension == PREPARED_AUDIO_EXTENSION:
+        base += ".prepared"
+    return base + PREPARED_AUDIO_EXTENSION
+
+def prepare_audio(input_file, output_file=None):
+    """
+    Downmix to 16 kHz mono Opus and shorten silences longer than a second in a
+    single ffmpeg pass. Speech recognition loses nothing at this rate and the
+    upload is a fraction of an MP3/WAV of the same audio.
+    """
+    output_file = output_file or prepared_path_for(input_file)
+    filters = []
+    if AUDIO_TRIM_SILENCE:
+        filters.append(
+            f"silenceremove=stop_periods=-1:stop_duration={SILENCE_MAX_SECONDS}"
+            f":stop_threshold={SILENCE_THRESHOLD}:stop_silence={SILENCE_KEEP_SECONDS}"
+        )
+    command = [
+        ffmpeg_binary("ffmpeg"), "-hide_banner", "-loglevel", "error", "-y",
+        "-i", input_file, "-vn",
+        "-ac", "1", "-ar", str(AUDIO_SAMPLE_RATE)
+    ]
+    if filters:
+        command += ["-af", ",".join(filters)]
+    command += ["-c:a", "libopus", "-b:a", AUDIO_BITRATE, "-application", "voip", output_file]
+    subprocess.run(command, check=True, timeout=stage_timeout(stage="audio preparation"))
+    print(f"🗜 Prepared audio {input_file} ({os.path.getsize(input_file)} bytes) -> {output_file} ({os.path.getsize(output_file)} bytes)")
+    return output_file
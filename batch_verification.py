@@ -0,0 +1,183 @@
+import json
+import os
+import threading
+import traceback
+from concurrent.futures import Future, TimeoutError
+from deadline import DeadlineExceeded, current_deadline, deadline_context, earliest_deadline, remaining_seconds
+
+BATCH_VERIFICATION_SIZE = int(os.environ.get("BATCH_VERIFICATION_SIZE", 1))
+BATCH_VERIFICATION_WAIT_SECONDS = float(os.environ.get("BATCH_VERIFICATION_WAIT_SECONDS", 0.15))
+
+BATCH_VERIFICATION_PROMPT = """
+You are a world-renowned fact-checker with a reputation for accuracy, clarity, and attention to detail.
+
+I need you to fact-check each of the numbered claims below using the search results provided with that claim.
+Judge every claim only on its own search results.
+
+For each claim determine if it is TRUE, FALSE, or UNVERIFIED.
+
+Your response must be ONLY a JSON array with exactly one object per claim, in this exact format:
+[
+  {
+    "id": 1,
+    "claim": "The claim text",
+    "result": "TRUE/FALSE/UNVERIFIED",
+    "summary": "A concise one-sentence summary of your verdict. Vary your phrasing; don't always start with 'The evidence confirms/refutes'.",
+    "detailed_analysis": "A detailed, evidence-based explanation of your reasoning (3-5 sentences). Provide specific details from the sources that support your conclusion.",
+    "sources": [
+      {
+        "name": "Website or Publication Name",
+        "url": "Source URL"
+      }
+    ]
+  }
+]
+
+Guidelines:
+- Only mark a claim as TRUE if credible sources clearly support it
+- Only mark a claim as FALSE if credible sources clearly refute it
+- Mark as UNVERIFIED if the sources are contradictory, unclear, or insufficient
+- Focus on the most authoritative sources (educational institutions, scientific publications, etc.)
+- Extract the most relevant information from each source
+- Vary your phrasing in the summary for natural reading
+- In your detailed_analysis, be thorough yet concise - explain your reasoning with evidence
+
+Claims:
+"""
+
+def build_batch_prompt(items):
+    prompt = BATCH_VERIFICATION_PROMPT
+    for index, item in enumerate(items, start=1):
+        prompt += f"\n--- Claim {index} ---\nid: {index}\nClaim: {item['claim']}\n"
+        if item.get("context"):
+            prompt += f"Additional Context: {item['context']}\n"
+        prompt += f"Search Results: {item['evidence']}\n"
+    return prompt
+
+def _iter_json_objects(text):
+    """
+    Yield every top-level {...} span in text, skipping braces inside strings
+    """
+    depth = 0
+    start = None
+    in_string = False
+    escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif char == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                yield text[start:i + 1]
+
+def parse_batch_response(content, count):
+    """
+    Return one verdict dict per claim, or None for claims whose verdict is
+    missing or unparseable. Objects are parsed one by one so a single broken
+    item does not lose the rest of the batch.
+    """
+    verdicts = [None] * count
+    for position, object_str in enumerate(_iter_json_objects(content)):
+        try:
+            verdict = json.loads(object_str)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(verdict, dict) or "result" not in verdict:
+            continue
+        try:
+            index = int(verdict.get("id", position + 1)) - 1
+        except (TypeError, ValueError):
+            index = position
+        if 0 <= index < count and verdicts[index] is None:
+            verdict.pop("id", None)
+            verdicts[index] = verdict
+    return verdicts
+
+class VerificationBatcher:
+    """
+    Collects claims being verified at the same time on different threads and
+    sends them to the LLM as one prompt. verify() blocks until the batch
+    answers and returns the claim's verdict dict, or None when batching is off
+    or this claim's verdict could not be parsed, in which case the caller
+    falls back to a single-claim call. A batch is sent under the earliest
+    deadline of its claims, and verify() raises DeadlineExceeded if its own
+    deadline passes first.
+    """
+
+    def __init__(self, invoke_fn, max_batch_size=BATCH_VERIFICATION_SIZE, max_wait_seconds=BATCH_VERIFICATION_WAIT_SECONDS):
+        self.invoke_fn = invoke_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self._pending = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+    @property
+    def enabled(self):
+        return self.max_batch_size > 1
+
+    def verify(self, claim, context, evidence):
+        if not self.enabled:
+            return None
+
+        future = Future()
+        with self._lock:
+            self._pending.append(({"claim": claim, "context": context, "evidence": evidence}, future, current_deadline()))
+            if len(self._pending) >= self.max_batch_size:
+                batch = self._take_pending()
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(self.max_wait_seconds, self._flush_on_timer)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+        if batch:
+            self._send(batch)
+        try:
+            return future.result(timeout=remaining_seconds())
+        except TimeoutError:
+            raise DeadlineExceeded("Deadline exceeded waiting for the verification batch")
+
+    def _take_pending(self):
+        batch, self._pending = self._pending, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._timer = None
+            batch, self._pending = self._pending, []
+        if batch:
+            self._send(batch)
+
+    def _send(self, batch):
+        if len(batch) == 1:
+            batch[0][1].set_result(None)
+            return
+        try:
+            print(f"🤖 Sending {len(batch)} claims to the LLM in one verification prompt...")
+            # The timer thread has no deadline of its own
+            with deadline_context(earliest_deadline(deadline for _, _, deadline in batch)):
+                content = self.invoke_fn(build_batch_prompt([item for item, _, _ in batch]))
+            verdicts = parse_batch_response(content, len(batch))
+            print(f"✅ Batch verification parsed {sum(v is not None for v in verdicts)}/{len(batch)} verdicts")
+        except Exception as e:
+            print(f"❌ Batch verification failed: {e}")
+            traceback.print_exc()
+            verdicts = [None] * len(batch)
+        for (_, future, _), verdict in zip(batch, verdicts):
+            future.set_result(verdict)
@@ -0,0 +1,117 @@
+"""
+Check json_repair against the regression corpus and compare its throughput
+with the regex-based fix_broken_json it replaced.
+
+    python bench_json_repair.py
+"""
+import json
+import re
+import time
+from json_repair import fix_broken_json
+
+CORPUS_FILE = "json_repair_corpus.json"
+ITERATIONS = 200
+
+def legacy_fix_broken_json(json_str):
+    try:
+        json.loads(json_str)
+        return json_str
+    except json.JSONDecodeError:
+        fixed_str = re.sub(r'(".*?":\s*".*?")\s*\n\s*(".*?")',
+                           r'\1,\n  \2', json_str)
+        
+        fixed_str = re.sub(r'(".*?":\s*[^",\s{[].*?[^,\s{[])(\s*\n\s*)(".*?")',
+                           r'\1,\2\3', fixed_str)
+        
+        try:
+            json.loads(fixed_str)
+            return fixed_str
+        except json.JSONDecodeError:
+            try:
+                obj_start = json_str.find('{')
+                obj_end = json_str.rfind('}')
+                if obj_start == -1 or obj_end == -1:
+                    return json_str
+                
+                content = json_str[obj_start+1:obj_end].strip()
+                
+                properties = []
+                current_prop = ""
+                in_quotes = False
+                quote_char = None
+                for i, char in enumerate(content):
+                    current_prop += char
+                    
+                    if char in ['"', "'"]:
+                        if not in_quotes:
+                            in_quotes = True
+                            quote_char = char
+                        elif char == quote_char and content[i-1] != '\\':
+                            in_quotes = False
+                            quote_char = None
+                    
+                    if not in_quotes and char == '"' and i > 0 and content[i-1:i+1] != '\\"':
+                        lookahead = content[i:i+30]
+                        if re.search(r'^"[^"]+"\s*:', lookahead):
+                            if current_prop.strip():
+                                properties.append(current_prop.strip())
+                            current_prop = char
+                
+                if current_prop.strip():
+                    properties.append(current_prop.strip())
+                
+                valid_properties = []
+                for prop in properties:
+                    if ":" in prop:
+                        valid_properties.append(prop.strip().rstrip(','))
+                
+                fixed_str = "{\n  " + ",\n  ".join(valid_properties) + "\n}"
+                
+                json.loads(fixed_str)
+                return fixed_str
+            except:
+                return json_str
+    except Exception:
+        return json_str
+
+def recovered(fix_fn, text):
+    try:
+        return json.loads(fix_fn(text))
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+def check_corpus(corpus):
+    failures = 0
+    for case in corpus:
+        result = recovered(fix_broken_json, case["input"])
+        legacy_ok = recovered(legacy_fix_broken_json, case["input"]) == case["expected"]
+        ok = result == case["expected"]
+        failures += not ok
+        print(f"{'✅' if ok else '❌'} {case['name']:<36} legacy: {'ok' if legacy_ok else 'failed'}")
+        if not ok:
+            print(f"   expected: {case['expected']}\n   got:      {result}")
+    return failures
+
+def throughput(fix_fn, inputs):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        for text in inputs:
+            fix_fn(text)
+    elapsed = time.perf_counter() - start
+    return ITERATIONS * len(inputs) / elapsed
+
+if __name__ == "__main__":
+    with open(CORPUS_FILE, encoding="utf-8") as f:
+        corpus = json.load(f)
+
+    failures = check_corpus(corpus)
+
+    inputs = [case["input"] for case in corpus]
+    # A long response with missing commas, the case the regex fallback handles worst
+    long_response = "{\n" + "\n".join(f'  "field_{i}": "value {i} with some text"' for i in range(300)) + "\n}"
+    for label, sample in (("corpus", inputs), ("long response", [long_response])):
+        new_rate = throughput(fix_broken_json, sample)
+        legacy_rate = throughput(legacy_fix_broken_json, sample)
+        print(f"📊 {label}: {new_rate:,.0f}/s vs legacy {legacy_rate:,.0f}/s ({new_rate / legacy_rate:.1f}x)")
+
+    raise SystemExit(1 if failures else 0)
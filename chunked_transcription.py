@@ -0,0 +1,143 @@
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from audio_prep import ffmpeg_binary, probe_duration
+from deadline import DeadlineExceeded, bind_deadline, remaining_seconds, stage_timeout
+
+CHUNK_SECONDS = float(os.environ.get("TRANSCRIBE_CHUNK_SECONDS", 300))
+CHUNK_OVERLAP_SECONDS = float(os.environ.get("TRANSCRIBE_CHUNK_OVERLAP_SECONDS", 2))
+CHUNKING_MIN_SECONDS = float(os.environ.get("TRANSCRIBE_CHUNKING_MIN_SECONDS", 600))
+TRANSCRIBE_MAX_WORKERS = int(os.environ.get("TRANSCRIBE_MAX_WORKERS", 4))
+WHISPER_MAX_UPLOAD_BYTES = 24 * 1024 * 1024
+SILENCE_NOISE = "-30dB"
+SILENCE_MIN_SECONDS = 0.4
+MAX_OVERLAP_WORDS = 40
+# Shorter matches are as likely to be a word the speaker really repeated
+MIN_OVERLAP_WORDS = 3
+
+def _check_chunk_settings(chunk_seconds, overlap):
+    # Each hard cut moves the next chunk forward by chunk_seconds - overlap, so that must be positive
+    if not 0 <= overlap < chunk_seconds:
+        raise ValueError(
+            f"TRANSCRIBE_CHUNK_SECONDS ({chunk_seconds:g}) must be greater than "
+            f"TRANSCRIBE_CHUNK_OVERLAP_SECONDS ({overlap:g}), which must not be negative"
+        )
+
+_check_chunk_settings(CHUNK_SECONDS, CHUNK_OVERLAP_SECONDS)
+
+def needs_chunking(audio_file, duration=None):
+    if os.path.getsize(audio_file) > WHISPER_MAX_UPLOAD_BYTES:
+        return True
+    if duration is None:
+        duration = probe_duration(audio_file)
+    return duration > CHUNKING_MIN_SECONDS
+
+def detect_silences(audio_file):
+    """
+    Return (start, end) pairs of silent stretches found by ffmpeg's silencedetect
+    """
+    result = subprocess.run(
+        [ffmpeg_binary("ffmpeg"), "-hide_banner", "-nostats", "-i", audio_file,
+         "-af", f"silencedetect=noise={SILENCE_NOISE}:d={SILENCE_MIN_SECONDS}", "-f", "null", "-"],
+        capture_output=True, text=True, check=True, timeout=stage_timeout(stage="silence detection")
+    )
+    starts = [float(x) for x in re.findall(r"silence_start: ([\d.]+)", result.stderr)]
+    ends = [float(x) for x in re.findall(r"silence_end: ([\d.]+)", result.stderr)]
+    return list(zip(starts, ends))
+
+def plan_chunks(duration, silences, chunk_seconds=CHUNK_SECONDS, overlap=CHUNK_OVERLAP_SECONDS):
+    """
+    Split [0, duration] into chunks of at most chunk_seconds, cutting in the
+    middle of a silence when one falls in the second half of the window.
+    Returns (start, end, overlaps_previous) tuples; chunks that follow a hard
+    cut start `overlap` seconds early so words on the boundary are not lost.
+    """
+    _check_chunk_settings(chunk_seconds, overlap)
+    cut_points = [(start + end) / 2 for start, end in silences]
+    chunks = []
+    start = 0.0
+    overlaps_previous = False
+    while start < duration:
+        target = start + chunk_seconds
+        if target >= duration:
+            chunks.append((start, duration, overlaps_previous))
+            break
+        candidates = [point for point in cut_points if start + chunk_seconds / 2 <= point <= target]
+        if candidates:
+            cut = max(candidates)
+            chunks.append((start, cut, overlaps_previous))
+            start, overlaps_previous = cut, False
+        else:
+            chunks.append((start, target, overlaps_previous))
+            start, overlaps_previous = target - overlap, True
+    return chunks
+
+def cut_chunk(audio_file, start, end, output_file):
+    subprocess.run(
+        [ffmpeg_binary("ffmpeg"), "-hide_banner", "-loglevel", "error", "-y",
+         "-ss", f"{start:.3f}", "-t", f"{end - start:.3f}", "-i", audio_file,
+         "-vn", "-c", "copy", output_file],
+        check=True, timeout=stage_timeout(stage="chunking")
+    )
+    return output_file
+
+def _normalize_word(word):
+    return re.sub(r"[^\w]", "", word.lower())
+
+def merge_overlap(previous_text, next_text, max_words=MAX_OVERLAP_WORDS, min_words=MIN_OVERLAP_WORDS):
+    """
+    Drop the words at the start of next_text that repeat the end of
+    previous_text, if at least min_words of them do
+    """
+    previous_words = [_normalize_word(w) for w in previous_text.split()[-max_words:]]
+    next_words = next_text.split()
+    normalized_next = [_normalize_word(w) for w in next_words[:max_words]]
+    for size in range(min(len(previous_words), len(normalized_next)), min_words - 1, -1):
+        if previous_words[-size:] == normalized_next[:size]:
+            return " ".join(next_words[size:])
+    return next_text
+
+def iter_chunk_transcripts(audio_file, transcribe_fn, duration=None):
+    """
+    Transcribe an audio file chunk by chunk with up to TRANSCRIBE_MAX_WORKERS
+    concurrent Whisper calls, yielding each chunk's text in order as soon as it
+    and every chunk before it are done. Overlapping words are already removed.
+    Raises DeadlineExceeded if the request deadline passes while waiting.
+    """
+    if duration is None:
+        duration = probe_duration(audio_file)
+    chunks = plan_chunks(duration, detect_silences(audio_file))
+    print(f"✂️ Split {duration:.0f}s of audio into {len(chunks)} chunks")
+
+    work_dir = tempfile.mkdtemp(prefix="chunks_")
+    extension = os.path.splitext(audio_file)[1] or ".mp3"
+    executor = ThreadPoolExecutor(max_workers=TRANSCRIBE_MAX_WORKERS, thread_name_prefix="whisper")
+    try:
+        futures = []
+        transcribe = bind_deadline(transcribe_fn)
+        for index, (start, end, overlaps_previous) in enumerate(chunks):
+            chunk_file = cut_chunk(audio_file, start, end, os.path.join(work_dir, f"chunk_{index:04d}{extension}"))
+            futures.append((executor.submit(transcribe, chunk_file), overlaps_previous))
+
+        previous_text = ""
+        for index, (future, overlaps_previous) in enumerate(futures):
+            try:
+                text = (future.result(timeout=remaining_seconds()) or "").strip()
+            except TimeoutError:
+                raise DeadlineExceeded(f"Deadline exceeded with {len(futures) - index} chunks left to transcribe")
+            if overlaps_previous and previous_text:
+                text = merge_overlap(previous_text, text)
+            print(f"✅ Chunk {index + 1}/{len(futures)} transcribed")
+            if text:
+                previous_text = text
+            yield text
+    finally:
+        # Don't wait for stragglers once the caller has given up on them
+        executor.shutdown(wait=False, cancel_futures=True)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def transcribe_chunked(audio_file, transcribe_fn, duration=None):
+    return " ".join(text for text in iter_chunk_transcripts(audio_file, transcribe_fn, duration) if text)
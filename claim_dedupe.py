@@ -0,0 +1,93 @@
+import copy
+import os
+import re
+import unicodedata
+from verdict_store import canonicalize_claim
+
+CLAIM_DEDUPE_THRESHOLD = float(os.environ.get("CLAIM_DEDUPE_THRESHOLD", 0.75))
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "of", "to", "in", "on", "at", "by", "for", "with",
+    "is", "are", "was", "were", "be", "been", "it", "its", "this", "that", "these",
+    "those", "as", "from", "has", "have", "had", "can", "which", "who"
+}
+NEGATIONS = {"not", "no", "never", "cannot", "nor", "none", "nobody", "nothing", "neither"}
+
+def claim_tokens(claim):
+    words = canonicalize_claim(claim).split()
+    return {word for word in words if word not in STOPWORDS} or set(words)
+
+def claim_signature(claim):
+    """
+    The negations and numbers in a claim. Claims that differ in either say
+    different things however many words they share ("X does not cause Y",
+    "rose 3% in 2022" / "rose 3% in 2023"), so they never share a verdict.
+    """
+    text = unicodedata.normalize("NFKC", str(claim)).lower()
+    text = re.sub(r"n['’]t\b", " not", text)
+    negations = sum(1 for word in re.findall(r"\w+", text) if word in NEGATIONS)
+    numbers = frozenset(number.replace(",", "") for number in re.findall(r"\d+(?:[.,]\d+)*", text))
+    return negations, numbers
+
+def claim_similarity(tokens_a, tokens_b):
+    """
+    Token-set Jaccard similarity between two claims' content words
+    """
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+def _claim_text(claim_obj):
+    if isinstance(claim_obj, dict):
+        return claim_obj.get("claim", "")
+    return str(claim_obj)
+
+def collapse_near_duplicates(claims, threshold=CLAIM_DEDUPE_THRESHOLD):
+    """
+    Cluster near-duplicate claims (same signature, similar wording). Returns the indices of one representative per
+    cluster (the most detailed claim) and, for every claim, the index of its
+    representative.
+    """
+    tokens = [claim_tokens(_claim_text(claim_obj)) for claim_obj in claims]
+    signatures = [claim_signature(_claim_text(claim_obj)) for claim_obj in claims]
+    parent = list(range(len(claims)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(claims)):
+        for j in range(i + 1, len(claims)):
+            if signatures[i] == signatures[j] and claim_similarity(tokens[i], tokens[j]) >= threshold:
+                parent[find(j)] = find(i)
+
+    clusters = {}
+    for i in range(len(claims)):
+        clusters.setdefault(find(i), []).append(i)
+
+    representative_of = [0] * len(claims)
+    representatives = []
+    for members in clusters.values():
+        representative = max(members, key=lambda i: (len(tokens[i]), -i))
+        representatives.append(representative)
+        for i in members:
+            representative_of[i] = representative
+
+    representatives.sort()
+    return representatives, representative_of
+
+def fan_out_verdict(verdict, claim_obj, representative_claim):
+    """
+    Copy a representative's verdict onto another member of its cluster
+    """
+    member = copy.deepcopy(verdict)
+    member["claim"] = _claim_text(claim_obj)
+    member.pop("context", None)
+    member.pop("original_context", None)
+    if isinstance(claim_obj, dict) and claim_obj.get("context"):
+        member["context"] = claim_obj["context"]
+        member["original_context"] = claim_obj["context"]
+    member["duplicate_of"] = representative_claim
+    return member
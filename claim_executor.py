@@ -0,0 +1,153 @@
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from claim_dedupe import collapse_near_duplicates, fan_out_verdict
+from deadline import DeadlineExceeded, bind_deadline, deadline_expired, remaining_seconds
+
+VERIFY_MAX_WORKERS = int(os.environ.get("VERIFY_MAX_WORKERS", 4))
+
+_executor = None
+_lookup_executor = None
+_executor_lock = threading.Lock()
+
+def get_verification_executor():
+    """
+    Return the process-wide executor used to fan out claim verification
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=VERIFY_MAX_WORKERS,
+                    thread_name_prefix="verify"
+                )
+    return _executor
+
+def run_concurrently(*calls):
+    """
+    Run zero-argument callables in parallel on a pool separate from the
+    verification executor (so verify_fn can use it without deadlocking)
+    and return their results in order
+    """
+    global _lookup_executor
+    if _lookup_executor is None:
+        with _executor_lock:
+            if _lookup_executor is None:
+                _lookup_executor = ThreadPoolExecutor(
+                    max_workers=VERIFY_MAX_WORKERS * 2,
+                    thread_name_prefix="lookup"
+                )
+    futures = [_lookup_executor.submit(bind_deadline(call)) for call in calls]
+    return [future.result() for future in futures]
+
+def claim_text_of(claim_obj):
+    if isinstance(claim_obj, dict):
+        return claim_obj.get("claim", "")
+    return str(claim_obj)
+
+def unverified_result(claim_obj, error):
+    """
+    Fallback verdict for a claim whose verification raised
+    """
+    return {
+        "claim": claim_text_of(claim_obj),
+        "result": "UNVERIFIED",
+        "summary": "Technical difficulties interrupted the verification process.",
+        "detailed_analysis": f"An error occurred while verifying this claim: {str(error)}. Without complete verification, the claim's accuracy cannot be determined.",
+        "sources": []
+    }
+
+def pending_result(claim_obj):
+    """
+    Placeholder verdict for a claim the request deadline cut off
+    """
+    return {
+        "claim": claim_text_of(claim_obj),
+        "result": "PENDING",
+        "summary": "Verification did not finish before the request deadline.",
+        "detailed_analysis": "This claim was not checked in time. Retry the request with a longer deadline to verify it.",
+        "sources": []
+    }
+
+def _verify_isolated(verify_fn, claim_obj):
+    if deadline_expired():
+        return pending_result(claim_obj)
+    try:
+        verification = verify_fn(claim_obj)
+        if not isinstance(verification, dict):
+            raise ValueError("Verification returned no result")
+        return verification
+    except DeadlineExceeded:
+        return pending_result(claim_obj)
+    except Exception as e:
+        if deadline_expired():
+            return pending_result(claim_obj)
+        print(f"❌ Verification failed for claim: {claim_text_of(claim_obj)}: {e}")
+        traceback.print_exc()
+        return unverified_result(claim_obj, e)
+
+def submit_verification(claim_obj, verify_fn):
+    """
+    Queue a single claim on the shared executor; the future never raises
+    """
+    return get_verification_executor().submit(bind_deadline(_verify_isolated), verify_fn, claim_obj)
+
+def iter_verified_claims(claims, verify_fn, dedupe=True):
+    """
+    Verify claims on the shared executor and yield (index, verification) pairs
+    as soon as each one finishes. A claim that fails comes back as UNVERIFIED
+    instead of failing the batch. Near-duplicate claims are verified once and
+    share the representative's verdict. When the request deadline passes, the
+    claims still outstanding come back as PENDING.
+    """
+    if not claims:
+        return
+
+    if dedupe:
+        representatives, representative_of = collapse_near_duplicates(claims)
+    else:
+        representatives, representative_of = list(range(len(claims))), list(range(len(claims)))
+
+    if len(representatives) < len(claims):
+        print(f"🧬 Collapsed {len(claims)} claims into {len(representatives)} distinct claims")
+
+    members = {}
+    for i, representative in enumerate(representative_of):
+        members.setdefault(representative, []).append(i)
+
+    print(f"⚡ Verifying {len(representatives)} claims with up to {VERIFY_MAX_WORKERS} workers")
+    executor = get_verification_executor()
+    verify = bind_deadline(_verify_isolated)
+    futures = {executor.submit(verify, verify_fn, claims[i]): i for i in representatives}
+
+    def fan_out(representative, verification):
+        for i in members[representative]:
+            member_verification = verification
+            if i != representative:
+                member_verification = fan_out_verdict(verification, claims[i], claim_text_of(claims[representative]))
+            print(f"==== Verification complete: {claim_text_of(claims[i])} -> {member_verification.get('result', 'UNVERIFIED')} ====")
+            yield i, member_verification
+
+    finished = set()
+    try:
+        for future in as_completed(futures, timeout=remaining_seconds()):
+            finished.add(future)
+            yield from fan_out(futures[future], future.result())
+    except TimeoutError:
+        unfinished = [future for future in futures if future not in finished]
+        print(f"⏰ Request deadline reached with {len(unfinished)} claims still being verified")
+        for future in unfinished:
+            future.cancel()
+            representative = futures[future]
+            yield from fan_out(representative, pending_result(claims[representative]))
+
+def verify_claims_concurrently(claims, verify_fn, dedupe=True):
+    """
+    Verify claims concurrently and return the verdicts in input order
+    """
+    verified = [None] * len(claims)
+    for i, verification in iter_verified_claims(claims, verify_fn, dedupe):
+        verified[i] = verification
+    return verified
@@ -0,0 +1,369 @@
+"""
+Claim verification shared by server1 and server2: Google Fact Check and
+Serper lookups, the Groq verdict call and the verdict store. Both servers use
+this one module, so in one process (gateway.py) they also share the LLM
+client and the verification batcher (so batches can mix both servers' claims).
+"""
+import json
+import traceback
+from langchain_groq import ChatGroq
+from langchain_core.messages import SystemMessage
+from claim_executor import run_concurrently
+from batch_verification import VerificationBatcher
+from evidence import format_evidence, pack_evidence
+from factcheck_fastpath import factcheck_evidence, verdict_from_factcheck
+from search_cache import cached_search
+from verdict_store import get_verdict, store_verdict, verdict_version
+from json_repair import fix_broken_json
+from resilience import hedged_call
+from deadline import DeadlineExceeded, check_deadline
+from provider_clients import get_client, provider_timeout
+
+GROQ_API_KEY = ""
+GOOGLE_FACT_CHECK_API_KEY = ""
+SERPER_API_KEY = ""
+
+SERPER_VERIFICATION_PROMPT = """
+You are a world-renowned fact-checker with a reputation for accuracy, clarity, and attention to detail.
+
+I need you to fact-check the following claim using search results I've provided.
+
+Claim: {{claim}}
+
+Search Results: {{search_results}}
+
+Based on these search results and your analysis, determine if the claim is TRUE, FALSE, or UNVERIFIED.
+
+Your response must be in this exact JSON format:
+{
+  "claim": "{{claim}}",
+  "result": "TRUE/FALSE/UNVERIFIED",
+  "summary": "A concise one-sentence summary of your verdict. Vary your phrasing; don't always start with 'The evidence confirms/refutes'.",
+  "detailed_analysis": "A detailed, evidence-based explanation of your reasoning (3-5 sentences). Provide specific details from the sources that support your conclusion.",
+  "sources": [
+    {
+      "name": "Website or Publication Name",
+      "url": "Source URL"
+    },
+    {
+      "name": "Website or Publication Name",
+      "url": "Source URL"
+    }
+  ]
+}
+
+Guidelines:
+- Only mark a claim as TRUE if credible sources clearly support it
+- Only mark a claim as FALSE if credible sources clearly refute it
+- Mark as UNVERIFIED if the sources are contradictory, unclear, or insufficient
+- Focus on the most authoritative sources (educational institutions, scientific publications, etc.)
+- Extract the most relevant information from each source
+- Vary your phrasing in the summary for natural reading
+- In your detailed_analysis, be thorough yet concise - explain your reasoning with evidence
+"""
+
+llm = ChatGroq(
+    api_key=GROQ_API_KEY,
+    model_name="llama-3.1-8b-instant",
+    http_client=get_client("groq"),
+    request_timeout=provider_timeout("groq"),
+    # Retries and backoff happen in the shared rate-limited transport
+    max_retries=0
+)
+
+def invoke_llm(messages, operation=None):
+    """
+    llm.invoke behind Groq's circuit breaker, hedged if it stalls past the
+    usual p95 of the same operation (e.g. "extract", "verify")
+    """
+    return hedged_call("groq", lambda: llm.invoke(messages), operation=operation)
+
+verification_batcher = VerificationBatcher(lambda prompt: invoke_llm([SystemMessage(content=prompt)], "verify_batch").content)
+
+VERDICT_VERSION = verdict_version(SERPER_VERIFICATION_PROMPT, llm.model_name)
+
+def check_claim_with_google_factcheck(claim):
+    try:
+        print(f"🔍 Fact-checking with Google API: {claim}")
+        url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
+        params = {
+            "key": GOOGLE_FACT_CHECK_API_KEY,
+            "query": claim,
+            "languageCode": "en"  
+        }
+        
+        print(f"📡 Sending request to Google Fact Check API: {url}")
+        
+        response = get_client("google_factcheck").get(url, params=params)
+        
+        print(f"📡 API response status code: {response.status_code}")
+        
+        if response.status_code == 200:
+            data = response.json()
+            
+            if "claims" in data and len(data["claims"]) > 0:
+                print(f"✅ Found {len(data['claims'])} fact checks")
+                return data
+            else:
+                print("❌ No fact checks found in API response")
+                return {"claims": []}
+        else:
+            print(f"❌ API request failed: {response.status_code}")
+            return {"claims": []}
+    
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        # A call cut short by the request deadline leaves the claim pending, not unmatched
+        check_deadline("Google Fact Check lookup")
+        print(f"❌ Error in Google Fact Check API: {e}")
+        traceback.print_exc()
+        return {"claims": []}
+
+def search_with_serper(query, num=8):
+    return cached_search(query, num, lambda: hedged_call(
+        "serper", lambda: _search_with_serper_uncached(query, num),
+        failed=lambda data: data is None, fallback=None
+    ))
+
+def _search_with_serper_uncached(query, num):
+    try:
+        print(f"🔍 Searching with Serper API: {query}")
+        url = "https://google.serper.dev/search"
+        headers = {
+            'X-API-KEY': SERPER_API_KEY,
+            'Content-Type': 'application/json'
+        }
+        payload = {
+            'q': query,
+            'num': num
+        }
+        
+        response = get_client("serper").post(url, headers=headers, json=payload)
+        
+        if response.status_code == 200:
+            data = response.json()
+            print(f"✅ Serper API returned {len(data.get('organic', []))} results")
+            return data
+        else:
+            print(f"❌ Serper API request failed: {response.status_code}")
+            return None
+    
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        check_deadline("Serper search")
+        print(f"❌ Error in Serper API: {e}")
+        traceback.print_exc()
+        return None
+
+def verify_with_serper_and_llama(claim_data, search_results=None):
+    try:
+        if isinstance(claim_data, dict):
+            claim = claim_data.get("claim", "")
+            context = claim_data.get("context", "")
+            search_query = claim_data.get("search_query", "")
+        else:
+            claim = claim_data
+            context = ""
+            search_query = ""
+        
+        print(f"🔍 Verifying claim with Serper + Llama: {claim}")
+        if context:
+            print(f"📝 Context: {context}")
+        
+        if not search_query:
+            search_query = f"fact check {claim}"
+        
+        if search_results is None:
+            print(f"🔍 Using search query: {search_query}")
+            search_results = search_with_serper(search_query)
+        
+        if not search_results or "organic" not in search_results or len(search_results["organic"]) == 0:
+            print("❌ No search results found")
+            return {
+                "claim": claim,
+                "result": "UNVERIFIED",
+                "summary": "Insufficient evidence available to verify this claim.",
+                "detailed_analysis": "After extensive searching, no reliable sources were found to verify this specific claim. Without credible evidence, it's not possible to determine the accuracy of this statement.",
+                "sources": []
+            }
+        
+        formatted_results = format_evidence(pack_evidence(search_results["organic"], claim))
+        
+        batched_result = verification_batcher.verify(claim, context, formatted_results)
+        
+        if batched_result is not None:
+            content = json.dumps(batched_result)
+        else:
+            verification_prompt = SERPER_VERIFICATION_PROMPT.replace("{{claim}}", claim).replace("{{search_results}}", formatted_results)
+            
+            if context:
+                verification_prompt += f"\n\nAdditional Context: {context}"
+            
+            print(f"🤖 Sending to Llama 3.1 for search results analysis...")
+            
+            messages = [
+                SystemMessage(content=verification_prompt)
+            ]
+            
+            response = invoke_llm(messages, "verify")
+            content = response.content
+        
+        print(f"🤖 Llama 3.1 analysis response: {content[:200]}...")
+        
+        try:
+            start_idx = content.find('{')
+            end_idx = content.rfind('}') + 1
+            
+            if start_idx >= 0:
+                # Truncated responses have no closing brace; the repair parser closes them
+                json_str = content[start_idx:end_idx] if end_idx > start_idx else content[start_idx:]
+                
+                fixed_json_str = fix_broken_json(json_str)
+                
+                try:
+                    result = json.loads(fixed_json_str)
+                    print(f"✅ Serper verification result: {result.get('result', 'UNVERIFIED')}")
+                    
+                    if 'claim' not in result:
+                        result['claim'] = claim
+                    
+                    if context:
+                        result['context'] = context
+                    
+                    formatted_sources = []
+                    if 'sources' in result and result['sources']:
+                        for source in result['sources']:
+                            if isinstance(source, dict) and 'name' in source and 'url' in source:
+                                formatted_sources.append({
+                                    'name': source['name'],
+                                    'url': source['url']
+                                })
+                    
+                    if formatted_sources:
+                        result['sources'] = formatted_sources
+                    else:
+                        result['sources'] = []
+                    
+                    result["verification_source"] = "serper_llm"
+                    store_verdict(claim, VERDICT_VERSION, result)
+                    return result
+                except json.JSONDecodeError as e:
+                    print(f"❌ Error decoding fixed JSON: {e}")
+                    print(f"Original JSON string: {json_str}")
+                    print(f"Fixed JSON string: {fixed_json_str}")
+                    raise ValueError(f"JSON decoding error after fix attempt: {e}")
+            else:
+                print("❌ JSON not found in response")
+                raise ValueError("JSON not found in response")
+        
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"❌ Error processing verification response: {e}")
+            print(f"Full response: {content}")
+            
+            return {
+                "claim": claim,
+                "result": "UNVERIFIED",
+                "summary": "Technical issues prevented proper verification.",
+                "detailed_analysis": "While search results were found, I was unable to process them correctly to determine the claim's accuracy. The information available was either insufficient or could not be properly analyzed.",
+                "sources": []
+            }
+    
+    except DeadlineExceeded:
+        raise
+    except Exception as e:
+        check_deadline("claim verification")
+        print(f"❌ Error in Serper verification: {e}")
+        traceback.print_exc()
+        
+        return {
+            "claim": claim,
+            "result": "UNVERIFIED",
+            "summary": "Technical difficulties interrupted the verification process.",
+            "detailed_analysis": f"An error occurred during the analysis of search results: {str(e)}. Without complete verification, the claim's accuracy cannot be determined.",
+            "sources": []
+        }
+
+def search_query_for(claim_obj):
+    return claim_obj.get("search_query") or f"fact check {claim_obj.get('claim', '')}"
+
+def verify_uncached(claim_obj):
+    claim_text = claim_obj.get("claim", "")
+    factcheck_data, search_results = run_concurrently(
+        lambda: check_claim_with_google_factcheck(claim_text),
+        lambda: search_with_serper(search_query_for(claim_obj))
+    )
+    
+    verification = verdict_from_factcheck(claim_text, factcheck_data)
+    if verification is not None:
+        store_verdict(claim_text, VERDICT_VERSION, verification)
+        return verification
+    
+    # Reviews of related claims are weighed by the LLM alongside the search results
+    evidence = factcheck_evidence(factcheck_data)
+    if evidence:
+        search_results = dict(search_results or {}, organic=evidence + list((search_results or {}).get("organic") or []))
+    
+    verification = verify_with_serper_and_llama(claim_obj, search_results=search_results)
+    verification.setdefault("verification_source", "serper_llm")
+    return verification
+
+def verify_claim(claim_obj):
+    if isinstance(claim_obj, dict):
+        claim_text = claim_obj.get("claim", "")
+        verification = get_verdict(claim_text, VERDICT_VERSION)
+        
+        if verification is None:
+            verification = verify_uncached(claim_obj)
+        
+        verification["claim"] = claim_text
+        
+        if "context" in claim_obj and claim_obj["context"]:
+            verification["original_context"] = claim_obj["context"]
+        
+        return verification
+    else:
+        cached = get_verdict(claim_obj, VERDICT_VERSION)
+        if cached is not None:
+            return cached
+        
+        return verify_uncached({"claim": claim_obj})
+
+def generate_trust_score(claims):
+    claims = [claim for claim in claims if claim.get("result") != "PENDING"]
+    if not claims:
+        return 5.0
+    
+    weights = {"TRUE": 10.0, "FALSE": 0.0, "UNVERIFIED": 5.0}
+    total_weight = sum(weights.get(claim.get("result", "UNVERIFIED"), 5.0) for claim in claims)
+    
+    score = round(total_weight / len(claims), 1)
+    print(f"📊 Generated trust score: {score}")
+    return score
+
+def get_recommendation(trust_score):
+    if trust_score >= 8.0:
+        return "This content appears highly reliable and factually accurate."
+    elif trust_score >= 6.0:
+        return "This content contains a mix of accurate and unverified information. Exercise some caution."
+    elif trust_score >= 4.0:
+        return "This content contains significant unverified information. Verify important claims with additional sources."
+    else:
+        return "This content contains multiple false or misleading claims. Approach with significant skepticism."
+
+def attach_source_fields(claim):
+    source_links = []
+    source_names = []
+    
+    if "sources" in claim and claim["sources"]:
+        for source in claim["sources"]:
+            if isinstance(source, dict):
+                if "name" in source and source["name"]:
+                    source_names.append(source["name"])
+                if "url" in source and source["url"]:
+                    source_links.append(source["url"])
+    
+    claim["source_names"] = source_names
+    claim["source_links"] = source_links
+    return claim
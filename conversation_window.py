@@ -0,0 +1,124 @@
+import hashlib
+import os
+from evidence import estimate_tokens
+from ttl_cache import TTLCache
+
+CONTEXT_WINDOW_TOKENS = int(os.environ.get("CONTEXT_WINDOW_TOKENS", 8192))
+CONVERSATION_TOKEN_BUDGET = int(os.environ.get("CONVERSATION_TOKEN_BUDGET", 3000))
+CONVERSATION_SUMMARY_TOKENS = int(os.environ.get("CONVERSATION_SUMMARY_TOKENS", 300))
+CONVERSATION_FOLD_STEP = max(1, int(os.environ.get("CONVERSATION_FOLD_STEP", 4)))
+CONTEXT_SAFETY_TOKENS = 256
+MESSAGE_OVERHEAD_TOKENS = 4
+MIN_RESPONSE_TOKENS = 64
+
+summary_cache = TTLCache(
+    "conversation_summary",
+    ttl=float(os.environ.get("CONVERSATION_SUMMARY_TTL", 2 * 60 * 60)),
+    max_entries=int(os.environ.get("CONVERSATION_SUMMARY_MAX_ENTRIES", 1024))
+)
+
+def message_tokens(message):
+    return estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+def _prefix_keys(session_key, messages, fold_points):
+    """
+    Cache key for each fold point: a hash of the session key and every
+    message before it, so an edited or different history never reuses a summary
+    """
+    digest = hashlib.sha256((session_key or "").encode("utf-8"))
+    keys = {}
+    for index, message in enumerate(messages, 1):
+        digest.update(f"{message['role']}\0{message['content']}\0".encode("utf-8"))
+        if index in fold_points:
+            keys[index] = digest.hexdigest()
+    return keys
+
+def _fold_point(messages, budget):
+    """
+    How many of the oldest messages must be folded into the summary for the
+    rest to fit in budget, rounded up to a multiple of CONVERSATION_FOLD_STEP
+    so the fold point (and its cached summary) only moves every few turns.
+    The latest message is always kept.
+    """
+    used = 0
+    keep_from = len(messages)
+    while keep_from > 0:
+        cost = message_tokens(messages[keep_from - 1])
+        if used + cost > budget and keep_from < len(messages):
+            break
+        used += cost
+        keep_from -= 1
+    if keep_from == 0:
+        return 0
+    step = CONVERSATION_FOLD_STEP
+    return min(-(-keep_from // step) * step, len(messages) - 1)
+
+def _summary_for(messages, fold, session_key, summarize):
+    """
+    Rolling summary of messages[:fold], built on the latest cached summary of
+    a shorter prefix so only the newly folded messages are summarized
+    """
+    step = CONVERSATION_FOLD_STEP
+    points = set(range(step, fold + 1, step)) | {fold}
+    keys = _prefix_keys(session_key, messages, points)
+
+    start, summary = 0, None
+    for point in sorted(points, reverse=True):
+        cached = summary_cache.get(keys[point])
+        if cached is not None:
+            start, summary = point, cached
+            break
+
+    # Summarize the remaining messages a few steps at a time, staying within
+    # one conversation budget per call and caching every intermediate summary
+    while start < fold:
+        end = min(start + step, fold)
+        used = sum(message_tokens(message) for message in messages[start:end])
+        while end < fold:
+            nxt = min(end + step, fold)
+            cost = sum(message_tokens(message) for message in messages[end:nxt])
+            if used + cost > CONVERSATION_TOKEN_BUDGET:
+                break
+            used += cost
+            end = nxt
+        updated = summarize(summary, messages[start:end])
+        if not updated:
+            # Summarizing failed: the folded messages are dropped rather than sent
+            print(f"⚠️ Could not summarize {end - start} earlier messages, dropping them from the prompt")
+        else:
+            summary = updated
+            if end in keys:
+                summary_cache.set(keys[end], summary)
+        start = end
+    return summary
+
+def fit_conversation(system_prompt, messages, max_tokens, summarize, session_key=None):
+    """
+    Prompt messages for a conversation that fit the model's context window:
+    the system prompt, a rolling summary of older turns (appended to the
+    system prompt) and as many recent turns as fit in the budget. summarize
+    (previous_summary, messages) returns an updated summary or None; session_key
+    keeps summaries of different conversations apart. Returns the messages
+    and max_tokens shrunk to what is left of the window.
+    """
+    messages = [{"role": message["role"], "content": message["content"]} for message in messages]
+    system_tokens = estimate_tokens(system_prompt) + MESSAGE_OVERHEAD_TOKENS
+    budget = min(
+        CONVERSATION_TOKEN_BUDGET,
+        CONTEXT_WINDOW_TOKENS - CONTEXT_SAFETY_TOKENS - system_tokens - max_tokens
+    )
+
+    fold = _fold_point(messages, budget)
+    if fold:
+        # Leave room for the summary that replaces the folded turns
+        fold = _fold_point(messages, budget - CONVERSATION_SUMMARY_TOKENS)
+    if fold:
+        summary = _summary_for(messages, fold, session_key, summarize)
+        print(f"🪟 Folded {fold} of {len(messages)} messages into the conversation summary")
+        messages = messages[fold:]
+        if summary:
+            system_prompt += f"\n\nSummary of the earlier conversation:\n{summary}"
+
+    prompt = [{"role": "system", "content": system_prompt}] + messages
+    remaining = CONTEXT_WINDOW_TOKENS - CONTEXT_SAFETY_TOKENS - sum(message_tokens(message) for message in prompt)
+    return prompt, max(MIN_RESPONSE_TOKENS, min(max_tokens, remaining))
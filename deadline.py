@@ -0,0 +1,143 @@
+import os
+import math
+import time
+import contextvars
+from contextlib import contextmanager
+
+REQUEST_DEADLINE_SECONDS = float(os.environ.get("REQUEST_DEADLINE_SECONDS", 180))
+REQUEST_DEADLINE_MAX_SECONDS = float(os.environ.get("REQUEST_DEADLINE_MAX_SECONDS", 900))
+# Video analysis downloads and transcribes the whole video, so it gets a larger default
+VIDEO_DEADLINE_SECONDS = float(os.environ.get("VIDEO_DEADLINE_SECONDS", 1800))
+# Background jobs have no caller waiting on them: no deadline unless the client sets one (0 = none)
+JOB_DEADLINE_SECONDS = float(os.environ.get("JOB_DEADLINE_SECONDS", 0))
+DEADLINE_HEADER = "X-Request-Deadline"
+
+_current_deadline = contextvars.ContextVar("request_deadline", default=None)
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when a stage is about to start (or wait) after the request deadline passed
+    """
+
+class Deadline:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return time.monotonic() >= self.expires_at
+
+def current_deadline():
+    return _current_deadline.get()
+
+def remaining_seconds():
+    """
+    Seconds left before the current request's deadline, or None if it has none
+    """
+    deadline = _current_deadline.get()
+    return deadline.remaining() if deadline is not None else None
+
+def deadline_expired():
+    deadline = _current_deadline.get()
+    return deadline is not None and deadline.expired()
+
+def check_deadline(stage="request"):
+    if deadline_expired():
+        raise DeadlineExceeded(f"Deadline exceeded before {stage} finished")
+
+def stage_timeout(cap=None, stage="request"):
+    """
+    Timeout for the next blocking call: cap, shortened to what is left of the
+    request deadline. Raises DeadlineExceeded if nothing is left.
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return cap
+    if remaining <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before {stage} finished")
+    return remaining if cap is None else min(cap, remaining)
+
+def bind_deadline(fn):
+    """
+    Wrap fn so it runs under the caller's deadline on whatever thread calls it
+    (context variables are not inherited by executor threads)
+    """
+    deadline = _current_deadline.get()
+
+    def run(*args, **kwargs):
+        with deadline_context(deadline):
+            return fn(*args, **kwargs)
+    return run
+
+@contextmanager
+def deadline_context(deadline):
+    """
+    Run the enclosed block under a deadline captured earlier with
+    current_deadline(), possibly on another thread (None for no deadline)
+    """
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+def earliest_deadline(deadlines):
+    """
+    The deadline that expires first, ignoring None; None if there is none
+    """
+    return min((deadline for deadline in deadlines if deadline is not None), key=lambda deadline: deadline.expires_at, default=None)
+
+def _deadline_for(seconds):
+    return Deadline(seconds) if seconds else None
+
+def deadline_events(events_fn, seconds, *args):
+    """
+    Run an (event, data) generator under a deadline that starts when the
+    first event is requested, so queued jobs don't spend their budget waiting.
+    seconds of None (or 0) runs it without a deadline.
+    """
+    deadline = _deadline_for(seconds)
+    events = events_fn(*args)
+    try:
+        while True:
+            token = _current_deadline.set(deadline)
+            try:
+                item = next(events)
+            except StopIteration:
+                return
+            finally:
+                _current_deadline.reset(token)
+            yield item
+    finally:
+        events.close()
+
+@contextmanager
+def deadline_scope(seconds):
+    """
+    Run the enclosed block (and anything it hands to bind_deadline) under a
+    deadline of the given number of seconds, or none if seconds is None or 0
+    """
+    token = _current_deadline.set(_deadline_for(seconds))
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+def deadline_seconds_from(data, headers, default=REQUEST_DEADLINE_SECONDS):
+    """
+    Deadline requested by the client ("deadline_seconds" in the JSON body or
+    the X-Request-Deadline header), capped at REQUEST_DEADLINE_MAX_SECONDS (or
+    default, if that is larger); default when absent, not a finite positive
+    number ("nan", "inf") or otherwise invalid
+    """
+    value = (data or {}).get("deadline_seconds") or headers.get(DEADLINE_HEADER)
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        return default
+    if not math.isfinite(seconds) or seconds <= 0:
+        return default
+    return min(seconds, max(REQUEST_DEADLINE_MAX_SECONDS, default or 0))
@@ -1,19 +1,35 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
-import requests
 import time
 import json
 import traceback
 import os
 import re
+import asyncio
+from evidence import pack_evidence
+from search_cache import search_cache
+from claim_verification import search_with_serper
+from rate_limiter import rate_limiter_stats
+from resilience import hedged_call_async, upstream_stats
+from health import register_health_routes, warm_up_worker
+from debate_sessions import DebateSessionStore, conversation
+from conversation_window import CONVERSATION_SUMMARY_TOKENS, fit_conversation, summary_cache
+from provider_clients import get_async_client, run_async, warm_up_connections, warm_up_async_connections
 
 app = Flask(__name__)
 CORS(app)
 
+def warm_up():
+    warm_up_connections(["serper"])
+    warm_up_async_connections(["groq"])
+
+register_health_routes(app, warm_up)
+
+debate_sessions = DebateSessionStore()
+
 GROQ_API_KEY = ""
 GROQ_API_URL = ""
 MODEL_NAME = ""  
-SERPER_API_KEY = ""
 
 DEBATE_SYSTEM_PROMPT = """You are a skilled debate opponent participating in a structured debate.
 Your role is to:
@@ -48,6 +64,11 @@ Keep your responses concise, informative, and focused on empowering users to com
 Provide specific examples and actionable advice when possible.
 """
 
+CONVERSATION_SUMMARY_PROMPT = """You maintain a running summary of a conversation so it can continue without the full history.
+Update the existing summary (if any) with the new messages. Keep each side's positions and main arguments, facts and statistics cited (with any fact-check outcome), points conceded, and questions still open.
+Write plain prose in at most {words} words. Return only the summary.
+"""
+
 FACT_EXTRACTION_PROMPT = """Your task is to identify factual claims in the following message that should be verified.
 Only extract specific, verifiable factual assertions - NOT opinions, personal experiences, or hypotheticals.
 
@@ -74,10 +95,48 @@ If there are no verifiable factual claims, return:
 Remember: Focus only on FACTUAL claims that can be objectively verified through research.
 """
 
-def call_groq_api(messages, model=MODEL_NAME, temperature=0.7, max_tokens=800):
+EVALUATION_SYSTEM_PROMPT = """You are a fact-checking assistant. Your task is to evaluate the factual accuracy of a claim based on search results.
+Provide a concise assessment indicating whether the claim is TRUE, FALSE, or UNVERIFIED.
+Return your response as a valid JSON object with the following fields:
+1. status: "TRUE", "FALSE", or "UNVERIFIED"
+2. confidence: A number from 0-10 indicating how confident you are in this assessment
+3. reason: A 1-2 sentence explanation of your assessment"""
+
+def call_groq_api(messages, model=MODEL_NAME, temperature=0.7, max_tokens=800, operation=None):
+    """
+    Blocking entry point for call_groq_api_async, for the Flask views
+    """
+    return run_async(call_groq_api_async(messages, model, temperature, max_tokens, operation))
+
+def summarize_conversation(previous_summary, messages):
     """
-    Make a call to the Groq API with the provided messages
+    Fold older messages into the rolling conversation summary; None on failure
     """
+    speakers = {"user": "User", "assistant": "Assistant"}
+    transcript = "\n\n".join(f"{speakers.get(m['role'], 'Note')}: {m['content']}" for m in messages)
+    summary_messages = [
+        {"role": "system", "content": CONVERSATION_SUMMARY_PROMPT.format(words=CONVERSATION_SUMMARY_TOKENS * 3 // 4)},
+        {"role": "user", "content": f"Summary so far:\n{previous_summary or '(none)'}\n\nNew messages:\n{transcript}"}
+    ]
+    
+    response = call_groq_api(summary_messages, temperature=0.2, max_tokens=CONVERSATION_SUMMARY_TOKENS, operation="summarize")
+    
+    if not response or 'choices' not in response or len(response['choices']) == 0:
+        return None
+    return response['choices'][0]['message']['content'].strip() or None
+
+async def call_groq_api_async(messages, model=MODEL_NAME, temperature=0.7, max_tokens=800, operation=None):
+    """
+    Make a call to the Groq API with the provided messages. Returns None on
+    failure, or straight away while Groq's circuit breaker is open. operation
+    names the kind of call, so hedging compares it with similar calls.
+    """
+    return await hedged_call_async(
+        "groq", lambda: _call_groq_api_once_async(messages, model, temperature, max_tokens),
+        failed=lambda response: response is None, fallback=None, operation=operation
+    )
+
+async def _call_groq_api_once_async(messages, model, temperature, max_tokens):
     try:
         headers = {
             "Authorization": f"Bearer {GROQ_API_KEY}",
@@ -91,7 +150,7 @@ def call_groq_api(messages, model=MODEL_NAME, temperature=0.7, max_tokens=800):
             "max_tokens": max_tokens
         }
         
-        response = requests.post(GROQ_API_URL, headers=headers, json=payload)
+        response = await get_async_client("groq").post(GROQ_API_URL, headers=headers, json=payload)
         
         if response.status_code == 200:
             return response.json()
@@ -105,38 +164,30 @@ def call_groq_api(messages, model=MODEL_NAME, temperature=0.7, max_tokens=800):
         traceback.print_exc()
         return None
 
-def search_with_serper(query):
+async def search_with_serper_async(query):
     """
-    Make a call to the Serper API to search for information
+    Search Serper through claim_verification's helper, so the debate server
+    shares its client, search cache, rate limiter and circuit breaker (and,
+    in the gateway, server1 and server2's)
     """
+    return await asyncio.to_thread(search_with_serper, query)
+
+def _parse_factual_claims(result):
     try:
-        print(f"🔍 Searching with Serper API: {query}")
-        url = "https://google.serper.dev/search"
-        headers = {
-            'X-API-KEY': SERPER_API_KEY,
-            'Content-Type': 'application/json'
-        }
-        payload = {
-            'q': query,
-            'num': 5 
-        }
-        
-        response = requests.post(url, headers=headers, json=payload)
+        json_match = re.search(r'({[\s\S]*})', result)
+        if json_match:
+            json_str = json_match.group(1)
+            data = json.loads(json_str)
+            
+            if 'factual_claims' in data and isinstance(data['factual_claims'], list):
+                return data['factual_claims']
         
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Serper API returned {len(data.get('organic', []))} results")
-            return data
-        else:
-            print(f"❌ Serper API request failed: {response.status_code}")
-            return None
-    
+        return []
     except Exception as e:
-        print(f"❌ Error in Serper API: {e}")
-        traceback.print_exc()
-        return None
+        print(f"Error parsing factual claims JSON: {e}")
+        return []
 
-def extract_factual_claims(text):
+async def extract_factual_claims_async(text):
     """
     Extract factual claims from text that should be verified
     """
@@ -146,144 +197,161 @@ def extract_factual_claims(text):
             {"role": "user", "content": text}
         ]
         
-        response = call_groq_api(messages, temperature=0.1)
+        response = await call_groq_api_async(messages, temperature=0.1, operation="extract")
         
         if not response or 'choices' not in response or len(response['choices']) == 0:
             print("Failed to extract factual claims")
             return []
         
-        result = response['choices'][0]['message']['content']
-        
-        try:
-            json_match = re.search(r'({[\s\S]*})', result)
-            if json_match:
-                json_str = json_match.group(1)
-                data = json.loads(json_str)
-                
-                if 'factual_claims' in data and isinstance(data['factual_claims'], list):
-                    return data['factual_claims']
-            
-            return []
-        except Exception as e:
-            print(f"Error parsing factual claims JSON: {e}")
-            return []
+        return _parse_factual_claims(response['choices'][0]['message']['content'])
     
     except Exception as e:
         print(f"Error extracting factual claims: {e}")
         return []
 
-def verify_factual_claims(claims):
-    """
-    Verify a list of factual claims using Serper API
-    """
-    results = []
+def _summarize_search_results(search_results, claim):
+    search_summary = []
+    sources = []
     
-    for claim_obj in claims:
-        claim = claim_obj.get('claim', '')
-        search_query = claim_obj.get('search_query', claim)
-        
-        print(f"Verifying claim: {claim}")
-        
-        search_results = search_with_serper(search_query)
-        
-        if not search_results or 'organic' not in search_results or len(search_results['organic']) == 0:
-            results.append({
-                "claim": claim,
-                "verified": False,
-                "status": "UNVERIFIED",
-                "reason": "No search results found",
-                "sources": []
-            })
-            continue
+    evidence = pack_evidence(search_results.get('organic', []), claim, max_results=3)
+    for idx, result in enumerate(evidence):
+        search_summary.append(f"Result {idx+1}: {result['title']}\nSnippet: {result['snippet']}\nURL: {result['link']}\n")
         
-        search_summary = []
-        sources = []
-        
-        for idx, result in enumerate(search_results.get('organic', [])[:3]):
-            title = result.get('title', 'Unknown Title')
-            snippet = result.get('snippet', 'No snippet available')
-            link = result.get('link', '#')
+        sources.append({
+            "title": result['title'],
+            "link": result['link']
+        })
+    
+    return search_summary, sources
+
+def _parse_claim_evaluation(claim, evaluation, sources):
+    try:
+        json_match = re.search(r'({[\s\S]*})', evaluation)
+        if json_match:
+            json_str = json_match.group(1)
+            data = json.loads(json_str)
             
-            search_summary.append(f"Result {idx+1}: {title}\nSnippet: {snippet}\nURL: {link}\n")
+            status = data.get('status', 'UNVERIFIED')
+            confidence = data.get('confidence', 5)
+            reason = data.get('reason', 'No reason provided')
             
-            sources.append({
-                "title": title,
-                "link": link
-            })
-        
-        eval_messages = [
-            {"role": "system", "content": """You are a fact-checking assistant. Your task is to evaluate the factual accuracy of a claim based on search results.
-Provide a concise assessment indicating whether the claim is TRUE, FALSE, or UNVERIFIED.
-Return your response as a valid JSON object with the following fields:
-1. status: "TRUE", "FALSE", or "UNVERIFIED"
-2. confidence: A number from 0-10 indicating how confident you are in this assessment
-3. reason: A 1-2 sentence explanation of your assessment"""},
-            {"role": "user", "content": f"Claim to verify: {claim}\n\nSearch Results:\n{''.join(search_summary)}"}
-        ]
-        
-        response = call_groq_api(eval_messages, temperature=0.1)
-        
-        if not response or 'choices' not in response or len(response['choices']) == 0:
-            results.append({
+            return {
                 "claim": claim,
-                "verified": False,
-                "status": "UNVERIFIED",
-                "reason": "Failed to evaluate claim",
+                "verified": True,
+                "status": status,
+                "confidence": confidence,
+                "reason": reason,
                 "sources": sources
-            })
-            continue
-        
-        evaluation = response['choices'][0]['message']['content']
-        
-        try:
-            json_match = re.search(r'({[\s\S]*})', evaluation)
-            if json_match:
-                json_str = json_match.group(1)
-                data = json.loads(json_str)
-                
-                status = data.get('status', 'UNVERIFIED')
-                confidence = data.get('confidence', 5)
-                reason = data.get('reason', 'No reason provided')
-                
-                results.append({
-                    "claim": claim,
-                    "verified": True,
-                    "status": status,
-                    "confidence": confidence,
-                    "reason": reason,
-                    "sources": sources
-                })
-            else:
-                status = "UNVERIFIED"
-                reason = "Could not determine from search results"
-                
-                if "TRUE" in evaluation.upper():
-                    status = "TRUE"
-                elif "FALSE" in evaluation.upper():
-                    status = "FALSE"
-                
-                reason_match = re.search(r'reason:?\s*([^\n]+)', evaluation, re.IGNORECASE)
-                if reason_match:
-                    reason = reason_match.group(1)
-                
-                results.append({
-                    "claim": claim,
-                    "verified": True,
-                    "status": status,
-                    "reason": reason,
-                    "sources": sources
-                })
-        except Exception as e:
-            print(f"Error parsing evaluation: {e}")
-            results.append({
+            }
+        else:
+            status = "UNVERIFIED"
+            reason = "Could not determine from search results"
+            
+            if "TRUE" in evaluation.upper():
+                status = "TRUE"
+            elif "FALSE" in evaluation.upper():
+                status = "FALSE"
+            
+            reason_match = re.search(r'reason:?\s*([^\n]+)', evaluation, re.IGNORECASE)
+            if reason_match:
+                reason = reason_match.group(1)
+            
+            return {
                 "claim": claim,
+                "verified": True,
+                "status": status,
+                "reason": reason,
+                "sources": sources
+            }
+    except Exception as e:
+        print(f"Error parsing evaluation: {e}")
+        return {
+            "claim": claim,
+            "verified": False,
+            "status": "UNVERIFIED",
+            "reason": "Error evaluating claim",
+            "sources": sources
+        }
+
+async def verify_factual_claim_async(claim_obj):
+    """
+    Search for and evaluate a single factual claim
+    """
+    claim = claim_obj.get('claim', '')
+    search_query = claim_obj.get('search_query', claim)
+    
+    print(f"Verifying claim: {claim}")
+    
+    search_results = await search_with_serper_async(search_query)
+    
+    if not search_results or 'organic' not in search_results or len(search_results['organic']) == 0:
+        return {
+            "claim": claim,
+            "verified": False,
+            "status": "UNVERIFIED",
+            "reason": "No search results found",
+            "sources": []
+        }
+    
+    search_summary, sources = _summarize_search_results(search_results, claim)
+    
+    eval_messages = [
+        {"role": "system", "content": EVALUATION_SYSTEM_PROMPT},
+        {"role": "user", "content": f"Claim to verify: {claim}\n\nSearch Results:\n{''.join(search_summary)}"}
+    ]
+    
+    response = await call_groq_api_async(eval_messages, temperature=0.1, operation="evaluate")
+    
+    if not response or 'choices' not in response or len(response['choices']) == 0:
+        return {
+            "claim": claim,
+            "verified": False,
+            "status": "UNVERIFIED",
+            "reason": "Failed to evaluate claim",
+            "sources": sources
+        }
+    
+    return _parse_claim_evaluation(claim, response['choices'][0]['message']['content'], sources)
+
+async def verify_factual_claims_async(claims):
+    """
+    Verify all claims concurrently, keeping results in claim order
+    """
+    results = await asyncio.gather(
+        *(verify_factual_claim_async(claim_obj) for claim_obj in claims),
+        return_exceptions=True
+    )
+    
+    verified = []
+    for claim_obj, result in zip(claims, results):
+        if isinstance(result, Exception):
+            print(f"Error verifying claim: {result}")
+            result = {
+                "claim": claim_obj.get('claim', ''),
                 "verified": False,
                 "status": "UNVERIFIED",
                 "reason": "Error evaluating claim",
-                "sources": sources
-            })
+                "sources": []
+            }
+        verified.append(result)
+    return verified
+
+async def fact_check_message_async(text):
+    """
+    Extract the factual claims in a message and verify them concurrently
+    """
+    factual_claims = await extract_factual_claims_async(text)
+    if not factual_claims:
+        return []
     
-    return results
+    print(f"Found {len(factual_claims)} factual claims to verify")
+    return await verify_factual_claims_async(factual_claims)
+
+def fact_check_message(text):
+    """
+    Blocking entry point for the async extraction -> search -> evaluation chain
+    """
+    return run_async(fact_check_message_async(text))
 
 @app.route('/api/debate/start', methods=['POST'])
 def start_debate():
@@ -302,7 +370,7 @@ def start_debate():
             {"role": "user", "content": f"Let's debate the topic: {topic}. Please provide your opening statement, taking the opposing view to stimulate debate."}
         ]
         
-        response = call_groq_api(messages)
+        response = call_groq_api(messages, operation="opening")
         
         if not response or 'choices' not in response or len(response['choices']) == 0:
             return jsonify({"error": "Failed to generate opening statement"}), 500
@@ -313,7 +381,7 @@ def start_debate():
             "success": True,
             "topic": topic,
             "opening_statement": ai_message,
-            "debate_id": str(int(time.time())),  
+            "debate_id": debate_sessions.create(topic, ai_message),
             "timestamp": time.time()
         })
         
@@ -322,16 +390,33 @@ def start_debate():
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+def unknown_debate_error():
+    return jsonify({"error": "Unknown or expired debate_id, start a new debate or send the full messages"}), 404
+
 @app.route('/api/debate/respond', methods=['POST'])
 def debate_respond():
-    """Generate an AI response to the user's argument with optional fact-checking"""
+    """
+    Generate an AI response to the user's argument with optional fact-checking.
+    Send {debate_id, message} to continue a stored debate, or the full
+    {topic, messages} history.
+    """
     data = request.json
+    debate_id = None
     
-    if not data or 'topic' not in data or 'messages' not in data:
+    if data and 'debate_id' in data and 'message' in data:
+        if not isinstance(data['message'], str) or not data['message'].strip():
+            return jsonify({"error": "Invalid message format"}), 400
+        session = debate_sessions.get(data['debate_id'])
+        if session is None:
+            return unknown_debate_error()
+        debate_id = session['debate_id']
+        topic = session['topic']
+        messages = conversation(session) + [{"role": "user", "content": data['message']}]
+    elif not data or 'topic' not in data or 'messages' not in data:
         return jsonify({"error": "Missing required parameters"}), 400
-    
-    topic = data['topic']
-    messages = data['messages']
+    else:
+        topic = data['topic']
+        messages = data['messages']
     
     if not all(isinstance(m, dict) and 'role' in m and 'content' in m for m in messages):
         return jsonify({"error": "Invalid message format"}), 400
@@ -343,12 +428,7 @@ def debate_respond():
         
         latest_user_message = user_messages[-1]['content']
         
-        factual_claims = extract_factual_claims(latest_user_message)
-        
-        fact_check_results = []
-        if factual_claims:
-            print(f"Found {len(factual_claims)} factual claims to verify")
-            fact_check_results = verify_factual_claims(factual_claims)
+        fact_check_results = fact_check_message(latest_user_message)
         
         system_prompt = DEBATE_SYSTEM_PROMPT.format(topic=topic)
         if fact_check_results:
@@ -363,27 +443,26 @@ def debate_respond():
                     for source in result['sources'][:2]:  # Limit to 2 sources
                         system_prompt += f"- {source['title']}\n"
         
-        formatted_messages = [
-            {"role": "system", "content": system_prompt}
-        ]
-        
-        for message in messages:
-            formatted_messages.append({
-                "role": message['role'],
-                "content": message['content']
-            })
+        formatted_messages, max_tokens = fit_conversation(
+            system_prompt, messages, 800, summarize_conversation,
+            session_key=debate_id or f"debate:{topic}"
+        )
         
-        response = call_groq_api(formatted_messages)
+        response = call_groq_api(formatted_messages, max_tokens=max_tokens, operation="respond")
         
         if not response or 'choices' not in response or len(response['choices']) == 0:
             return jsonify({"error": "Failed to generate response"}), 500
         
         ai_message = response['choices'][0]['message']['content']
         
+        if debate_id is not None:
+            debate_sessions.add_exchange(debate_id, latest_user_message, fact_check_results, ai_message)
+        
         return jsonify({
             "success": True,
             "response": ai_message,
             "fact_checks": fact_check_results,
+            "debate_id": debate_id,
             "timestamp": time.time()
         })
         
@@ -394,14 +473,20 @@ def debate_respond():
 
 @app.route('/api/debate/judge', methods=['POST'])
 def judge_debate():
-    """Judge the debate and determine a winner"""
+    """Judge the debate and determine a winner, from {debate_id} or the full {topic, messages}"""
     data = request.json
     
-    if not data or 'topic' not in data or 'messages' not in data:
+    if data and 'debate_id' in data and 'messages' not in data:
+        session = debate_sessions.get(data['debate_id'])
+        if session is None:
+            return unknown_debate_error()
+        topic = session['topic']
+        messages = conversation(session)
+    elif not data or 'topic' not in data or 'messages' not in data:
         return jsonify({"error": "Missing required parameters"}), 400
-    
-    topic = data['topic']
-    messages = data['messages']
+    else:
+        topic = data['topic']
+        messages = data['messages']
     
     try:
         debate_transcript = ""
@@ -417,7 +502,7 @@ def judge_debate():
             {"role": "user", "content": f"Topic: {topic}\n\nDebate Transcript:\n{debate_transcript}\n\nPlease judge this debate. Determine a winner based on the quality of argumentation, provide a score for each side (on a scale from 50-100), explain your reasoning in detail, and offer constructive feedback for both participants."}
         ]
         
-        response = call_groq_api(judge_messages, temperature=0.3, max_tokens=1200)
+        response = call_groq_api(judge_messages, temperature=0.3, max_tokens=1200, operation="judge")
         
         if not response or 'choices' not in response or len(response['choices']) == 0:
             return jsonify({"error": "Failed to generate judgment"}), 500
@@ -503,18 +588,12 @@ def chatbot_message():
     messages = data['messages']
     
     try:
-        formatted_messages = [
-            {"role": "system", "content": CHATBOT_SYSTEM_PROMPT}
-        ]
+        messages = [m for m in messages if isinstance(m, dict) and 'role' in m and 'content' in m]
+        formatted_messages, max_tokens = fit_conversation(
+            CHATBOT_SYSTEM_PROMPT, messages, 800, summarize_conversation, session_key="chatbot"
+        )
         
-        for message in messages:
-            if isinstance(message, dict) and 'role' in message and 'content' in message:
-                formatted_messages.append({
-                    "role": message['role'],
-                    "content": message['content']
-                })
-        
-        response = call_groq_api(formatted_messages)
+        response = call_groq_api(formatted_messages, max_tokens=max_tokens, operation="chat")
         
         if not response or 'choices' not in response or len(response['choices']) == 0:
             return jsonify({"error": "Failed to generate response"}), 500
@@ -535,9 +614,22 @@ def chatbot_message():
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
 
+@app.route('/stats', methods=['GET'])
+def stats():
+    """Report search cache, debate session, conversation summary, rate limiter and upstream health counters"""
+    return jsonify({
+        "search_cache": search_cache.stats(),
+        "debate_sessions": debate_sessions.stats(),
+        "conversation_summaries": summary_cache.stats(),
+        "rate_limits": rate_limiter_stats(),
+        "upstreams": upstream_stats()
+    })
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5003))
     print(f"🚀 Starting Debate and Chatbot Server on port {port}")
     print("Debate endpoints: /api/debate/start, /api/debate/respond, /api/debate/judge")
     print("Chatbot endpoint: /api/chatbot/message")
+    print("Production serving: python serve.py debate")
+    warm_up_worker()
     app.run(host='0.0.0.0', port=port, debug=True)
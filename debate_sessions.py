@@ -0,0 +1,104 @@
+import copy
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+DEBATE_MAX_SESSIONS = int(os.environ.get("DEBATE_MAX_SESSIONS", 500))
+DEBATE_SESSION_TTL_SECONDS = float(os.environ.get("DEBATE_SESSION_TTL_SECONDS", 2 * 60 * 60))
+
+class DebateSessionStore:
+    """
+    Debates held server side so clients only send the new message each turn.
+    A session keeps the topic and its turns ({"role", "content"}, user turns
+    also carry their "fact_checks"). Sessions idle for longer than
+    DEBATE_SESSION_TTL_SECONDS are dropped, and the least recently used go
+    first once more than DEBATE_MAX_SESSIONS are held.
+    """
+
+    def __init__(self, max_sessions=DEBATE_MAX_SESSIONS, ttl=DEBATE_SESSION_TTL_SECONDS):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+        self.expired = 0
+
+    def create(self, topic, opening_statement):
+        debate_id = uuid.uuid4().hex
+        now = time.time()
+        session = {
+            "debate_id": debate_id,
+            "topic": topic,
+            "created_at": now,
+            "updated_at": now,
+            "accessed_at": now,
+            "turns": [{"role": "assistant", "content": opening_statement}]
+        }
+        with self._lock:
+            self._prune(now)
+            self._sessions[debate_id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evicted += 1
+        return debate_id
+
+    def get(self, debate_id):
+        """
+        A copy of the session, or None if it is unknown or expired
+        """
+        with self._lock:
+            session = self._live(debate_id)
+            return copy.deepcopy(session) if session else None
+
+    def add_exchange(self, debate_id, user_message, fact_checks, ai_message):
+        """
+        Record a user turn (with its fact checks) and the AI's reply. Returns
+        False if the session expired in the meantime.
+        """
+        with self._lock:
+            session = self._live(debate_id)
+            if session is None:
+                return False
+            session["turns"].append({"role": "user", "content": user_message, "fact_checks": fact_checks})
+            session["turns"].append({"role": "assistant", "content": ai_message})
+            session["updated_at"] = time.time()
+            return True
+
+    def _live(self, debate_id):
+        session = self._sessions.get(debate_id)
+        if session is None:
+            return None
+        now = time.time()
+        if now - session["accessed_at"] > self.ttl:
+            del self._sessions[debate_id]
+            self.expired += 1
+            return None
+        session["accessed_at"] = now
+        self._sessions.move_to_end(debate_id)
+        return session
+
+    def _prune(self, now):
+        # Least recently used sessions sit at the front, so stop at the first live one
+        while self._sessions:
+            debate_id, session = next(iter(self._sessions.items()))
+            if now - session["accessed_at"] <= self.ttl:
+                break
+            del self._sessions[debate_id]
+            self.expired += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "evicted": self.evicted,
+                "expired": self.expired
+            }
+
+def conversation(session):
+    """
+    The session's turns as chat messages for the model
+    """
+    return [{"role": turn["role"], "content": turn["content"]} for turn in session["turns"]]
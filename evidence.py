@@ -0,0 +1,94 @@
+import math
+import os
+import re
+from urllib.parse import urlparse
+from claim_dedupe import claim_tokens
+
+EVIDENCE_TOKEN_BUDGET = int(os.environ.get("EVIDENCE_TOKEN_BUDGET", 600))
+
+AUTHORITATIVE_DOMAINS = {
+    "wikipedia.org": 0.6,
+    "britannica.com": 0.8,
+    "nature.com": 1.0,
+    "science.org": 1.0,
+    "nih.gov": 1.0,
+    "who.int": 1.0,
+    "cdc.gov": 1.0,
+    "nasa.gov": 1.0,
+    "noaa.gov": 1.0,
+    "reuters.com": 0.8,
+    "apnews.com": 0.8,
+    "bbc.co.uk": 0.7,
+    "bbc.com": 0.7,
+    "nationalgeographic.com": 0.7,
+    "smithsonianmag.com": 0.7,
+    "snopes.com": 0.7,
+    "politifact.com": 0.7,
+    "factcheck.org": 0.7
+}
+AUTHORITATIVE_SUFFIXES = {".gov": 0.9, ".edu": 0.9, ".int": 0.8, ".ac.uk": 0.8}
+AUTHORITY_WEIGHT = 0.5
+
+def estimate_tokens(text):
+    """
+    Rough token count (about four characters per token for English text)
+    """
+    return math.ceil(len(text) / 4)
+
+def domain_authority(link):
+    host = urlparse(link or "").netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    for domain, score in AUTHORITATIVE_DOMAINS.items():
+        if host == domain or host.endswith("." + domain):
+            return score
+    for suffix, score in AUTHORITATIVE_SUFFIXES.items():
+        if host.endswith(suffix):
+            return score
+    return 0.0
+
+def _relevance(query_tokens, result):
+    if not query_tokens:
+        return 0.0
+    text_tokens = claim_tokens(f"{result['title']} {result['snippet']}")
+    return len(query_tokens & text_tokens) / len(query_tokens)
+
+def format_evidence_item(index, item):
+    return f"[{index}] {item['title']}\n{item['snippet']}\nURL: {item['link']}\n"
+
+def pack_evidence(organic, query, token_budget=EVIDENCE_TOKEN_BUDGET, max_results=None):
+    """
+    Reduce Serper organic results to title/snippet/link, rank them by overlap
+    with the query plus domain authority, and keep as many as fit in the token
+    budget (the best result is always kept, with its snippet cut if needed)
+    """
+    query_tokens = claim_tokens(query)
+    results = []
+    for position, result in enumerate(organic or []):
+        item = {
+            "title": re.sub(r"\s+", " ", result.get("title", "") or "Unknown Title").strip(),
+            "snippet": re.sub(r"\s+", " ", result.get("snippet", "") or "No snippet available").strip(),
+            "link": result.get("link", "") or "#"
+        }
+        score = _relevance(query_tokens, item) + AUTHORITY_WEIGHT * domain_authority(item["link"]) - position * 0.05
+        results.append((score, position, item))
+    results.sort(key=lambda entry: (-entry[0], entry[1]))
+
+    packed = []
+    used = 0
+    for _, _, item in results:
+        if max_results and len(packed) >= max_results:
+            break
+        cost = estimate_tokens(format_evidence_item(len(packed) + 1, item))
+        if used + cost > token_budget:
+            if packed:
+                continue
+            overflow_chars = (used + cost - token_budget) * 4
+            item = dict(item, snippet=item["snippet"][:max(0, len(item["snippet"]) - overflow_chars)].rstrip() + "...")
+            cost = estimate_tokens(format_evidence_item(1, item))
+        packed.append(item)
+        used += cost
+    return packed
+
+def format_evidence(items):
+    return "\n".join(format_evidence_item(index, item) for index, item in enumerate(items, start=1))
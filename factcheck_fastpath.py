@@ -0,0 +1,127 @@
+import os
+import re
+import threading
+from claim_dedupe import claim_signature, claim_similarity, claim_tokens
+from verdict_store import canonicalize_claim
+
+FACTCHECK_MATCH_THRESHOLD = float(os.environ.get("FACTCHECK_MATCH_THRESHOLD", 0.8))
+FACTCHECK_EVIDENCE_REVIEWS = int(os.environ.get("FACTCHECK_EVIDENCE_REVIEWS", 3))
+
+TRUE_RATINGS = {"true", "correct", "accurate", "verified", "confirmed"}
+FALSE_RATINGS = {"false", "pants on fire", "fake", "incorrect", "wrong", "fabricated", "hoax", "not true", "baseless"}
+
+_stats_lock = threading.Lock()
+_stats = {
+    "lookups": 0,
+    "fast_path_hits": 0,
+    "evidence_handoffs": 0
+}
+
+def rating_to_result(textual_rating):
+    """
+    Map a ClaimReview textualRating to TRUE/FALSE, or None when the rating is
+    anything less clear-cut than that (mostly true, misleading, missing context...)
+    """
+    rating = re.sub(r"[^a-z ]", " ", str(textual_rating or "").lower())
+    rating = re.sub(r"\s+", " ", rating).strip()
+    if rating in TRUE_RATINGS:
+        return "TRUE"
+    if rating in FALSE_RATINGS:
+        return "FALSE"
+    return None
+
+def claim_entities(claim):
+    """
+    Capitalized words and acronyms in a claim, folded like claim_tokens
+    """
+    return set(canonicalize_claim(" ".join(re.findall(r"\b[A-Z][\w'’-]*", str(claim)))).split())
+
+def same_claim(claim, reviewed_text):
+    """
+    Whether a reviewed claim says the same thing as this one, so its rating
+    carries over: nearly the same words, the same negations and numbers, and
+    every name in either claim also appears in the other. "Biden won Georgia"
+    and "Trump won Georgia", or "X causes Y" and "X does not cause Y", share
+    most of their words but need opposite verdicts.
+    """
+    if claim_signature(claim) != claim_signature(reviewed_text):
+        return False
+    words, reviewed_words = set(canonicalize_claim(claim).split()), set(canonicalize_claim(reviewed_text).split())
+    if not claim_entities(claim) <= reviewed_words or not claim_entities(reviewed_text) <= words:
+        return False
+    return claim_similarity(claim_tokens(claim), claim_tokens(reviewed_text)) >= FACTCHECK_MATCH_THRESHOLD
+
+def _publisher(review):
+    return review.get("publisher", {}).get("name") or review.get("publisher", {}).get("site") or "Fact-checker"
+
+def verdict_from_factcheck(claim, factcheck_data):
+    """
+    Build a verdict from a Google Fact Check response when one of its reviews
+    is about this very claim and has a clear textual rating; otherwise None
+    """
+    with _stats_lock:
+        _stats["lookups"] += 1
+
+    tokens = claim_tokens(claim)
+    best = None
+    for reviewed_claim in (factcheck_data or {}).get("claims", []):
+        if not same_claim(claim, reviewed_claim.get("text", "")):
+            continue
+        similarity = claim_similarity(tokens, claim_tokens(reviewed_claim.get("text", "")))
+        for review in reviewed_claim.get("claimReview", []):
+            result = rating_to_result(review.get("textualRating"))
+            if result and (best is None or similarity > best[0]):
+                best = (similarity, result, reviewed_claim, review)
+
+    if best is None:
+        return None
+
+    similarity, result, reviewed_claim, review = best
+    publisher = _publisher(review)
+    rating = review.get("textualRating", "")
+    print(f"⚡ Google Fact Check fast path: {publisher} rated \"{reviewed_claim.get('text', '')}\" as {rating}")
+
+    with _stats_lock:
+        _stats["fast_path_hits"] += 1
+
+    detailed_analysis = f"A published fact check by {publisher} reviewed the claim \"{reviewed_claim.get('text', '')}\""
+    if reviewed_claim.get("claimant"):
+        detailed_analysis += f" (made by {reviewed_claim['claimant']})"
+    detailed_analysis += f" and rated it \"{rating}\"."
+    if review.get("title"):
+        detailed_analysis += f" Review title: {review['title']}."
+
+    return {
+        "claim": claim,
+        "result": result,
+        "summary": f"{publisher} rated this claim \"{rating}\".",
+        "detailed_analysis": detailed_analysis,
+        "sources": [{"name": publisher, "url": review["url"]}] if review.get("url") else [],
+        "verification_source": "google_factcheck"
+    }
+
+def factcheck_evidence(factcheck_data, max_reviews=FACTCHECK_EVIDENCE_REVIEWS):
+    """
+    Published reviews as Serper-style organic results, so reviews of related
+    but different claims reach the LLM as evidence rather than as a verdict
+    """
+    evidence = []
+    for reviewed_claim in (factcheck_data or {}).get("claims", []):
+        for review in reviewed_claim.get("claimReview", []):
+            if len(evidence) >= max_reviews:
+                break
+            evidence.append({
+                "title": review.get("title") or f"Fact check: {reviewed_claim.get('text', '')}",
+                "snippet": f"{_publisher(review)} reviewed the claim \"{reviewed_claim.get('text', '')}\" and rated it \"{review.get('textualRating', '')}\".",
+                "link": review.get("url", "")
+            })
+    if evidence:
+        with _stats_lock:
+            _stats["evidence_handoffs"] += 1
+    return evidence
+
+def factcheck_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["fast_path_hit_rate"] = round(stats["fast_path_hits"] / stats["lookups"], 3) if stats["lookups"] else 0.0
+    return stats
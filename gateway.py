@@ -0,0 +1,195 @@
+"""
+One ASGI app serving every route of server1, server2 and debate_server
+(pip install asgiref uvicorn):
+
+    python gateway.py
+    uvicorn gateway:app --port 5000
+
+All three services run in one process, so they share the provider
+connection pools, rate limiters, circuit breakers, search cache and verdict
+store instead of keeping a copy each. Requests are routed with each Flask
+app's own url_map and run on the event loop's thread pool, so blocking
+stages (downloads, Whisper, LLM calls) never block the loop. Streaming (SSE)
+responses are passed through chunk by chunk.
+"""
+import os
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+from werkzeug.routing import RequestRedirect
+import health
+import server1
+import server2
+import debate_server
+
+GATEWAY_PORT = int(os.environ.get("GATEWAY_PORT", 5000))
+GATEWAY_THREADS = int(os.environ.get("GATEWAY_THREADS", 32))
+
+SERVICES = [
+    ("server1", server1.app),
+    ("server2", server2.app),
+    ("debate", debate_server.app)
+]
+# Routes several services define; the gateway calls each of them and merges the JSON
+SHARED_PATHS = {"/stats", "/verdicts/invalidate"}
+
+def _matches(flask_app, path, method):
+    try:
+        flask_app.url_map.bind("localhost").match(path, method)
+        return True
+    except (MethodNotAllowed, RequestRedirect):
+        return True
+    except NotFound:
+        return False
+
+def _dispatch_json(flask_app, path, method, body, headers):
+    """
+    Run one Flask view for an aggregated route and return (status, json)
+    """
+    with flask_app.test_request_context(path, method=method, data=body, headers=headers):
+        response = flask_app.full_dispatch_request()
+        return response.status_code, response.get_json(silent=True)
+
+class _ConcurrentWsgiInstance(WsgiToAsgiInstance):
+    """
+    asgiref runs WSGI apps thread-sensitively (every request on one shared
+    thread) by default; these apps are thread-safe, so each request runs on
+    the event loop's executor instead. This mirrors asgiref's own
+    run_wsgi_app, including its Content-Length handling, and relies on the
+    adapter's internal response_start / response_started /
+    response_content_length attributes, which is why requirements.txt pins
+    asgiref to one minor release.
+    """
+
+    async def run_wsgi_app(self, body):
+        await sync_to_async(self._run_in_thread, thread_sensitive=False)(body)
+
+    def _run_in_thread(self, body):
+        try:
+            environ = self.build_environ(self.scope, body)
+        except ValueError:
+            # build_environ rejects requests with too many duplicate headers
+            self.sync_send({"type": "http.response.start", "status": 400, "headers": [(b"content-type", b"text/plain")]})
+            self.sync_send({"type": "http.response.body", "body": b"Bad Request"})
+            return
+        response = self.wsgi_application(environ, self.start_response)
+        bytes_sent = 0
+        try:
+            for output in response:
+                if not output:
+                    continue
+                if not self.response_started:
+                    self.response_started = True
+                    self.sync_send(self.response_start)
+                # Never send more than the app's Content-Length, and stop once it is reached
+                if self.response_content_length is not None:
+                    output = output[:self.response_content_length - bytes_sent]
+                self.sync_send({"type": "http.response.body", "body": output, "more_body": True})
+                bytes_sent += len(output)
+                if bytes_sent == self.response_content_length:
+                    break
+        finally:
+            if hasattr(response, "close"):
+                response.close()
+        if not self.response_started:
+            self.response_started = True
+            self.sync_send(self.response_start)
+        self.sync_send({"type": "http.response.body"})
+
+class ConcurrentWsgiToAsgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        await _ConcurrentWsgiInstance(self.wsgi_application)(scope, receive, send)
+
+class Gateway:
+    def __init__(self, services):
+        self.services = [(name, flask_app, ConcurrentWsgiToAsgi(flask_app)) for name, flask_app in services]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        path, method = scope["path"], scope["method"]
+        if path == "/healthz":
+            await self._send_json(send, 200, {"status": "ok"})
+            return
+        if path == "/readyz":
+            ready = health.is_ready()
+            await self._send_json(send, 200 if ready else 503, {"status": "ready" if ready else "not_ready"})
+            return
+        if path in SHARED_PATHS and method != "OPTIONS":
+            await self._aggregate(scope, receive, send)
+            return
+
+        for _, flask_app, asgi_app in self.services:
+            if _matches(flask_app, path, method):
+                await asgi_app(scope, receive, send)
+                return
+        await self._send_json(send, 404, {"error": f"No service handles {method} {path}"})
+
+    async def _lifespan(self, receive, send):
+        loop = asyncio.get_running_loop()
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                loop.set_default_executor(ThreadPoolExecutor(max_workers=GATEWAY_THREADS, thread_name_prefix="gateway"))
+                await loop.run_in_executor(None, health.warm_up_worker)
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                health.begin_draining()
+                await loop.run_in_executor(None, health.run_shutdown_hooks)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _aggregate(self, scope, receive, send):
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        path, method = scope["path"], scope["method"]
+        headers = [(key.decode("latin-1"), value.decode("latin-1")) for key, value in scope["headers"]]
+
+        loop = asyncio.get_running_loop()
+        targets = [flask_app for _, flask_app, _ in self.services if _matches(flask_app, path, method)]
+        results = await asyncio.gather(*(
+            loop.run_in_executor(None, _dispatch_json, flask_app, path, method, body, headers)
+            for flask_app in targets
+        ))
+
+        status, merged = 404, {}
+        for service_status, payload in results:
+            status = service_status if status == 404 or service_status >= 400 else status
+            if isinstance(payload, dict):
+                merged.update(payload)
+        await self._send_json(send, status, merged)
+
+    async def _send_json(self, send, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"access-control-allow-origin", b"*")
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+app = Gateway(SERVICES)
+
+if __name__ == "__main__":
+    try:
+        import uvicorn
+    except ImportError:
+        print("❌ The gateway needs an ASGI server: pip install uvicorn")
+        raise SystemExit(1)
+    print(f"🚀 Starting gateway for server1, server2 and debate_server - http://localhost:{GATEWAY_PORT}/")
+    uvicorn.run(app, host="0.0.0.0", port=GATEWAY_PORT)
@@ -0,0 +1,65 @@
+import threading
+import traceback
+from flask import jsonify
+
+_ready = threading.Event()
+_draining = threading.Event()
+_warm_ups = []
+_shutdown_hooks = []
+
+def register_health_routes(app, warm_up=None):
+    """
+    Add GET /healthz (liveness: the process is serving) and GET /readyz
+    (readiness: warmed up and not draining) to a Flask app. warm_up is run
+    once per process by warm_up_worker before it reports ready.
+    """
+    if warm_up is not None:
+        _warm_ups.append(warm_up)
+
+    @app.route("/healthz", methods=["GET"])
+    def healthz():
+        return jsonify({"status": "ok"})
+
+    @app.route("/readyz", methods=["GET"])
+    def readyz():
+        if _draining.is_set():
+            return jsonify({"status": "draining"}), 503
+        if not _ready.is_set():
+            return jsonify({"status": "warming_up"}), 503
+        return jsonify({"status": "ready"})
+
+def warm_up_worker():
+    """
+    Warm provider connections for this process, then report ready. A failed
+    warm-up still reports ready: the first requests just pay for the handshakes.
+    """
+    for warm_up in _warm_ups:
+        try:
+            warm_up()
+        except Exception as e:
+            print(f"⚠️ Warm-up failed: {e}")
+            traceback.print_exc()
+    _ready.set()
+    print("✅ Worker ready")
+
+def is_ready():
+    return _ready.is_set() and not _draining.is_set()
+
+def begin_draining():
+    _draining.set()
+    print("🚰 Draining: readiness now reports 503")
+
+def on_shutdown(hook):
+    """
+    Register a callable run when the worker exits, after in-flight requests finished
+    """
+    _shutdown_hooks.append(hook)
+    return hook
+
+def run_shutdown_hooks():
+    for hook in _shutdown_hooks:
+        try:
+            hook()
+        except Exception as e:
+            print(f"⚠️ Shutdown hook failed: {e}")
+            traceback.print_exc()
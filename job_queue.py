@@ -0,0 +1,111 @@
+import copy
+import os
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+JOB_MAX_RETAINED = int(os.environ.get("JOB_MAX_RETAINED", 200))
+JOB_RETENTION_SECONDS = float(os.environ.get("JOB_RETENTION_SECONDS", 60 * 60))
+
+PROGRESS_EVENTS = {"claim", "claim_extracted", "transcript_segment"}
+
+class JobManager:
+    """
+    Runs pipeline event generators (see analyze_video_events) on a background
+    worker pool and keeps their status, stage timings and results for polling.
+    Finished jobs are dropped after JOB_RETENTION_SECONDS, or oldest first once
+    more than JOB_MAX_RETAINED jobs are held.
+    """
+
+    def __init__(self, max_workers=JOB_WORKERS, max_retained=JOB_MAX_RETAINED, retention_seconds=JOB_RETENTION_SECONDS):
+        self.max_retained = max_retained
+        self.retention_seconds = retention_seconds
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+
+    def submit(self, kind, events_fn, *args):
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "stage": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "stage_timings": [],
+            "claims_verified": 0,
+            "result": None,
+            "error": None
+        }
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = job
+        self._executor.submit(self._run, job, events_fn, args)
+        print(f"📥 Queued {kind} job {job_id}")
+        return job_id
+
+    def _run(self, job, events_fn, args):
+        with self._lock:
+            job["status"] = "running"
+            job["started_at"] = time.time()
+        stage_started = time.time()
+        try:
+            for event, payload in events_fn(*args):
+                now = time.time()
+                with self._lock:
+                    if event in PROGRESS_EVENTS:
+                        if event == "claim":
+                            job["claims_verified"] += 1
+                        continue
+                    job["stage_timings"].append({"stage": event, "seconds": round(now - stage_started, 3)})
+                    job["stage"] = event
+                    if event == "error":
+                        job["status"] = "failed"
+                        job["error"] = payload.get("error")
+                    elif event == "summary":
+                        job["status"] = "done"
+                        job["result"] = payload
+                stage_started = now
+            with self._lock:
+                if job["status"] == "running":
+                    job["status"] = "failed"
+                    job["error"] = "Pipeline finished without a result"
+        except Exception as e:
+            print(f"❌ Job {job['job_id']} failed: {e}")
+            traceback.print_exc()
+            with self._lock:
+                job["status"] = "failed"
+                job["error"] = str(e)
+        finally:
+            with self._lock:
+                job["finished_at"] = time.time()
+            print(f"📤 Job {job['job_id']} {job['status']}")
+
+    def shutdown(self, wait=True):
+        """
+        Stop taking jobs; with wait, block until queued and running jobs finish
+        """
+        self._executor.shutdown(wait=wait)
+
+    def get(self, job_id):
+        with self._lock:
+            self._prune()
+            job = self._jobs.get(job_id)
+            return copy.deepcopy(job) if job else None
+
+    def _prune(self):
+        now = time.time()
+        finished = [job_id for job_id, job in self._jobs.items() if job["finished_at"] is not None]
+        for job_id in finished:
+            if now - self._jobs[job_id]["finished_at"] > self.retention_seconds:
+                del self._jobs[job_id]
+        for job_id in finished:
+            if len(self._jobs) <= self.max_retained:
+                break
+            self._jobs.pop(job_id, None)
@@ -0,0 +1,234 @@
+import json
+import re
+
+WHITESPACE = " \t\r\n"
+VALUE_TERMINATORS = ",}]:"
+STRING_SPECIALS = {'"': re.compile(r'["\\]'), "'": re.compile(r"['\\]")}
+BARE_KEY = re.compile(r"[\w-]+\s*:")
+
+class _TolerantParser:
+    """
+    Single-pass, linear-time parser for the almost-JSON that LLMs return:
+    missing or trailing commas, unescaped quotes inside strings, raw newlines,
+    single-quoted or unquoted keys, and output cut off mid-value.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.length = len(text)
+        self.pos = 0
+
+    def skip_whitespace(self):
+        text, pos, length = self.text, self.pos, self.length
+        while pos < length and text[pos] in WHITESPACE:
+            pos += 1
+        self.pos = pos
+
+    def peek(self):
+        self.skip_whitespace()
+        return self.text[self.pos] if self.pos < self.length else ""
+
+    def parse_value(self):
+        char = self.peek()
+        if char == "{":
+            return self.parse_object()
+        if char == "[":
+            return self.parse_array()
+        if char in "\"'":
+            return self.parse_string()
+        if char == "" or char in VALUE_TERMINATORS:
+            return None
+        return self.parse_bare()
+
+    def parse_object(self):
+        self.pos += 1
+        result = {}
+        while True:
+            char = self.peek()
+            if char == "":
+                return result
+            if char == "}":
+                self.pos += 1
+                return result
+            if char in ",:":
+                self.pos += 1
+                continue
+            if char == "]":
+                # Mismatched closer: treat it as the end of this object
+                self.pos += 1
+                return result
+            if char in "{[":
+                # A nested value where a key should be: keep its contents out of this object
+                self.parse_value()
+                continue
+            key = self.parse_string() if char in "\"'" else self.parse_key()
+            if self.peek() != ":":
+                # A key with no value (usually truncated output) is dropped
+                continue
+            self.pos += 1
+            if self.peek() == "":
+                return result
+            result[str(key)] = self.parse_value()
+
+    def parse_array(self):
+        self.pos += 1
+        result = []
+        while True:
+            char = self.peek()
+            if char == "":
+                return result
+            if char == "]":
+                self.pos += 1
+                return result
+            if char == ",":
+                self.pos += 1
+                continue
+            if char in "}:":
+                self.pos += 1
+                if char == "}":
+                    return result
+                continue
+            result.append(self.parse_value())
+
+    def parse_key(self):
+        start = self.pos
+        text, length = self.text, self.length
+        while self.pos < length and text[self.pos] not in ":,{}[]" + WHITESPACE:
+            self.pos += 1
+        return text[start:self.pos]
+
+    def parse_string(self):
+        text, length = self.text, self.length
+        quote = text[self.pos]
+        self.pos += 1
+        chunks = []
+        start = self.pos
+        specials = STRING_SPECIALS[quote]
+        while True:
+            match = specials.search(text, self.pos)
+            if match is None:
+                self.pos = length
+                break
+            self.pos = match.start()
+            if text[self.pos] == "\\":
+                if self.pos + 1 >= length:
+                    self.pos = length
+                    break
+                chunks.append(text[start:self.pos])
+                chunks.append(self.decode_escape())
+                start = self.pos
+                continue
+            # A quote only closes the string if what follows can follow a value;
+            # otherwise it is an unescaped quote inside the text
+            if self.closes_string(self.pos + 1):
+                chunks.append(text[start:self.pos])
+                self.pos += 1
+                return "".join(chunks)
+            self.pos += 1
+        chunks.append(text[start:self.pos])
+        return "".join(chunks)
+
+    def next_non_whitespace(self, pos):
+        text, length = self.text, self.length
+        while pos < length and text[pos] in WHITESPACE:
+            pos += 1
+        return pos
+
+    def closes_string(self, pos):
+        """
+        Whether a quote at pos - 1 ends the string: it must be followed by
+        something that can follow a value. After a comma, the next thing must
+        also look like the start of a key (quoted or bare) or value, so `"said "no", then"`
+        stays one string.
+        """
+        pos = self.next_non_whitespace(pos)
+        if pos >= self.length:
+            return True
+        char = self.text[pos]
+        if char in "}]:\"'":
+            return True
+        if char != ",":
+            return False
+        pos = self.next_non_whitespace(pos + 1)
+        if pos >= self.length:
+            return True
+        char = self.text[pos]
+        if char in "\"'{[]}-" or char.isdigit() or self.text.startswith(("true", "false", "null"), pos):
+            return True
+        return BARE_KEY.match(self.text, pos) is not None
+
+    def decode_escape(self):
+        escape = self.text[self.pos + 1]
+        self.pos += 2
+        simple = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "/": "/", "\\": "\\", '"': '"', "'": "'"}
+        if escape in simple:
+            return simple[escape]
+        if escape == "u":
+            code = self.hex_code(self.pos)
+            if code is None:
+                return "\\u"
+            self.pos += 4
+            if 0xD800 <= code <= 0xDBFF:
+                # A high surrogate and the low one after it make one code point (e.g. an emoji)
+                low = self.hex_code(self.pos + 2) if self.text.startswith("\\u", self.pos) else None
+                if low is not None and 0xDC00 <= low <= 0xDFFF:
+                    self.pos += 6
+                    return chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00))
+            if 0xD800 <= code <= 0xDFFF:
+                # A lone surrogate can't be encoded as UTF-8
+                return "\ufffd"
+            return chr(code)
+        return escape
+
+    def hex_code(self, pos):
+        digits = self.text[pos:pos + 4]
+        if len(digits) != 4 or any(c not in "0123456789abcdefABCDEF" for c in digits):
+            return None
+        return int(digits, 16)
+
+    def parse_bare(self):
+        start = self.pos
+        text, length = self.text, self.length
+        while self.pos < length and text[self.pos] not in VALUE_TERMINATORS + "{[\"\n":
+            self.pos += 1
+        token = text[start:self.pos].strip()
+        lowered = token.lower()
+        if lowered in ("true", "false"):
+            return lowered == "true"
+        if lowered in ("null", "none"):
+            return None
+        try:
+            return int(token)
+        except ValueError:
+            pass
+        try:
+            return float(token)
+        except ValueError:
+            return token
+
+def repair_json_value(text):
+    """
+    Parse the first JSON object or array in text, tolerating the usual LLM
+    formatting mistakes. Raises ValueError if there is no object or array.
+    """
+    starts = [index for index in (text.find("{"), text.find("[")) if index >= 0]
+    if not starts:
+        raise ValueError("No JSON object or array found")
+    parser = _TolerantParser(text)
+    parser.pos = min(starts)
+    return parser.parse_value()
+
+def fix_broken_json(json_str):
+    """
+    Return a string json.loads can parse, repairing json_str if needed.
+    Falls back to returning json_str unchanged if nothing can be recovered.
+    """
+    try:
+        json.loads(json_str)
+        return json_str
+    except (json.JSONDecodeError, TypeError):
+        pass
+    try:
+        return json.dumps(repair_json_value(json_str), ensure_ascii=False)
+    except Exception:
+        return json_str
@@ -0,0 +1,125 @@
+import os
+import asyncio
+import threading
+import traceback
+import httpx
+from rate_limiter import RateLimitedTransport, AsyncRateLimitedTransport
+
+PROVIDER_BASE_URLS = {
+    "serper": "https://google.serper.dev",
+    "google_factcheck": "https://factchecktools.googleapis.com",
+    "groq": "https://api.groq.com"
+}
+
+CONNECT_TIMEOUT = float(os.environ.get("PROVIDER_CONNECT_TIMEOUT", 5))
+READ_TIMEOUTS = {
+    "serper": float(os.environ.get("SERPER_READ_TIMEOUT", 15)),
+    "google_factcheck": float(os.environ.get("GOOGLE_FACTCHECK_READ_TIMEOUT", 10)),
+    "groq": float(os.environ.get("GROQ_READ_TIMEOUT", 60))
+}
+POOL_SIZE = int(os.environ.get("PROVIDER_POOL_SIZE", 20))
+KEEPALIVE_EXPIRY = float(os.environ.get("PROVIDER_KEEPALIVE_EXPIRY", 60))
+USE_HTTP2 = os.environ.get("PROVIDER_HTTP2", "0") == "1"
+
+_clients = {}
+_async_clients = {}
+_clients_lock = threading.Lock()
+_async_loop = None
+
+def provider_timeout(provider):
+    return httpx.Timeout(READ_TIMEOUTS.get(provider, 30.0), connect=CONNECT_TIMEOUT)
+
+def _pool_limits():
+    return httpx.Limits(
+        max_connections=POOL_SIZE,
+        max_keepalive_connections=POOL_SIZE,
+        keepalive_expiry=KEEPALIVE_EXPIRY
+    )
+
+def _http2_enabled():
+    if not USE_HTTP2:
+        return False
+    try:
+        import h2
+        return True
+    except ImportError:
+        print("⚠️ PROVIDER_HTTP2 is set but the 'h2' package is not installed, falling back to HTTP/1.1")
+        return False
+
+def get_client(provider):
+    """
+    Return the pooled keep-alive client for a provider, creating it on first use.
+    Requests go through the provider's rate limiter and are retried on 429/5xx.
+    """
+    client = _clients.get(provider)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(provider)
+            if client is None:
+                transport = httpx.HTTPTransport(limits=_pool_limits(), http2=_http2_enabled())
+                client = httpx.Client(
+                    timeout=provider_timeout(provider),
+                    transport=RateLimitedTransport(provider, transport)
+                )
+                _clients[provider] = client
+    return client
+
+def _get_async_loop():
+    """
+    Start (once) the background event loop shared by all async provider calls
+    """
+    global _async_loop
+    if _async_loop is None:
+        with _clients_lock:
+            if _async_loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="provider-loop", daemon=True)
+                thread.start()
+                _async_loop = loop
+    return _async_loop
+
+def get_async_client(provider):
+    """
+    Pooled async client for a provider; only call this from coroutines run via run_async
+    """
+    client = _async_clients.get(provider)
+    if client is None:
+        transport = httpx.AsyncHTTPTransport(limits=_pool_limits(), http2=_http2_enabled())
+        client = httpx.AsyncClient(
+            timeout=provider_timeout(provider),
+            transport=AsyncRateLimitedTransport(provider, transport)
+        )
+        _async_clients[provider] = client
+    return client
+
+def run_async(coro):
+    """
+    Run a coroutine on the shared provider loop and block until it finishes
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_async_loop()).result()
+
+def warm_up_connections(providers=None):
+    """
+    Open a pooled connection to each provider so the first real request skips the TCP+TLS handshake
+    """
+    for provider in providers or PROVIDER_BASE_URLS:
+        try:
+            response = get_client(provider).head(PROVIDER_BASE_URLS[provider])
+            print(f"🔥 Warmed {provider} connection ({response.http_version})")
+        except Exception as e:
+            print(f"⚠️ Could not warm {provider} connection: {e}")
+
+async def _warm_up_async(providers):
+    for provider in providers:
+        try:
+            response = await get_async_client(provider).head(PROVIDER_BASE_URLS[provider])
+            print(f"🔥 Warmed async {provider} connection ({response.http_version})")
+        except Exception as e:
+            print(f"⚠️ Could not warm async {provider} connection: {e}")
+
+def warm_up_async_connections(providers=None):
+    try:
+        run_async(_warm_up_async(list(providers or PROVIDER_BASE_URLS)))
+    except Exception as e:
+        print(f"⚠️ Async connection warm-up failed: {e}")
+        traceback.print_exc()
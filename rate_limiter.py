@@ -0,0 +1,403 @@
+import os
+import re
+import time
+import random
+import asyncio
+import threading
+from email.utils import parsedate_to_datetime
+import httpx
+from deadline import DeadlineExceeded, remaining_seconds
+
+RATE_LIMITS = {
+    "serper": float(os.environ.get("SERPER_RATE_LIMIT", 10)),
+    "google_factcheck": float(os.environ.get("GOOGLE_FACTCHECK_RATE_LIMIT", 10)),
+    "groq": float(os.environ.get("GROQ_RATE_LIMIT", 5))
+}
+INITIAL_CONCURRENCY = float(os.environ.get("PROVIDER_INITIAL_CONCURRENCY", 4))
+MAX_CONCURRENCY = float(os.environ.get("PROVIDER_MAX_CONCURRENCY", os.environ.get("PROVIDER_POOL_SIZE", 20)))
+MAX_RETRIES = int(os.environ.get("PROVIDER_MAX_RETRIES", 4))
+RETRY_BUDGET_SECONDS = float(os.environ.get("PROVIDER_RETRY_BUDGET", 30))
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_CAP_SECONDS = 8.0
+DECREASE_COOLDOWN_SECONDS = 1.0
+POLL_SECONDS = 0.05
+# 429/503 mean the provider turned the request away; other 5xx and a dropped
+# connection may come after it did the work (and charged for it), so those are
+# only retried for idempotent methods, never for e.g. a Groq completion POST
+THROTTLE_STATUSES = {429, 503}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# The request never reached the provider
+RETRY_EXCEPTIONS = (httpx.ConnectError, httpx.ConnectTimeout)
+IDEMPOTENT_RETRY_EXCEPTIONS = RETRY_EXCEPTIONS + (httpx.RemoteProtocolError,)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+def parse_duration(value):
+    """
+    Seconds in a rate-limit header: plain seconds ("7") or Groq's "1m2.5s" / "250ms" form
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if parts:
+        return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+    return None
+
+def retry_after_seconds(headers):
+    """
+    How long the provider asked us to wait, from Retry-After (seconds or HTTP date)
+    """
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    seconds = parse_duration(value)
+    if seconds is not None:
+        return seconds
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def exhausted_window_seconds(headers):
+    """
+    If x-ratelimit-remaining-* says the current window is used up, how long
+    until its x-ratelimit-reset-* comes around
+    """
+    wait = None
+    for kind in ("requests", "tokens"):
+        remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+        try:
+            if remaining is None or float(remaining) > 0:
+                continue
+        except ValueError:
+            continue
+        reset = parse_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+        if reset is not None:
+            wait = max(wait or 0.0, reset)
+    return wait
+
+def backoff_delay(attempt):
+    """
+    Full-jitter exponential backoff
+    """
+    return random.uniform(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt)))
+
+class ProviderLimiter:
+    """
+    Token bucket (requests per second with a burst allowance) plus an AIMD
+    concurrency limit for one provider: the limit grows by roughly one per
+    round of successful requests and halves when the provider pushes back.
+    Shared by the sync and async clients, so waiting is done by the caller.
+    """
+
+    def __init__(self, provider, rate, burst=None):
+        self.provider = provider
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate * 2)
+        self.tokens = self.burst
+        self.concurrency_limit = min(INITIAL_CONCURRENCY, MAX_CONCURRENCY)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "throttled": 0, "retries": 0, "gave_up": 0}
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self):
+        """
+        Take a slot if one is free; otherwise return how long to wait before trying again
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now < self.paused_until:
+                return self.paused_until - now
+            if self.in_flight >= int(self.concurrency_limit):
+                return POLL_SECONDS
+            if self.tokens < 1:
+                return (1 - self.tokens) / self.rate if self.rate > 0 else POLL_SECONDS
+            self.tokens -= 1
+            self.in_flight += 1
+            self._counters["requests"] += 1
+            return 0.0
+
+    def acquire(self, give_up_at=None):
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            if give_up_at is not None and time.monotonic() + wait > give_up_at:
+                raise DeadlineExceeded(f"No {self.provider} request slot before the deadline")
+            time.sleep(wait)
+
+    async def acquire_async(self, give_up_at=None):
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return
+            if give_up_at is not None and time.monotonic() + wait > give_up_at:
+                raise DeadlineExceeded(f"No {self.provider} request slot before the deadline")
+            await asyncio.sleep(wait)
+
+    def release(self, throttled=False, headers=None):
+        """
+        Free the slot and adapt: additive increase on success, multiplicative
+        decrease (at most once per cooldown) when throttled, and pause the
+        bucket if the provider says the window is exhausted
+        """
+        pause = None
+        if headers is not None:
+            pause = retry_after_seconds(headers) if throttled else None
+            window = exhausted_window_seconds(headers)
+            if window is not None:
+                pause = max(pause or 0.0, window)
+        with self._lock:
+            now = time.monotonic()
+            self.in_flight = max(0, self.in_flight - 1)
+            if throttled:
+                self._counters["throttled"] += 1
+                if now - self._last_decrease >= DECREASE_COOLDOWN_SECONDS:
+                    self.concurrency_limit = max(1.0, self.concurrency_limit / 2)
+                    self._last_decrease = now
+                    print(f"🐢 {self.provider} throttled, concurrency limit now {int(self.concurrency_limit)}")
+            else:
+                self.concurrency_limit = min(MAX_CONCURRENCY, self.concurrency_limit + 1 / self.concurrency_limit)
+            if pause:
+                self.paused_until = max(self.paused_until, now + pause)
+
+    def record(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "rate_per_second": self.rate,
+                "burst": self.burst,
+                "tokens": round(self.tokens, 2),
+                "concurrency_limit": int(self.concurrency_limit),
+                "in_flight": self.in_flight,
+                "paused_for_seconds": round(max(0.0, self.paused_until - time.monotonic()), 2),
+                **self._counters
+            }
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(provider):
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(provider)
+            if limiter is None:
+                limiter = ProviderLimiter(provider, RATE_LIMITS.get(provider, 10.0))
+                _limiters[provider] = limiter
+    return limiter
+
+def rate_limiter_stats():
+    return {provider: limiter.stats() for provider, limiter in list(_limiters.items())}
+
+def _request_deadline(request):
+    """
+    (give_up_at, request_deadline) in monotonic time: when retrying stops (the
+    retry budget or the request deadline, whichever is sooner) and the request
+    deadline itself, or None if the request has none
+    """
+    now = time.monotonic()
+    remaining = remaining_seconds()
+    if remaining is None:
+        return now + RETRY_BUDGET_SECONDS, None
+    if remaining <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before calling {request.url.host}")
+    return now + min(RETRY_BUDGET_SECONDS, remaining), now + remaining
+
+def _fit_timeouts(request, request_deadline):
+    """
+    Shorten the request's connect/read/write/pool timeouts to the time left
+    """
+    if request_deadline is None:
+        return
+    remaining = request_deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before calling {request.url.host}")
+    timeouts = request.extensions.get("timeout") or {}
+    request.extensions["timeout"] = {
+        name: remaining if value is None else min(value, remaining)
+        for name, value in {**dict.fromkeys(("connect", "read", "write", "pool")), **timeouts}.items()
+    }
+
+def _retryable_status(request, status_code):
+    if status_code in THROTTLE_STATUSES:
+        return True
+    return status_code in RETRY_STATUSES and request.method in IDEMPOTENT_METHODS
+
+def _retry_exceptions(request):
+    return IDEMPOTENT_RETRY_EXCEPTIONS if request.method in IDEMPOTENT_METHODS else RETRY_EXCEPTIONS
+
+class _ReleasingStream(httpx.SyncByteStream, httpx.AsyncByteStream):
+    """
+    Response body that gives the limiter slot back once it has been read and
+    closed, so a provider streaming a slow body still counts as in flight
+    """
+
+    def __init__(self, stream, release):
+        self._stream = stream
+        self._release = release
+
+    def __iter__(self):
+        yield from self._stream
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    def _released(self):
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._released()
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._released()
+
+def _release_on_close(limiter, response):
+    throttled = response.status_code in THROTTLE_STATUSES
+    release = lambda: limiter.release(throttled=throttled, headers=response.headers)
+    if response.is_closed:
+        # The body was already read in full
+        release()
+        return
+    response.stream = _ReleasingStream(response.stream, release)
+
+def _retry_wait(response, attempt):
+    wait = backoff_delay(attempt)
+    if response is not None:
+        asked = retry_after_seconds(response.headers)
+        if asked is not None:
+            wait = max(wait, asked)
+    return wait
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """
+    httpx transport that sends every request for a provider through its
+    limiter (holding a slot until the response body is closed) and retries
+    429/503 responses and failed connections with jittered backoff, within
+    MAX_RETRIES and RETRY_BUDGET_SECONDS. Other 5xx responses and dropped
+    connections are only retried for idempotent methods.
+    """
+
+    def __init__(self, provider, transport):
+        self.limiter = get_limiter(provider)
+        self.transport = transport
+
+    def handle_request(self, request):
+        deadline, request_deadline = _request_deadline(request)
+        retry_exceptions = _retry_exceptions(request)
+        attempt = 0
+        while True:
+            _fit_timeouts(request, request_deadline)
+            self.limiter.acquire(request_deadline)
+            response = None
+            try:
+                response = self.transport.handle_request(request)
+            except retry_exceptions:
+                self.limiter.release(throttled=False)
+                if attempt >= MAX_RETRIES:
+                    self.limiter.record("gave_up")
+                    raise
+            except Exception:
+                self.limiter.release(throttled=False)
+                raise
+            else:
+                _release_on_close(self.limiter, response)
+                if not _retryable_status(request, response.status_code):
+                    return response
+                if attempt >= MAX_RETRIES:
+                    self.limiter.record("gave_up")
+                    return response
+
+            wait = _retry_wait(response, attempt)
+            if time.monotonic() + wait > deadline:
+                self.limiter.record("gave_up")
+                if response is None:
+                    raise httpx.ConnectError(f"{self.limiter.provider} unreachable within retry budget", request=request)
+                return response
+            if response is not None:
+                response.close()
+            print(f"🔁 Retrying {self.limiter.provider} request in {wait:.1f}s (attempt {attempt + 2})")
+            self.limiter.record("retries")
+            time.sleep(wait)
+            attempt += 1
+
+    def close(self):
+        self.transport.close()
+
+class AsyncRateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Async counterpart of RateLimitedTransport, sharing the same per-provider limiter
+    """
+
+    def __init__(self, provider, transport):
+        self.limiter = get_limiter(provider)
+        self.transport = transport
+
+    async def handle_async_request(self, request):
+        deadline, request_deadline = _request_deadline(request)
+        retry_exceptions = _retry_exceptions(request)
+        attempt = 0
+        while True:
+            _fit_timeouts(request, request_deadline)
+            await self.limiter.acquire_async(request_deadline)
+            response = None
+            try:
+                response = await self.transport.handle_async_request(request)
+            except retry_exceptions:
+                self.limiter.release(throttled=False)
+                if attempt >= MAX_RETRIES:
+                    self.limiter.record("gave_up")
+                    raise
+            except Exception:
+                self.limiter.release(throttled=False)
+                raise
+            else:
+                _release_on_close(self.limiter, response)
+                if not _retryable_status(request, response.status_code):
+                    return response
+                if attempt >= MAX_RETRIES:
+                    self.limiter.record("gave_up")
+                    return response
+
+            wait = _retry_wait(response, attempt)
+            if time.monotonic() + wait > deadline:
+                self.limiter.record("gave_up")
+                if response is None:
+                    raise httpx.ConnectError(f"{self.limiter.provider} unreachable within retry budget", request=request)
+                return response
+            if response is not None:
+                await response.aclose()
+            print(f"🔁 Retrying {self.limiter.provider} request in {wait:.1f}s (attempt {attempt + 2})")
+            self.limiter.record("retries")
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    async def aclose(self):
+        await self.transport.aclose()
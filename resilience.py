@@ -0,0 +1,327 @@
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from deadline import DeadlineExceeded, bind_deadline, deadline_expired, remaining_seconds
+
+HEDGE_ENABLED = os.environ.get("HEDGE_REQUESTS", "1") == "1"
+HEDGE_PERCENTILE = float(os.environ.get("HEDGE_PERCENTILE", 95))
+HEDGE_MIN_DELAY_SECONDS = float(os.environ.get("HEDGE_MIN_DELAY", 0.25))
+HEDGE_MIN_SAMPLES = int(os.environ.get("HEDGE_MIN_SAMPLES", 20))
+HEDGE_MAX_RATIO = float(os.environ.get("HEDGE_MAX_RATIO", 0.1))
+HEDGE_MAX_WORKERS = int(os.environ.get("HEDGE_MAX_WORKERS", 16))
+LATENCY_WINDOW = 200
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", 5))
+CIRCUIT_RESET_SECONDS = float(os.environ.get("CIRCUIT_RESET_SECONDS", 30))
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_ALL = object()
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling a provider whose circuit breaker is open
+    """
+
+class UpstreamHealth:
+    """
+    Latency windows (one per operation, so slow and fast calls to the same
+    provider get their own hedge delay) and circuit breaker for one provider. The breaker opens
+    after CIRCUIT_FAILURE_THRESHOLD calls in a row fail, rejects calls for
+    CIRCUIT_RESET_SECONDS, then lets a single probe through (half open):
+    success closes it again, failure re-opens it.
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.latencies = {}
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.probe_started = 0.0
+        self._lock = threading.Lock()
+        self._counters = {"calls": 0, "failures": 0, "rejected": 0, "hedged": 0, "hedge_wins": 0}
+
+    def allow(self):
+        """
+        Whether a call may go out now; counts it if so
+        """
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < CIRCUIT_RESET_SECONDS:
+                    self._counters["rejected"] += 1
+                    return False
+                self.state = HALF_OPEN
+                print(f"🔌 {self.provider} circuit half open, sending a probe")
+            if self.state == HALF_OPEN:
+                # A probe that never reported back (e.g. cancelled) doesn't block the next one forever
+                if self.probe_in_flight and time.monotonic() - self.probe_started < CIRCUIT_RESET_SECONDS:
+                    self._counters["rejected"] += 1
+                    return False
+                self.probe_in_flight = True
+                self.probe_started = time.monotonic()
+            self._counters["calls"] += 1
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.probe_in_flight = False
+            if self.state != CLOSED:
+                print(f"✅ {self.provider} circuit closed")
+            self.state = CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._counters["failures"] += 1
+            self.consecutive_failures += 1
+            self.probe_in_flight = False
+            if self.state == HALF_OPEN or self.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD:
+                if self.state != OPEN:
+                    print(f"⛔ {self.provider} circuit open for {CIRCUIT_RESET_SECONDS:.0f}s after {self.consecutive_failures} failures")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+
+    def record_abandoned(self):
+        """
+        The call ran out of request deadline: not the provider's fault, so it
+        doesn't count as a failure
+        """
+        with self._lock:
+            self.probe_in_flight = False
+
+    def record_latency(self, seconds, operation=None):
+        with self._lock:
+            window = self.latencies.get(operation)
+            if window is None:
+                window = self.latencies[operation] = deque(maxlen=LATENCY_WINDOW)
+            window.append(seconds)
+
+    def _samples(self, operation=_ALL):
+        with self._lock:
+            if operation is _ALL:
+                return [sample for window in self.latencies.values() for sample in window]
+            return list(self.latencies.get(operation, ()))
+
+    def percentile(self, percent, operation=_ALL):
+        """
+        Latency percentile of one operation, or of every call if none is given
+        """
+        samples = sorted(self._samples(operation))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+    def hedge_delay(self, operation=None):
+        """
+        Seconds to wait before sending a duplicate request, or None if this
+        call should not be hedged (too few samples of this operation, or the
+        provider's hedge budget is spent). Nothing is hedged unless the circuit
+        is closed: a half-open breaker lets exactly one probe through.
+        """
+        if not HEDGE_ENABLED:
+            return None
+        with self._lock:
+            if self.state != CLOSED:
+                return None
+            if len(self.latencies.get(operation, ())) < HEDGE_MIN_SAMPLES:
+                return None
+            if self._counters["hedged"] >= HEDGE_MAX_RATIO * self._counters["calls"]:
+                return None
+        return max(HEDGE_MIN_DELAY_SECONDS, self.percentile(HEDGE_PERCENTILE, operation))
+
+    def record(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def stats(self):
+        with self._lock:
+            operations = list(self.latencies)
+        stats = self._latency_stats(_ALL)
+        stats["operations"] = {str(operation): self._latency_stats(operation) for operation in operations}
+        with self._lock:
+            return {
+                "circuit": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                **stats,
+                **self._counters
+            }
+
+    def _latency_stats(self, operation):
+        p50 = self.percentile(50, operation)
+        p95 = self.percentile(HEDGE_PERCENTILE, operation)
+        return {
+            "latency_samples": len(self._samples(operation)),
+            "p50_ms": round(p50 * 1000) if p50 is not None else None,
+            f"p{HEDGE_PERCENTILE:g}_ms": round(p95 * 1000) if p95 is not None else None
+        }
+
+_upstreams = {}
+_upstreams_lock = threading.Lock()
+_hedge_executors = {}
+
+def get_upstream(provider):
+    upstream = _upstreams.get(provider)
+    if upstream is None:
+        with _upstreams_lock:
+            upstream = _upstreams.get(provider)
+            if upstream is None:
+                upstream = UpstreamHealth(provider)
+                _upstreams[provider] = upstream
+    return upstream
+
+def upstream_stats():
+    return {provider: upstream.stats() for provider, upstream in list(_upstreams.items())}
+
+def _get_hedge_executor(provider):
+    """
+    The provider's pool for attempts that may be hedged; separate from the
+    verification and lookup pools because hedged calls are made from inside
+    them, and one per provider so a stalled provider can't hold every thread
+    """
+    executor = _hedge_executors.get(provider)
+    if executor is None:
+        with _upstreams_lock:
+            executor = _hedge_executors.get(provider)
+            if executor is None:
+                executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix=f"hedge-{provider}")
+                _hedge_executors[provider] = executor
+    return executor
+
+_RAISE = object()
+
+def _timed(fn):
+    start = time.monotonic()
+    result = fn()
+    return result, time.monotonic() - start
+
+def hedged_call(provider, fn, failed=None, fallback=_RAISE, operation=None):
+    """
+    Call fn through the provider's circuit breaker. If it has not answered
+    within the observed p95 latency of this operation on the provider, start
+    a duplicate and return whichever successful answer arrives first (the
+    loser is left to finish in the background). Calls that won't be hedged
+    run on the caller's thread. failed(result) marks results that count as
+    failures for functions that return a sentinel instead of raising. While
+    the circuit is open, returns fallback if given, otherwise raises
+    CircuitOpenError. Raises DeadlineExceeded if the request deadline passes
+    while waiting.
+    """
+    upstream = get_upstream(provider)
+    if not upstream.allow():
+        if fallback is _RAISE:
+            raise CircuitOpenError(f"{provider} circuit is open")
+        return fallback
+
+    delay = upstream.hedge_delay(operation)
+    if delay is None:
+        return _call_inline(upstream, fn, failed, operation)
+
+    executor = _get_hedge_executor(provider)
+    timed = bind_deadline(_timed)
+    pending = {executor.submit(timed, fn): "primary"}
+    done, _ = wait(pending, timeout=delay)
+    if not done and not deadline_expired():
+        upstream.record("hedged")
+        print(f"🪞 {provider} request slower than {delay:.2f}s, sending a hedge")
+        pending[executor.submit(timed, fn)] = "hedge"
+
+    outcome = None
+    while pending:
+        done, _ = wait(pending, timeout=remaining_seconds(), return_when=FIRST_COMPLETED)
+        if not done:
+            upstream.record_abandoned()
+            raise DeadlineExceeded(f"Deadline exceeded waiting for {provider}")
+        for future in done:
+            attempt = pending.pop(future)
+            try:
+                result, elapsed = future.result()
+            except Exception as e:
+                outcome = ("error", e)
+                continue
+            if failed is not None and failed(result):
+                outcome = ("failed", result)
+                continue
+            upstream.record_latency(elapsed, operation)
+            upstream.record_success()
+            if attempt == "hedge":
+                upstream.record("hedge_wins")
+            return result
+
+    return _settle_failure(upstream, outcome)
+
+def _call_inline(upstream, fn, failed, operation):
+    """
+    Unhedged call on the caller's thread; the provider clients already fit
+    their timeouts to the request deadline
+    """
+    try:
+        result, elapsed = _timed(fn)
+    except Exception as e:
+        return _settle_failure(upstream, ("error", e))
+    if failed is not None and failed(result):
+        return _settle_failure(upstream, ("failed", result))
+    upstream.record_latency(elapsed, operation)
+    upstream.record_success()
+    return result
+
+def _settle_failure(upstream, outcome):
+    if deadline_expired() or (outcome[0] == "error" and isinstance(outcome[1], DeadlineExceeded)):
+        upstream.record_abandoned()
+    else:
+        upstream.record_failure()
+    kind, value = outcome
+    if kind == "error":
+        raise value
+    return value
+
+async def hedged_call_async(provider, coro_fn, failed=None, fallback=_RAISE, operation=None):
+    """
+    Async counterpart of hedged_call; the slower attempt is cancelled
+    """
+    upstream = get_upstream(provider)
+    if not upstream.allow():
+        if fallback is _RAISE:
+            raise CircuitOpenError(f"{provider} circuit is open")
+        return fallback
+
+    async def timed():
+        start = time.monotonic()
+        result = await coro_fn()
+        return result, time.monotonic() - start
+
+    delay = upstream.hedge_delay(operation)
+    pending = {asyncio.ensure_future(timed()): "primary"}
+    try:
+        if delay is not None:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if not done and not deadline_expired():
+                upstream.record("hedged")
+                print(f"🪞 {provider} request slower than {delay:.2f}s, sending a hedge")
+                pending[asyncio.ensure_future(timed())] = "hedge"
+
+        outcome = None
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                attempt = pending.pop(task)
+                try:
+                    result, elapsed = task.result()
+                except Exception as e:
+                    outcome = ("error", e)
+                    continue
+                if failed is not None and failed(result):
+                    outcome = ("failed", result)
+                    continue
+                upstream.record_latency(elapsed, operation)
+                upstream.record_success()
+                if attempt == "hedge":
+                    upstream.record("hedge_wins")
+                return result
+    finally:
+        for task in pending:
+            task.cancel()
+
+    return _settle_failure(upstream, outcome)
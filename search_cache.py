@@ -0,0 +1,31 @@
+import os
+import re
+from ttl_cache import TTLCache, cache_db_path
+
+SEARCH_CACHE_TTL = float(os.environ.get("SEARCH_CACHE_TTL", 6 * 60 * 60))
+SEARCH_CACHE_MAX_ENTRIES = int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", 2048))
+SEARCH_CACHE_DB = cache_db_path("SEARCH_CACHE_DB", "search.sqlite3")
+
+search_cache = TTLCache(
+    "serper_search",
+    ttl=SEARCH_CACHE_TTL,
+    max_entries=SEARCH_CACHE_MAX_ENTRIES,
+    db_path=SEARCH_CACHE_DB,
+    max_disk_entries=SEARCH_CACHE_MAX_ENTRIES * 10
+)
+
+def normalize_query(query):
+    return re.sub(r"\s+", " ", str(query)).strip().lower()
+
+def search_cache_key(query, num):
+    return f"{num}:{normalize_query(query)}"
+
+def _is_cacheable(data):
+    return bool(data) and len(data.get("organic", [])) > 0
+
+def cached_search(query, num, fetch):
+    """
+    Return cached Serper results for (query, num), calling fetch() at most once
+    for concurrent identical queries. Failed or empty searches are not cached.
+    """
+    return search_cache.get_or_compute(search_cache_key(query, num), fetch, should_cache=_is_cacheable)
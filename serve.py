@@ -0,0 +1,98 @@
+"""
+Production serving for server1, server2 and debate_server with gunicorn
+(pip install gunicorn):
+
+    python serve.py server1
+    python serve.py server2
+    python serve.py debate
+
+Each worker imports the server module itself (no preloading), so it builds
+its own OpenAI/ChatGroq clients and connection pools once, warms provider
+connections, and only then reports ready on /readyz. On SIGTERM a worker
+reports draining on /readyz for SERVE_DRAIN_SECONDS while still serving,
+then stops accepting and finishes in-flight requests and background jobs.
+"""
+import os
+import sys
+import signal
+import threading
+import importlib
+import health
+
+SERVERS = {
+    "server1": ("server1", 5001),
+    "server2": ("server2", 5002),
+    "debate": ("debate_server", 5003)
+}
+# server1's job API keeps jobs in the worker that accepted them, so it scales with threads
+DEFAULT_WORKERS = {"server1": 1, "server2": 2, "debate": 2}
+DEFAULT_THREADS = {"server1": 16, "server2": 8, "debate": 8}
+
+SERVE_DRAIN_SECONDS = float(os.environ.get("SERVE_DRAIN_SECONDS", 5))
+SERVE_GRACEFUL_TIMEOUT = float(os.environ.get("SERVE_GRACEFUL_TIMEOUT", 60))
+SERVE_TIMEOUT = float(os.environ.get("SERVE_TIMEOUT", 120))
+
+def server_settings(name):
+    """
+    Bind address, worker and thread counts for a server, tunable per server
+    with e.g. SERVER1_WORKERS, SERVER1_THREADS, SERVER1_PORT
+    """
+    prefix = name.upper()
+    _, default_port = SERVERS[name]
+    return {
+        "bind": f"0.0.0.0:{int(os.environ.get(f'{prefix}_PORT', default_port))}",
+        "workers": int(os.environ.get(f"{prefix}_WORKERS", DEFAULT_WORKERS[name])),
+        "threads": int(os.environ.get(f"{prefix}_THREADS", DEFAULT_THREADS[name]))
+    }
+
+def post_worker_init(worker):
+    health.warm_up_worker()
+    stop_worker = signal.getsignal(signal.SIGTERM)
+
+    def drain(signum, frame):
+        health.begin_draining()
+        threading.Timer(SERVE_DRAIN_SECONDS, stop_worker, args=(signum, frame)).start()
+
+    signal.signal(signal.SIGTERM, drain)
+
+def worker_exit(server, worker):
+    health.run_shutdown_hooks()
+
+def main(argv):
+    if len(argv) != 2 or argv[1] not in SERVERS:
+        print(f"Usage: python serve.py [{'|'.join(SERVERS)}]")
+        return 2
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        print("❌ Production serving needs gunicorn: pip install gunicorn")
+        return 1
+
+    name = argv[1]
+    module_name, _ = SERVERS[name]
+    settings = server_settings(name)
+
+    class ServerApplication(BaseApplication):
+        def load_config(self):
+            config = {
+                **settings,
+                "worker_class": "gthread",
+                "preload_app": False,
+                "timeout": SERVE_TIMEOUT,
+                "graceful_timeout": SERVE_DRAIN_SECONDS + SERVE_GRACEFUL_TIMEOUT,
+                "keepalive": 5,
+                "post_worker_init": post_worker_init,
+                "worker_exit": worker_exit
+            }
+            for key, value in config.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return importlib.import_module(module_name).app
+
+    print(f"🚀 Serving {module_name} on {settings['bind']} with {settings['workers']} workers x {settings['threads']} threads")
+    ServerApplication().run()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -1,21 +1,36 @@
 from flask import Flask, request, jsonify
-import subprocess
 import os
 import json
 import re
-import requests
 from flask_cors import CORS
 from openai import OpenAI
-from langchain_groq import ChatGroq
 from langchain_core.messages import SystemMessage, HumanMessage
 import traceback
 import time
+import queue
+import threading
 from urllib.parse import quote_plus
+from claim_executor import iter_verified_claims, pending_result, verify_claims_concurrently
+from claim_verification import VERDICT_VERSION, attach_source_fields, generate_trust_score, get_recommendation, invoke_llm, verify_claim
+from factcheck_fastpath import factcheck_stats
+from sse import sse_response
+from job_queue import JobManager
+from search_cache import search_cache
+from youtube_media import downloader
+from audio_prep import prepare_audio
+from chunked_transcription import iter_chunk_transcripts, needs_chunking, transcribe_chunked
+from streaming_pipeline import PIPELINED_ANALYSIS, run_pipelined_analysis
+from transcript_cache import get_cached_transcript, store_transcript
+from verdict_store import invalidate_verdict, verdict_store_stats
+from rate_limiter import rate_limiter_stats
+from resilience import upstream_stats
+from deadline import JOB_DEADLINE_SECONDS, VIDEO_DEADLINE_SECONDS, bind_deadline, deadline_events, deadline_expired, deadline_scope, deadline_seconds_from, stage_timeout
+from provider_clients import warm_up_connections
+from health import on_shutdown, register_health_routes, warm_up_worker
 
 OPENAI_API_KEY = ""
-GROQ_API_KEY = ""
-GOOGLE_FACT_CHECK_API_KEY = ""
-SERPER_API_KEY = ""
+WHISPER_MODEL = "whisper-1"
+WHISPER_TIMEOUT = float(os.environ.get("WHISPER_TIMEOUT", 300))
 
 EXTRACT_CLAIMS_PROMPT = """
 Analyze the provided transcript and extract 4-6 specific factual claims that can be verified.
@@ -42,182 +57,97 @@ For example, instead of extracting the claim "Its adapted fins look like tiny li
 Do not attempt to verify the claims yourself. Just identify and contextualize them for verification.
 """
 
-SERPER_VERIFICATION_PROMPT = """
-You are a world-renowned fact-checker with a reputation for accuracy, clarity, and attention to detail.
-
-I need you to fact-check the following claim using search results I've provided.
-
-Claim: {{claim}}
-
-Search Results: {{search_results}}
-
-Based on these search results and your analysis, determine if the claim is TRUE, FALSE, or UNVERIFIED.
-
-Your response must be in this exact JSON format:
-{
-  "claim": "{{claim}}",
-  "result": "TRUE/FALSE/UNVERIFIED",
-  "summary": "A concise one-sentence summary of your verdict. Vary your phrasing; don't always start with 'The evidence confirms/refutes'.",
-  "detailed_analysis": "A detailed, evidence-based explanation of your reasoning (3-5 sentences). Provide specific details from the sources that support your conclusion.",
-  "sources": [
-    {
-      "name": "Website or Publication Name",
-      "url": "Source URL"
-    },
-    {
-      "name": "Website or Publication Name",
-      "url": "Source URL"
-    }
-  ]
-}
-
-Guidelines:
-- Only mark a claim as TRUE if credible sources clearly support it
-- Only mark a claim as FALSE if credible sources clearly refute it
-- Mark as UNVERIFIED if the sources are contradictory, unclear, or insufficient
-- Focus on the most authoritative sources (educational institutions, scientific publications, etc.)
-- Extract the most relevant information from each source
-- Vary your phrasing in the summary for natural reading
-- In your detailed_analysis, be thorough yet concise - explain your reasoning with evidence
-"""
-
 app = Flask(__name__)
 CORS(app)
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+def warm_up():
+    warm_up_connections(["serper", "google_factcheck", "groq"])
 
-llm = ChatGroq(
-    api_key=GROQ_API_KEY,
-    model_name="llama-3.1-8b-instant"
-)
+register_health_routes(app, warm_up)
 
-def fix_broken_json(json_str):
-    try:
-        json.loads(json_str)
-        return json_str
-    except json.JSONDecodeError:
-        fixed_str = re.sub(r'(".*?":\s*".*?")\s*\n\s*(".*?")',
-                           r'\1,\n  \2', json_str)
-        
-        fixed_str = re.sub(r'(".*?":\s*[^",\s{[].*?[^,\s{[])(\s*\n\s*)(".*?")',
-                           r'\1,\2\3', fixed_str)
-        
-        try:
-            json.loads(fixed_str)
-            return fixed_str
-        except json.JSONDecodeError:
-            try:
-                obj_start = json_str.find('{')
-                obj_end = json_str.rfind('}')
-                if obj_start == -1 or obj_end == -1:
-                    return json_str
-                
-                content = json_str[obj_start+1:obj_end].strip()
-                
-                properties = []
-                current_prop = ""
-                in_quotes = False
-                quote_char = None
-                for i, char in enumerate(content):
-                    current_prop += char
-                    
-                    if char in ['"', "'"]:
-                        if not in_quotes:
-                            in_quotes = True
-                            quote_char = char
-                        elif char == quote_char and content[i-1] != '\\':
-                            in_quotes = False
-                            quote_char = None
-                    
-                    if not in_quotes and char == '"' and i > 0 and content[i-1:i+1] != '\\"':
-                        lookahead = content[i:i+30]
-                        if re.search(r'^"[^"]+"\s*:', lookahead):
-                            if current_prop.strip():
-                                properties.append(current_prop.strip())
-                            current_prop = char
-                
-                if current_prop.strip():
-                    properties.append(current_prop.strip())
-                
-                valid_properties = []
-                for prop in properties:
-                    if ":" in prop:
-                        valid_properties.append(prop.strip().rstrip(','))
-                
-                fixed_str = "{\n  " + ",\n  ".join(valid_properties) + "\n}"
-                
-                json.loads(fixed_str)
-                return fixed_str
-            except:
-                return json_str
-    except Exception:
-        return json_str
+client = OpenAI(api_key=OPENAI_API_KEY)
+
+jobs = JobManager()
+on_shutdown(jobs.shutdown)
 
 def extract_video_id(url):
     pattern = r'(?:https?:\/\/)?(?:www\.)?(?:youtube\.com\/(?:watch\?v=|shorts\/|embed\/)|youtu\.be\/)([a-zA-Z0-9_-]{11})'
     match = re.search(pattern, url)
     return match.group(1) if match else None
 
-def get_video_info(video_id):
+def download_audio(video_id, output_file="audio.ogg", on_info=None):
+    """
+    Download the audio, compact it into output_file and return the video info
+    from the same extraction, or None on failure. on_info, if given, gets the
+    video info as soon as the page is resolved, before the download starts.
+    """
+    downloaded_file = None
     try:
-        command = [
-            "yt-dlp", "--skip-download", "--print", "title,upload_date,duration,view_count,like_count",
-            f"https://www.youtube.com/watch?v={video_id}"
-        ]
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
-        info = result.stdout.strip().split('\n')
-        
-        video_info = {
-            "title": info[0] if len(info) > 0 else "Unknown Title",
-            "upload_date": info[1] if len(info) > 1 else "Unknown Date",
-            "duration": info[2] if len(info) > 2 else "Unknown Duration",
-            "view_count": info[3] if len(info) > 3 else "Unknown Views",
-            "like_count": info[4] if len(info) > 4 else "Unknown Likes"
-        }
-        
+        print(f"🎵 Downloading audio for video ID: {video_id}")
+        video_info, downloaded_file = downloader.fetch_audio(video_id, f"{os.path.splitext(output_file)[0]}.source", on_info)
         print(f"📊 Video info retrieved: {json.dumps(video_info, indent=2)}")
+        prepare_audio(downloaded_file, output_file)
+        print(f"✅ Audio downloaded: {output_file}")
         return video_info
     except Exception as e:
-        print(f"❌ Error getting video info: {e}")
-        traceback.print_exc()
-        return {
-            "title": "YouTube Video",
-            "upload_date": "Unknown Date",
-            "duration": "Unknown Duration",
-            "view_count": "Unknown Views",
-            "like_count": "Unknown Likes"
-        }
-
-def download_audio(video_id, output_file="audio.mp3"):
-    video_url = f"https://www.youtube.com/watch?v={video_id}"
-    
-    command = [
-        "yt-dlp", "-x", "--audio-format", "mp3",
-        "--ffmpeg-location", "/opt/homebrew/bin/ffmpeg",
-        "-o", output_file,
-        video_url
-    ]
-    
-    try:
-        print(f"🎵 Downloading audio for video ID: {video_id}")
-        subprocess.run(command, check=True)
-        print(f"✅ Audio downloaded: {output_file}")
-        return True
-    except subprocess.CalledProcessError as e:
         print(f"❌ Failed to download audio: {e}")
         traceback.print_exc()
-        return False
+        return None
+    finally:
+        if downloaded_file and os.path.exists(downloaded_file):
+            os.remove(downloaded_file)
+
+def download_audio_events(video_id, audio_file):
+    """
+    Run download_audio on its own thread, yielding video_info as soon as the
+    page is resolved and then downloaded with the video info (None on failure)
+    once audio_file is ready. If the caller stops early, waits for the
+    download to end and removes audio_file.
+    """
+    updates = queue.Queue()
+
+    def download():
+        updates.put(("downloaded", download_audio(video_id, audio_file, lambda info: updates.put(("video_info", info)))))
+
+    worker = threading.Thread(target=bind_deadline(download), name=f"download-{video_id}", daemon=True)
+    worker.start()
+    finished = False
+    try:
+        while not finished:
+            event, payload = updates.get()
+            finished = event == "downloaded"
+            yield event, payload
+    finally:
+        if not finished:
+            worker.join()
+            remove_audio_file(audio_file)
+
+def remove_audio_file(audio_file):
+    try:
+        if os.path.exists(audio_file):
+            os.remove(audio_file)
+            print(f"🗑 Audio file {audio_file} deleted")
+    except Exception as e:
+        print(f"⚠️ Could not delete audio file: {e}")
+
+def transcribe_file_with_whisper(audio_file):
+    with open(audio_file, "rb") as file:
+        transcription = client.audio.transcriptions.create(
+            model=WHISPER_MODEL,
+            file=file,
+            timeout=stage_timeout(WHISPER_TIMEOUT, "transcription")
+        )
+    return transcription.text
 
 def transcribe_audio(audio_file):
     try:
-        print("🛠 Sending audio to OpenAI Whisper for transcription...")
-        with open(audio_file, "rb") as file:
-            transcription = client.audio.transcriptions.create(
-                model="whisper-1",
-                file=file
-            )
+        if needs_chunking(audio_file):
+            print("🛠 Sending audio to OpenAI Whisper in parallel chunks...")
+            transcript = transcribe_chunked(audio_file, transcribe_file_with_whisper)
+        else:
+            print("🛠 Sending audio to OpenAI Whisper for transcription...")
+            transcript = transcribe_file_with_whisper(audio_file)
         
-        transcript = transcription.text
         print(f"✅ Transcription complete! First 200 chars: {transcript[:200]}...")
         return transcript
     except Exception as e:
@@ -238,7 +168,7 @@ def extract_claims(transcript, is_video=True):
         ]
         
         print("🤖 Sending to Llama 3.1 for claim extraction...")
-        response = llm.invoke(messages)
+        response = invoke_llm(messages, "extract")
         content = response.content
         
         print(f"🤖 Llama 3.1 response: {content}")
@@ -266,310 +196,221 @@ def extract_claims(transcript, is_video=True):
         traceback.print_exc()
         return []
 
-def check_claim_with_google_factcheck(claim):
-    try:
-        print(f"🔍 Fact-checking with Google API: {claim}")
-        url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
-        params = {
-            "key": GOOGLE_FACT_CHECK_API_KEY,
-            "query": claim,
-            "languageCode": "en"  
-        }
-        
-        print(f"📡 Sending request to Google Fact Check API: {url}")
-        
-        response = requests.get(url, params=params)
-        
-        print(f"📡 API response status code: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            if "claims" in data and len(data["claims"]) > 0:
-                print(f"✅ Found {len(data['claims'])} fact checks")
-                return data
-            else:
-                print("❌ No fact checks found in API response")
-                return {"claims": []}
-        else:
-            print(f"❌ API request failed: {response.status_code}")
-            return {"claims": []}
+def build_video_response(verified_claims, video_info, transcript, truncated=False):
+    """
+    The /transcribe response. truncated marks a transcript cut short by the
+    request deadline; like PENDING claims it makes the summary partial.
+    """
+    trust_score = generate_trust_score(verified_claims)
     
-    except Exception as e:
-        print(f"❌ Error in Google Fact Check API: {e}")
-        traceback.print_exc()
-        return {"claims": []}
-
-def search_with_serper(query):
-    try:
-        print(f"🔍 Searching with Serper API: {query}")
-        url = "https://google.serper.dev/search"
-        headers = {
-            'X-API-KEY': SERPER_API_KEY,
-            'Content-Type': 'application/json'
-        }
-        payload = {
-            'q': query,
-            'num': 8  
+    return {
+        "verified_claims": [attach_source_fields(claim) for claim in verified_claims],
+        "video_info": {
+            "title": video_info.get("title", "YouTube Video"),
+            "trust_score": trust_score,
+            "upload_date": video_info.get("upload_date", "Unknown"),
+            "duration": video_info.get("duration", "Unknown"),
+            "view_count": video_info.get("view_count", "Unknown"),
+            "like_count": video_info.get("like_count", "Unknown")
+        },
+        "analysis_summary": {
+            "total_claims": len(verified_claims),
+            "verified_true": sum(1 for claim in verified_claims if claim.get("result") == "TRUE"),
+            "verified_false": sum(1 for claim in verified_claims if claim.get("result") == "FALSE"),
+            "unverified": sum(1 for claim in verified_claims if claim.get("result") == "UNVERIFIED"),
+            "pending": sum(1 for claim in verified_claims if claim.get("result") == "PENDING"),
+            "partial": truncated or any(claim.get("result") == "PENDING" for claim in verified_claims),
+            "transcript_truncated": truncated,
+            "recommendation": get_recommendation(trust_score),
+            "transcript": transcript[:1000] + "..." if len(transcript) > 1000 else transcript
         }
-        
-        response = requests.post(url, headers=headers, json=payload)
-        
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Serper API returned {len(data.get('organic', []))} results")
-            return data
-        else:
-            print(f"❌ Serper API request failed: {response.status_code}")
-            return None
-    
-    except Exception as e:
-        print(f"❌ Error in Serper API: {e}")
-        traceback.print_exc()
-        return None
+    }
 
-def verify_with_serper_and_llama(claim_data):
-    try:
-        if isinstance(claim_data, dict):
-            claim = claim_data.get("claim", "")
-            context = claim_data.get("context", "")
-            search_query = claim_data.get("search_query", "")
-        else:
-            claim = claim_data
-            context = ""
-            search_query = ""
-        
-        print(f"🔍 Verifying claim with Serper + Llama: {claim}")
-        if context:
-            print(f"📝 Context: {context}")
-        
-        if not search_query:
-            search_query = f"fact check {claim}"
-        
-        print(f"🔍 Using search query: {search_query}")
-        
-        search_results = search_with_serper(search_query)
-        
-        if not search_results or "organic" not in search_results or len(search_results["organic"]) == 0:
-            print("❌ No search results found")
-            return {
-                "claim": claim,
-                "result": "UNVERIFIED",
-                "summary": "Insufficient evidence available to verify this claim.",
-                "detailed_analysis": "After extensive searching, no reliable sources were found to verify this specific claim. Without credible evidence, it's not possible to determine the accuracy of this statement.",
-                "sources": []
-            }
-        
-        formatted_results = json.dumps(search_results["organic"][:5], indent=2)
-        
-        verification_prompt = SERPER_VERIFICATION_PROMPT.replace("{{claim}}", claim).replace("{{search_results}}", formatted_results)
-        
-        if context:
-            verification_prompt += f"\n\nAdditional Context: {context}"
-        
-        print(f"🤖 Sending to Llama 3.1 for search results analysis...")
-        
-        messages = [
-            SystemMessage(content=verification_prompt)
-        ]
-        
-        response = llm.invoke(messages)
-        content = response.content
-        
-        print(f"🤖 Llama 3.1 analysis response: {content[:200]}...")
+def stage_error(message):
+    """
+    Error event for a failed stage; 504 when it failed because the request deadline passed
+    """
+    if deadline_expired():
+        return "error", {"error": f"{message}: request deadline exceeded", "status": 504}
+    return "error", {"error": message, "status": 500}
+
+def pipelined_video_events(video_id, video_info, audio_file):
+    """
+    Long-audio variant of the transcript -> claims -> verification stages where
+    each Whisper chunk is handed to claim extraction as soon as it is transcribed
+    """
+    segments = []
+    claims = []
+    verified_claims = []
+    events = run_pipelined_analysis(
+        iter_chunk_transcripts(audio_file, transcribe_file_with_whisper),
+        extract_claims,
+        verify_claim
+    )
+    cut_off = False
+    for event, payload in events:
+        if event == "error":
+            yield event, payload
+            return
+        if event == "deadline":
+            cut_off = True
+            break
+        if event == "transcript_truncated":
+            cut_off = True
+        elif event == "transcript_segment":
+            segments.append(payload["text"])
+        elif event == "claim_extracted":
+            claims.append(payload["claim"])
+            verified_claims.append(None)
+        elif event == "claim":
+            verified_claims[payload["index"]] = attach_source_fields(payload["claim"])
+        yield event, payload
+    
+    transcript = " ".join(segment for segment in segments if segment)
+    if not transcript:
+        yield stage_error("Failed to transcribe video")
+        return
+    
+    if not cut_off:
+        store_transcript(video_id, transcript, video_info, WHISPER_MODEL)
+    yield "transcript", {"transcript": transcript}
+    
+    if not claims:
+        yield stage_error("Failed to extract claims from transcript")
+        return
+    
+    yield "claims", {"claims": claims}
+    
+    for index, verification in enumerate(verified_claims):
+        if verification is None:
+            verified_claims[index] = attach_source_fields(pending_result(claims[index]))
+            yield "claim", {"index": index, "claim": verified_claims[index]}
+    
+    yield "summary", build_video_response(verified_claims, video_info, transcript, truncated=cut_off)
+
+def analyze_video_events(video_id, pipelined=PIPELINED_ANALYSIS, deadline_seconds=VIDEO_DEADLINE_SECONDS):
+    """
+    Run the video analysis pipeline, yielding (event, data) as each stage finishes:
+    video_info, transcript, claims, one claim event per verified claim (in completion
+    order) and finally summary with the full /transcribe response, or error.
+    In pipelined mode long audio also yields transcript_segment and claim_extracted
+    events while transcription is still running.
+    Every stage shares a deadline of deadline_seconds (None for no deadline);
+    claims not verified by then come back as PENDING and the summary is marked partial.
+    """
+    yield from deadline_events(_analyze_video_events, deadline_seconds, video_id, pipelined)
+
+def _analyze_video_events(video_id, pipelined):
+    cached = get_cached_transcript(video_id, WHISPER_MODEL)
+    if cached:
+        video_info = cached["video_info"]
+        transcript = cached["transcript"]
+        yield "video_info", video_info
+    else:
+        audio_file = f"{video_id}.ogg"
+        info_sent = False
+        for event, payload in download_audio_events(video_id, audio_file):
+            if event == "video_info":
+                info_sent = True
+                yield "video_info", payload
+            else:
+                video_info = payload
+        if not video_info:
+            yield stage_error("Failed to download audio from video")
+            return
         
         try:
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
+            if not info_sent:
+                yield "video_info", video_info
             
-            if start_idx >= 0 and end_idx > start_idx:
-                json_str = content[start_idx:end_idx]
-                
-                fixed_json_str = fix_broken_json(json_str)
-                
-                try:
-                    result = json.loads(fixed_json_str)
-                    print(f"✅ Serper verification result: {result.get('result', 'UNVERIFIED')}")
-                    
-                    if 'claim' not in result:
-                        result['claim'] = claim
-                    
-                    if context:
-                        result['context'] = context
-                    
-                    formatted_sources = []
-                    if 'sources' in result and result['sources']:
-                        for source in result['sources']:
-                            if isinstance(source, dict) and 'name' in source and 'url' in source:
-                                formatted_sources.append({
-                                    'name': source['name'],
-                                    'url': source['url']
-                                })
-                    
-                    if formatted_sources:
-                        result['sources'] = formatted_sources
-                    else:
-                        result['sources'] = []
-                    
-                    return result
-                except json.JSONDecodeError as e:
-                    print(f"❌ Error decoding fixed JSON: {e}")
-                    print(f"Original JSON string: {json_str}")
-                    print(f"Fixed JSON string: {fixed_json_str}")
-                    raise ValueError(f"JSON decoding error after fix attempt: {e}")
-            else:
-                print("❌ JSON not found in response")
-                raise ValueError("JSON not found in response")
-        
-        except (json.JSONDecodeError, ValueError) as e:
-            print(f"❌ Error processing verification response: {e}")
-            print(f"Full response: {content}")
+            if pipelined and needs_chunking(audio_file):
+                yield from pipelined_video_events(video_id, video_info, audio_file)
+                return
             
-            return {
-                "claim": claim,
-                "result": "UNVERIFIED",
-                "summary": "Technical issues prevented proper verification.",
-                "detailed_analysis": "While search results were found, I was unable to process them correctly to determine the claim's accuracy. The information available was either insufficient or could not be properly analyzed.",
-                "sources": []
-            }
-    
-    except Exception as e:
-        print(f"❌ Error in Serper verification: {e}")
-        traceback.print_exc()
+            transcript = transcribe_audio(audio_file)
+        finally:
+            remove_audio_file(audio_file)
         
-        return {
-            "claim": claim,
-            "result": "UNVERIFIED",
-            "summary": "Technical difficulties interrupted the verification process.",
-            "detailed_analysis": f"An error occurred during the analysis of search results: {str(e)}. Without complete verification, the claim's accuracy cannot be determined.",
-            "sources": []
-        }
-
-def verify_claim(claim_obj):
-    if isinstance(claim_obj, dict):
-        claim_text = claim_obj.get("claim", "")
-        check_claim_with_google_factcheck(claim_text)
-        
-        verification = verify_with_serper_and_llama(claim_obj)
-        
-        verification["claim"] = claim_text
-        
-        if "context" in claim_obj and claim_obj["context"]:
-            verification["original_context"] = claim_obj["context"]
+        if not transcript:
+            yield stage_error("Failed to transcribe video")
+            return
         
-        return verification
-    else:
-        check_claim_with_google_factcheck(claim_obj)
-        return verify_with_serper_and_llama({"claim": claim_obj})
-
-def generate_trust_score(claims):
+        store_transcript(video_id, transcript, video_info, WHISPER_MODEL)
+    
+    yield "transcript", {"transcript": transcript}
+    
+    claims = extract_claims(transcript)
+    
     if not claims:
-        return 5.0
+        yield stage_error("Failed to extract claims from transcript")
+        return
     
-    weights = {"TRUE": 10.0, "FALSE": 0.0, "UNVERIFIED": 5.0}
-    total_weight = sum(weights.get(claim.get("result", "UNVERIFIED"), 5.0) for claim in claims)
+    yield "claims", {"claims": claims}
     
-    score = round(total_weight / len(claims), 1)
-    print(f"📊 Generated trust score: {score}")
-    return score
-
-def get_recommendation(trust_score):
-    if trust_score >= 8.0:
-        return "This content appears highly reliable and factually accurate."
-    elif trust_score >= 6.0:
-        return "This content contains a mix of accurate and unverified information. Exercise some caution."
-    elif trust_score >= 4.0:
-        return "This content contains significant unverified information. Verify important claims with additional sources."
-    else:
-        return "This content contains multiple false or misleading claims. Approach with significant skepticism."
+    verified_claims = [None] * len(claims)
+    for index, verification in iter_verified_claims(claims, verify_claim):
+        verified_claims[index] = attach_source_fields(verification)
+        yield "claim", {"index": index, "claim": verification}
+    
+    yield "summary", build_video_response(verified_claims, video_info, transcript)
 
-@app.route("/transcribe", methods=["POST"])
-def transcribe():
-    data = request.json
+def video_id_from_request(default_deadline=VIDEO_DEADLINE_SECONDS):
+    data = request.json or {}
     video_url = data.get("video_url")
+    pipelined = bool(data.get("pipelined", PIPELINED_ANALYSIS))
+    deadline_seconds = deadline_seconds_from(data, request.headers, default_deadline)
 
     if not video_url:
-        return jsonify({"error": "No video URL provided"}), 400
+        return None, None, None, (jsonify({"error": "No video URL provided"}), 400)
 
     print(f"🔗 Received request to analyze video: {video_url}")
     
     video_id = extract_video_id(video_url)
     if not video_id:
-        return jsonify({"error": "Invalid YouTube URL"}), 400
-    
-    video_info = get_video_info(video_id)
-    
-    audio_file = f"{video_id}.mp3"
-    if not download_audio(video_id, audio_file):
-        return jsonify({"error": "Failed to download audio from video"}), 500
-    
-    transcript = transcribe_audio(audio_file)
-    
-    try:
-        os.remove(audio_file)
-        print(f"🗑 Audio file {audio_file} deleted")
-    except Exception as e:
-        print(f"⚠️ Could not delete audio file: {e}")
+        return None, None, None, (jsonify({"error": "Invalid YouTube URL"}), 400)
     
-    if not transcript:
-        return jsonify({"error": "Failed to transcribe video"}), 500
-    
-    claims = extract_claims(transcript)
-    
-    if not claims:
-        return jsonify({"error": "Failed to extract claims from transcript"}), 500
-    
-    verified_claims = []
-    for claim_obj in claims:
-        print(f"\n==== Verifying claim: {claim_obj.get('claim', '')} ====")
-        if "context" in claim_obj:
-            print(f"📝 Context: {claim_obj.get('context', '')}")
-        if "search_query" in claim_obj:
-            print(f"🔍 Suggested search query: {claim_obj.get('search_query', '')}")
-            
-        verification = verify_claim(claim_obj)
-        verified_claims.append(verification)
-        print(f"==== Verification complete: {verification.get('result', 'UNVERIFIED')} ====\n")
+    return video_id, pipelined, deadline_seconds, None
+
+@app.route("/transcribe", methods=["POST"])
+def transcribe():
+    video_id, pipelined, deadline_seconds, error = video_id_from_request()
+    if error:
+        return error
     
-    trust_score = generate_trust_score(verified_claims)
+    for event, payload in analyze_video_events(video_id, pipelined, deadline_seconds):
+        if event == "error":
+            return jsonify({"error": payload["error"]}), payload["status"]
+        if event == "summary":
+            print(f"✅ Analysis complete, sending response")
+            return jsonify(payload)
+
+@app.route("/transcribe/stream", methods=["POST"])
+def transcribe_stream():
+    video_id, pipelined, deadline_seconds, error = video_id_from_request()
+    if error:
+        return error
     
-    response = {
-        "verified_claims": verified_claims,
-        "video_info": {
-            "title": video_info.get("title", "YouTube Video"),
-            "trust_score": trust_score,
-            "upload_date": video_info.get("upload_date", "Unknown"),
-            "duration": video_info.get("duration", "Unknown"),
-            "view_count": video_info.get("view_count", "Unknown"),
-            "like_count": video_info.get("like_count", "Unknown")
-        },
-        "analysis_summary": {
-            "total_claims": len(verified_claims),
-            "verified_true": sum(1 for claim in verified_claims if claim.get("result") == "TRUE"),
-            "verified_false": sum(1 for claim in verified_claims if claim.get("result") == "FALSE"),
-            "unverified": sum(1 for claim in verified_claims if claim.get("result") == "UNVERIFIED"),
-            "recommendation": get_recommendation(trust_score),
-            "transcript": transcript[:1000] + "..." if len(transcript) > 1000 else transcript
-        }
-    }
-    
-    for claim in response["verified_claims"]:
-        source_links = []
-        source_names = []
-        
-        if "sources" in claim and claim["sources"]:
-            for source in claim["sources"]:
-                if isinstance(source, dict):
-                    if "name" in source and source["name"]:
-                        source_names.append(source["name"])
-                    if "url" in source and source["url"]:
-                        source_links.append(source["url"])
-        
-        claim["source_names"] = source_names
-        claim["source_links"] = source_links
+    return sse_response(analyze_video_events(video_id, pipelined, deadline_seconds))
+
+@app.route("/jobs/transcribe", methods=["POST"])
+def submit_transcribe_job():
+    video_id, pipelined, deadline_seconds, error = video_id_from_request(JOB_DEADLINE_SECONDS)
+    if error:
+        return error
     
-    print(f"✅ Analysis complete, sending response")
-    return jsonify(response)
+    job_id = jobs.submit("transcribe", analyze_video_events, video_id, pipelined, deadline_seconds)
+    return jsonify({
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}"
+    }), 202
+
+@app.route("/jobs/<job_id>", methods=["GET"])
+def get_job(job_id):
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
 
 @app.route("/api/check", methods=["POST"])
 def check_facts():
@@ -583,7 +424,11 @@ def check_facts():
     text = data['text']
     print(f"🔍 Received text to analyze: {text[:50]}...")
     
-    claims = extract_claims(text, is_video=False)
+    with deadline_scope(deadline_seconds_from(data, request.headers)):
+        claims = extract_claims(text, is_video=False)
+        if not claims and deadline_expired():
+            return jsonify({"error": "Failed to extract claims: request deadline exceeded"}), 504
+        verifications = verify_claims_concurrently(claims, verify_claim) if claims else []
     
     if not claims:
         return jsonify([{
@@ -594,21 +439,15 @@ def check_facts():
         }])
     
     verified_claims = []
-    for claim_obj in claims:
+    for claim_obj, verification in zip(claims, verifications):
         claim_text = claim_obj.get("claim", "")
-        print(f"\n==== Verifying claim: {claim_text} ====")
-        if "context" in claim_obj:
-            print(f"📝 Context: {claim_obj.get('context', '')}")
-        if "search_query" in claim_obj:
-            print(f"🔍 Suggested search query: {claim_obj.get('search_query', '')}")
-            
-        verification = verify_claim(claim_obj)
         
         sherlock_verification = {
             "claim": claim_text,
             "result": verification.get("result", "UNVERIFIED"),
             "explanation": verification.get("summary", ""),
             "detailed_analysis": verification.get("detailed_analysis", ""),
+            "verification_source": verification.get("verification_source", "serper_llm"),
             "sources": []
         }
         
@@ -621,7 +460,6 @@ def check_facts():
                     })
         
         verified_claims.append(sherlock_verification)
-        print(f"==== Verification complete: {sherlock_verification.get('result', 'UNVERIFIED')} ====\n")
     
     print(f"✅ Analysis complete, sending response")
     return jsonify(verified_claims)
@@ -671,13 +509,20 @@ def transcribe_audio_file_endpoint():
         
         print(f"🎵 Transcribing audio file: {file_path}")
         
-        transcript = transcribe_audio(file_path)
-        
+        audio_files = [file_path]
         try:
-            os.remove(file_path)
-            print(f"🗑 Audio file {file_path} deleted")
+            audio_files.append(prepare_audio(file_path))
         except Exception as e:
-            print(f"⚠️ Could not delete audio file: {e}")
+            print(f"⚠️ Could not prepare audio, sending original file: {e}")
+        
+        transcript = transcribe_audio(audio_files[-1])
+        
+        for audio_file in audio_files:
+            try:
+                os.remove(audio_file)
+                print(f"🗑 Audio file {audio_file} deleted")
+            except Exception as e:
+                print(f"⚠️ Could not delete audio file: {e}")
         
         if not transcript:
             return jsonify({"error": "Failed to transcribe audio", "success": False}), 500
@@ -691,9 +536,34 @@ def transcribe_audio_file_endpoint():
         print(f"❌ Error transcribing audio: {e}")
         traceback.print_exc()
         return jsonify({"error": str(e), "success": False}), 500
+
+@app.route("/stats", methods=["GET"])
+def stats():
+    return jsonify({
+        "google_factcheck": factcheck_stats(),
+        "verdict_store": verdict_store_stats(),
+        "search_cache": search_cache.stats(),
+        "rate_limits": rate_limiter_stats(),
+        "upstreams": upstream_stats()
+    })
+
+@app.route("/verdicts/invalidate", methods=["POST"])
+def invalidate_verdict_endpoint():
+    data = request.json
     
+    if not data or 'claim' not in data:
+        return jsonify({
+            "error": "Missing 'claim' field in request"
+        }), 400
+    
+    invalidate_verdict(data['claim'], VERDICT_VERSION)
+    return jsonify({"success": True, "claim": data['claim']})
+
 if __name__ == "__main__":
     print("🚀 Starting Context-Aware Fact-Checking Server - http://localhost:5001/")
-    print("YouTube Analysis: /transcribe")
+    print("YouTube Analysis: /transcribe (streaming: /transcribe/stream)")
+    print("Background Jobs: POST /jobs/transcribe, GET /jobs/<job_id>")
     print("Text Analysis: /api/check")
+    print("Production serving: python serve.py server1")
+    warm_up_worker()
     app.run(host="0.0.0.0", port=5001, debug=True)
\ No newline at end of file
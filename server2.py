@@ -1,18 +1,28 @@
 from flask import Flask, request, jsonify
 import json
-import re
-import requests
 from flask_cors import CORS
 from openai import OpenAI
-from langchain_groq import ChatGroq
 from langchain_core.messages import SystemMessage, HumanMessage
 import traceback
+import hashlib
 import time
-OPENAI_API_KEY = ""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from claim_executor import iter_verified_claims, pending_result, verify_claims_concurrently
+from claim_verification import VERDICT_VERSION, attach_source_fields, generate_trust_score, get_recommendation, invoke_llm
+from claim_verification import verify_claim as verify_claim_shared
+from factcheck_fastpath import factcheck_stats
+from sse import sse_response
+from search_cache import search_cache
+from ttl_cache import TTLCache
+from verdict_store import VERDICT_STORE_DB, VERDICT_STORE_MAX_DISK_ENTRIES, VERDICT_STORE_TTL, canonicalize_claim, get_verdict, invalidate_verdict, verdict_store_stats
+from rate_limiter import rate_limiter_stats
+from resilience import upstream_stats
+from deadline import REQUEST_DEADLINE_SECONDS, DeadlineExceeded, deadline_events, deadline_expired, deadline_scope, deadline_seconds_from
+from provider_clients import warm_up_connections
+from health import on_shutdown, register_health_routes, warm_up_worker
 
-GROQ_API_KEY = ""
-GOOGLE_FACT_CHECK_API_KEY = ""
-SERPER_API_KEY = ""
+OPENAI_API_KEY = ""
 
 EXTRACT_CLAIMS_PROMPT = """
 Analyze the provided text and extract 4-6 specific factual claims that can be verified.
@@ -36,44 +46,8 @@ Return ONLY a JSON array in this exact format:
 Do not attempt to verify the claims yourself. Just identify and contextualize them for verification.
 """
 
-SERPER_VERIFICATION_PROMPT = """
-You are a world-renowned fact-checker with a reputation for accuracy, clarity, and attention to detail.
-
-I need you to fact-check the following claim using search results I've provided.
-
-Claim: {{claim}}
-
-Search Results: {{search_results}}
-
-Based on these search results and your analysis, determine if the claim is TRUE, FALSE, or UNVERIFIED.
-
-Your response must be in this exact JSON format:
-{
-  "claim": "{{claim}}",
-  "result": "TRUE/FALSE/UNVERIFIED",
-  "summary": "A concise one-sentence summary of your verdict. Vary your phrasing; don't always start with 'The evidence confirms/refutes'.",
-  "detailed_analysis": "A detailed, evidence-based explanation of your reasoning (3-5 sentences). Provide specific details from the sources that support your conclusion.",
-  "sources": [
-    {
-      "name": "Website or Publication Name",
-      "url": "Source URL"
-    },
-    {
-      "name": "Website or Publication Name",
-      "url": "Source URL"
-    }
-  ]
-}
-
-Guidelines:
-- Only mark a claim as TRUE if credible sources clearly support it
-- Only mark a claim as FALSE if credible sources clearly refute it
-- Mark as UNVERIFIED if the sources are contradictory, unclear, or insufficient
-- Focus on the most authoritative sources (educational institutions, scientific publications, etc.)
-- Extract the most relevant information from each source
-- Vary your phrasing in the summary for natural reading
-- In your detailed_analysis, be thorough yet concise - explain your reasoning with evidence
-"""
+ADDITIONAL_CONTEXT_MODE = os.environ.get("ADDITIONAL_CONTEXT_MODE", "lazy")
+ADDITIONAL_CONTEXT_FALLBACK = "Additional context could not be generated."
 
 LLAMA_CONTEXT_PROMPT = """
 You are an expert in providing factual context and background information. You have just received a claim that has been fact-checked.
@@ -96,74 +70,22 @@ Your response will be added as "additional_context" in the fact-checking report.
 app = Flask(__name__)
 CORS(app)  
 
+def warm_up():
+    warm_up_connections(["serper", "google_factcheck", "groq"])
+
+register_health_routes(app, warm_up)
+
 client = OpenAI(api_key=OPENAI_API_KEY)
 
-llm = ChatGroq(
-    api_key=GROQ_API_KEY,
-    model_name="llama-3.1-8b-instant"
+additional_context_cache = TTLCache(
+    "additional_context",
+    ttl=VERDICT_STORE_TTL,
+    max_entries=2048,
+    db_path=VERDICT_STORE_DB or None,
+    max_disk_entries=VERDICT_STORE_MAX_DISK_ENTRIES
 )
-
-def fix_broken_json(json_str):
-    try:
-        json.loads(json_str)
-        return json_str
-    except json.JSONDecodeError:
-        fixed_str = re.sub(r'(".*?":\s*".*?")\s*\n\s*(".*?")',
-                           r'\1,\n  \2', json_str)
-        
-        fixed_str = re.sub(r'(".*?":\s*[^",\s{[].*?[^,\s{[])(\s*\n\s*)(".*?")',
-                           r'\1,\2\3', fixed_str)
-        
-        try:
-            json.loads(fixed_str)
-            return fixed_str
-        except json.JSONDecodeError:
-            try:
-                obj_start = json_str.find('{')
-                obj_end = json_str.rfind('}')
-                if obj_start == -1 or obj_end == -1:
-                    return json_str
-                
-                content = json_str[obj_start+1:obj_end].strip()
-                
-                properties = []
-                current_prop = ""
-                in_quotes = False
-                quote_char = None
-                for i, char in enumerate(content):
-                    current_prop += char
-                    
-                    if char in ['"', "'"]:
-                        if not in_quotes:
-                            in_quotes = True
-                            quote_char = char
-                        elif char == quote_char and content[i-1] != '\\':
-                            in_quotes = False
-                            quote_char = None
-                    
-                    if not in_quotes and char == '"' and i > 0 and content[i-1:i+1] != '\\"':
-                        lookahead = content[i:i+30]
-                        if re.search(r'^"[^"]+"\s*:', lookahead):
-                            if current_prop.strip():
-                                properties.append(current_prop.strip())
-                            current_prop = char
-                
-                if current_prop.strip():
-                    properties.append(current_prop.strip())
-                
-                valid_properties = []
-                for prop in properties:
-                    if ":" in prop:
-                        valid_properties.append(prop.strip().rstrip(','))
-                
-                fixed_str = "{\n  " + ",\n  ".join(valid_properties) + "\n}"
-                
-                json.loads(fixed_str)
-                return fixed_str
-            except:
-                return json_str
-    except Exception:
-        return json_str
+context_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="context")
+on_shutdown(context_executor.shutdown)
 
 def extract_claims(text):
     try:
@@ -176,7 +98,7 @@ def extract_claims(text):
         ]
         
         print("🤖 Sending to Llama 3.1 for claim extraction...")
-        response = llm.invoke(messages)
+        response = invoke_llm(messages, "extract")
         content = response.content
         
         print(f"🤖 Llama 3.1 response: {content}")
@@ -204,68 +126,6 @@ def extract_claims(text):
         traceback.print_exc()
         return []
 
-def check_claim_with_google_factcheck(claim):
-    try:
-        print(f"🔍 Fact-checking with Google API: {claim}")
-        url = "https://factchecktools.googleapis.com/v1alpha1/claims:search"
-        params = {
-            "key": GOOGLE_FACT_CHECK_API_KEY,
-            "query": claim,
-            "languageCode": "en"
-        }
-        
-        print(f"📡 Sending request to Google Fact Check API: {url}")
-        
-        response = requests.get(url, params=params)
-        
-        print(f"📡 API response status code: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            
-            if "claims" in data and len(data["claims"]) > 0:
-                print(f"✅ Found {len(data['claims'])} fact checks")
-                return data
-            else:
-                print("❌ No fact checks found in API response")
-                return {"claims": []}
-        else:
-            print(f"❌ API request failed: {response.status_code}")
-            return {"claims": []}
-    
-    except Exception as e:
-        print(f"❌ Error in Google Fact Check API: {e}")
-        traceback.print_exc()
-        return {"claims": []}
-
-def search_with_serper(query):
-    try:
-        print(f"🔍 Searching with Serper API: {query}")
-        url = "https://google.serper.dev/search"
-        headers = {
-            'X-API-KEY': SERPER_API_KEY,
-            'Content-Type': 'application/json'
-        }
-        payload = {
-            'q': query,
-            'num': 8
-        }
-        
-        response = requests.post(url, headers=headers, json=payload)
-        
-        if response.status_code == 200:
-            data = response.json()
-            print(f"✅ Serper API returned {len(data.get('organic', []))} results")
-            return data
-        else:
-            print(f"❌ Serper API request failed: {response.status_code}")
-            return None
-    
-    except Exception as e:
-        print(f"❌ Error in Serper API: {e}")
-        traceback.print_exc()
-        return None
-
 def add_llama_context(claim, result, summary):
     try:
         print(f"🧠 Getting additional context from Llama for: {claim}")
@@ -276,7 +136,7 @@ def add_llama_context(claim, result, summary):
             SystemMessage(content=context_prompt)
         ]
         
-        response = llm.invoke(messages)
+        response = invoke_llm(messages, "context")
         context = response.content.strip()
         
         print(f"✅ Got additional context: {context[:100]}...")
@@ -284,193 +144,44 @@ def add_llama_context(claim, result, summary):
     except Exception as e:
         print(f"❌ Error getting additional context: {e}")
         traceback.print_exc()
-        return "Additional context could not be generated."
-
-def verify_with_serper_and_llama(claim_data):
-    try:
-        if isinstance(claim_data, dict):
-            claim = claim_data.get("claim", "")
-            context = claim_data.get("context", "")
-            search_query = claim_data.get("search_query", "")
-        else:
-            claim = claim_data
-            context = ""
-            search_query = ""
-        
-        print(f"🔍 Verifying claim with Serper + Llama: {claim}")
-        if context:
-            print(f"📝 Context: {context}")
-        
-        if not search_query:
-            search_query = f"fact check {claim}"
-        
-        print(f"🔍 Using search query: {search_query}")
-        
-        search_results = search_with_serper(search_query)
-        
-        if not search_results or "organic" not in search_results or len(search_results["organic"]) == 0:
-            print("❌ No search results found")
-            result = {
-                "claim": claim,
-                "result": "UNVERIFIED",
-                "summary": "Insufficient evidence available to verify this claim.",
-                "detailed_analysis": "After extensive searching, no reliable sources were found to verify this specific claim. Without credible evidence, it's not possible to determine the accuracy of this statement.",
-                "sources": []
-            }
-            
-            additional_context = add_llama_context(claim, "UNVERIFIED", result["summary"])
-            result["additional_context"] = additional_context
-            
-            return result
-        
-        formatted_results = json.dumps(search_results["organic"][:5], indent=2)
-        
-        verification_prompt = SERPER_VERIFICATION_PROMPT.replace("{{claim}}", claim).replace("{{search_results}}", formatted_results)
-        
-        if context:
-            verification_prompt += f"\n\nAdditional Context: {context}"
-        
-        print(f"🤖 Sending to Llama 3.1 for search results analysis...")
-        
-        messages = [
-            SystemMessage(content=verification_prompt)
-        ]
-        
-        response = llm.invoke(messages)
-        content = response.content
-        
-        print(f"🤖 Llama 3.1 analysis response: {content[:200]}...")
-        
-        try:
-            start_idx = content.find('{')
-            end_idx = content.rfind('}') + 1
-            
-            if start_idx >= 0 and end_idx > start_idx:
-                json_str = content[start_idx:end_idx]
-                
-                fixed_json_str = fix_broken_json(json_str)
-                
-                try:
-                    result = json.loads(fixed_json_str)
-                    print(f"✅ Serper verification result: {result.get('result', 'UNVERIFIED')}")
-                    
-                    if 'claim' not in result:
-                        result['claim'] = claim
-                    
-                    if context:
-                        result['context'] = context
-                    
-                    formatted_sources = []
-                    if 'sources' in result and result['sources']:
-                        for source in result['sources']:
-                            if isinstance(source, dict) and 'name' in source and 'url' in source:
-                                formatted_sources.append({
-                                    'name': source['name'],
-                                    'url': source['url']
-                                })
-                    
-                    if formatted_sources:
-                        result['sources'] = formatted_sources
-                    else:
-                        result['sources'] = []
-                    
-                    additional_context = add_llama_context(claim, result.get("result", "UNVERIFIED"), result.get("summary", ""))
-                    result["additional_context"] = additional_context
-                    
-                    return result
-                except json.JSONDecodeError as e:
-                    print(f"❌ Error decoding fixed JSON: {e}")
-                    print(f"Original JSON string: {json_str}")
-                    print(f"Fixed JSON string: {fixed_json_str}")
-                    raise ValueError(f"JSON decoding error after fix attempt: {e}")
-            else:
-                print("❌ JSON not found in response")
-                raise ValueError("JSON not found in response")
-        
-        except (json.JSONDecodeError, ValueError) as e:
-            print(f"❌ Error processing verification response: {e}")
-            print(f"Full response: {content}")
-            
-            result = {
-                "claim": claim,
-                "result": "UNVERIFIED",
-                "summary": "Technical issues prevented proper verification.",
-                "detailed_analysis": "While search results were found, I was unable to process them correctly to determine the claim's accuracy. The information available was either insufficient or could not be properly analyzed.",
-                "sources": []
-            }
-            
-            additional_context = add_llama_context(claim, "UNVERIFIED", result["summary"])
-            result["additional_context"] = additional_context
-            
-            return result
-    
-    except Exception as e:
-        print(f"❌ Error in Serper verification: {e}")
-        traceback.print_exc()
-        
-        result = {
-            "claim": claim,
-            "result": "UNVERIFIED",
-            "summary": "Technical difficulties interrupted the verification process.",
-            "detailed_analysis": f"An error occurred during the analysis of search results: {str(e)}. Without complete verification, the claim's accuracy cannot be determined.",
-            "sources": []
-        }
-        
-        additional_context = add_llama_context(claim, "UNVERIFIED", result["summary"])
-        result["additional_context"] = additional_context
-        
-        return result
+        return ADDITIONAL_CONTEXT_FALLBACK
+
+CONTEXT_RESULTS = {"TRUE", "FALSE", "UNVERIFIED"}
+MAX_CONTEXT_SUMMARY_CHARS = 2000
+
+def _context_key(claim, result, summary):
+    # Keyed on the whole verdict, so context written for one verdict is never served for another
+    fingerprint = hashlib.sha1(f"{result}\n{summary}".encode("utf-8")).hexdigest()[:12]
+    return f"{VERDICT_VERSION}:{fingerprint}:{canonicalize_claim(claim)}"
+
+def get_additional_context(claim, result, summary):
+    """
+    Additional context for a verdict, generated on first request and cached by claim and verdict
+    """
+    return additional_context_cache.get_or_compute(
+        _context_key(claim, result, summary),
+        lambda: add_llama_context(claim, result, summary),
+        should_cache=lambda context: bool(context) and context != ADDITIONAL_CONTEXT_FALLBACK
+    )
+
+def attach_additional_context(verification):
+    """
+    Attach already-generated context, and in background mode start generating it off the request path
+    """
+    claim = verification.get("claim", "")
+    result = verification.get("result", "UNVERIFIED")
+    summary = verification.get("summary", "")
+    context = additional_context_cache.get(_context_key(claim, result, summary))
+    if context:
+        verification["additional_context"] = context
+    elif ADDITIONAL_CONTEXT_MODE == "background":
+        context_executor.submit(get_additional_context, claim, result, summary)
+    return verification
 
 def verify_claim(claim_obj):
-    if isinstance(claim_obj, dict):
-        claim_text = claim_obj.get("claim", "")
-        check_claim_with_google_factcheck(claim_text)
-        
-        verification = verify_with_serper_and_llama(claim_obj)
-        
-        verification["claim"] = claim_text
-        
-        if "context" in claim_obj and claim_obj["context"]:
-            verification["original_context"] = claim_obj["context"]
-        
-        return verification
-    else:
-        check_claim_with_google_factcheck(claim_obj)
-        return verify_with_serper_and_llama({"claim": claim_obj})
+    return attach_additional_context(verify_claim_shared(claim_obj))
 
-def generate_trust_score(claims):
-    if not claims:
-        return 5.0
-    
-    weights = {"TRUE": 10.0, "FALSE": 0.0, "UNVERIFIED": 5.0}
-    total_weight = sum(weights.get(claim.get("result", "UNVERIFIED"), 5.0) for claim in claims)
-    
-    score = round(total_weight / len(claims), 1)
-    print(f"📊 Generated trust score: {score}")
-    return score
-
-def get_recommendation(trust_score):
-    if trust_score >= 8.0:
-        return "This content appears highly reliable and factually accurate."
-    elif trust_score >= 6.0:
-        return "This content contains a mix of accurate and unverified information. Exercise some caution."
-    elif trust_score >= 4.0:
-        return "This content contains significant unverified information. Verify important claims with additional sources."
-    else:
-        return "This content contains multiple false or misleading claims. Approach with significant skepticism."
-
-@app.route("/check", methods=["POST"])
-def check_text():
-    data = request.json
-    
-    if not data or 'text' not in data:
-        return jsonify({
-            "error": "Missing 'text' field in request"
-        }), 400
-    
-    text = data['text']
-    print(f"🔍 Received text to analyze: {text[:50]}...")
-    
+def claims_for_text(text):
     if len(text.split()) < 20:
         print("📝 Text is short, analyzing as a single claim")
         single_claim = {
@@ -478,62 +189,100 @@ def check_text():
             "context": "User-provided statement for verification",
             "search_query": f"fact check {text}"
         }
-        claims = [single_claim]
-    else:
-        claims = extract_claims(text)
-    
-    if not claims:
-        return jsonify({
-            "error": "Could not extract any verifiable claims from the text",
-            "recommendation": "Try providing text with clear factual statements.",
+        return [single_claim]
+    return extract_claims(text)
+
+def no_claims_error(text):
+    if deadline_expired():
+        return {
+            "error": "Could not extract claims before the request deadline",
             "text": text[:100] + "..." if len(text) > 100 else text
-        }), 400
-    
-    verified_claims = []
-    for claim_obj in claims:
-        claim_text = claim_obj.get("claim", "")
-        print(f"\n==== Verifying claim: {claim_text} ====")
-        if "context" in claim_obj:
-            print(f"📝 Context: {claim_obj.get('context', '')}")
-        if "search_query" in claim_obj:
-            print(f"🔍 Suggested search query: {claim_obj.get('search_query', '')}")
-            
-        verification = verify_claim(claim_obj)
-        verified_claims.append(verification)
-        print(f"==== Verification complete: {verification.get('result', 'UNVERIFIED')} ====\n")
-    
+        }
+    return {
+        "error": "Could not extract any verifiable claims from the text",
+        "recommendation": "Try providing text with clear factual statements.",
+        "text": text[:100] + "..." if len(text) > 100 else text
+    }
+
+def build_text_response(verified_claims, text):
     trust_score = generate_trust_score(verified_claims)
     
-    response = {
-        "verified_claims": verified_claims,
+    return {
+        "verified_claims": [attach_source_fields(claim) for claim in verified_claims],
         "analysis_summary": {
             "total_claims": len(verified_claims),
             "verified_true": sum(1 for claim in verified_claims if claim.get("result") == "TRUE"),
             "verified_false": sum(1 for claim in verified_claims if claim.get("result") == "FALSE"),
             "unverified": sum(1 for claim in verified_claims if claim.get("result") == "UNVERIFIED"),
+            "pending": sum(1 for claim in verified_claims if claim.get("result") == "PENDING"),
+            "partial": any(claim.get("result") == "PENDING" for claim in verified_claims),
             "trust_score": trust_score,
             "recommendation": get_recommendation(trust_score),
             "original_text": text[:1000] + "..." if len(text) > 1000 else text
         }
     }
+
+def check_text_events(text, deadline_seconds=REQUEST_DEADLINE_SECONDS):
+    """
+    Run the text analysis pipeline, yielding (event, data) as each stage finishes:
+    claims, one claim event per verified claim (in completion order) and finally
+    summary with the full /check response, or error. Claims not verified
+    within deadline_seconds come back as PENDING.
+    """
+    yield from deadline_events(_check_text_events, deadline_seconds, text)
+
+def _check_text_events(text):
+    claims = claims_for_text(text)
+    
+    if not claims:
+        yield "error", no_claims_error(text)
+        return
+    
+    yield "claims", {"claims": claims}
+    
+    verified_claims = [None] * len(claims)
+    for index, verification in iter_verified_claims(claims, verify_claim):
+        verified_claims[index] = attach_source_fields(verification)
+        yield "claim", {"index": index, "claim": verification}
     
-    for claim in response["verified_claims"]:
-        source_links = []
-        source_names = []
+    yield "summary", build_text_response(verified_claims, text)
+
+def text_from_request():
+    data = request.json
+    
+    if not data or 'text' not in data:
+        return None, None, (jsonify({
+            "error": "Missing 'text' field in request"
+        }), 400)
+    
+    text = data['text']
+    print(f"🔍 Received text to analyze: {text[:50]}...")
+    return text, deadline_seconds_from(data, request.headers), None
+
+@app.route("/check", methods=["POST"])
+def check_text():
+    text, deadline_seconds, error = text_from_request()
+    if error:
+        return error
+    
+    with deadline_scope(deadline_seconds):
+        claims = claims_for_text(text)
         
-        if "sources" in claim and claim["sources"]:
-            for source in claim["sources"]:
-                if isinstance(source, dict):
-                    if "name" in source and source["name"]:
-                        source_names.append(source["name"])
-                    if "url" in source and source["url"]:
-                        source_links.append(source["url"])
+        if not claims:
+            return jsonify(no_claims_error(text)), 504 if deadline_expired() else 400
         
-        claim["source_names"] = source_names
-        claim["source_links"] = source_links
+        verified_claims = verify_claims_concurrently(claims, verify_claim)
     
     print(f"✅ Analysis complete, sending response")
-    return jsonify(response)
+    return jsonify(build_text_response(verified_claims, text))
+
+@app.route("/check/stream", methods=["POST"])
+def check_text_stream():
+    text, deadline_seconds, error = text_from_request()
+    if error:
+        return error
+    
+    return sse_response(check_text_events(text, deadline_seconds))
 
 @app.route("/check-single", methods=["POST"])
 def check_single_claim():
@@ -553,27 +302,81 @@ def check_single_claim():
         "search_query": f"fact check {claim_text}"
     }
     
-    verification = verify_claim(claim_obj)
+    with deadline_scope(deadline_seconds_from(data, request.headers)):
+        try:
+            verification = verify_claim(claim_obj)
+        except DeadlineExceeded:
+            verification = pending_result(claim_obj)
+    verification = attach_source_fields(verification)
     
-    source_links = []
-    source_names = []
+    print(f"✅ Verification complete: {verification.get('result', 'UNVERIFIED')}")
+    return jsonify(verification)
+
+@app.route("/additional-context", methods=["POST"])
+def additional_context_endpoint():
+    data = request.json
     
-    if "sources" in verification and verification["sources"]:
-        for source in verification["sources"]:
-            if isinstance(source, dict):
-                if "name" in source and source["name"]:
-                    source_names.append(source["name"])
-                if "url" in source and source["url"]:
-                    source_links.append(source["url"])
+    if not data or 'claim' not in data:
+        return jsonify({
+            "error": "Missing 'claim' field in request"
+        }), 400
     
-    verification["source_names"] = source_names
-    verification["source_links"] = source_links
+    claim = data['claim']
+    verdict = get_verdict(claim, VERDICT_VERSION)
+    if verdict is not None:
+        # A verdict this server stored wins over the fields the client sent
+        result = verdict.get("result", "UNVERIFIED")
+        summary = verdict.get("summary", "")
+    else:
+        # Fan-out members, fallback verdicts and verdicts held by another worker
+        # or already evicted are not in the store: use the verdict the client
+        # was sent. Context is cached under a fingerprint of these fields, so
+        # made-up fields never reach the context of a real verdict.
+        result = data.get("result")
+        summary = data.get("summary", "")
+        if result == "PENDING":
+            return jsonify({
+                "error": "This claim has no verdict yet"
+            }), 409
+        if result not in CONTEXT_RESULTS or not isinstance(summary, str) or len(summary) > MAX_CONTEXT_SUMMARY_CHARS:
+            return jsonify({
+                "error": "Send the claim's 'result' and 'summary' from its verification"
+            }), 400
     
-    print(f"✅ Verification complete: {verification.get('result', 'UNVERIFIED')}")
-    return jsonify(verification)
+    return jsonify({
+        "claim": claim,
+        "result": result,
+        "additional_context": get_additional_context(claim, result, summary)
+    })
+
+@app.route("/stats", methods=["GET"])
+def stats():
+    return jsonify({
+        "google_factcheck": factcheck_stats(),
+        "verdict_store": verdict_store_stats(),
+        "search_cache": search_cache.stats(),
+        "additional_context": additional_context_cache.stats(),
+        "rate_limits": rate_limiter_stats(),
+        "upstreams": upstream_stats()
+    })
+
+@app.route("/verdicts/invalidate", methods=["POST"])
+def invalidate_verdict_endpoint():
+    data = request.json
+    
+    if not data or 'claim' not in data:
+        return jsonify({
+            "error": "Missing 'claim' field in request"
+        }), 400
+    
+    invalidate_verdict(data['claim'], VERDICT_VERSION)
+    return jsonify({"success": True, "claim": data['claim']})
 
 if __name__ == "__main__":
     print("🚀 Starting Text-Only Fact-Checking Server - http://localhost:5001/")
-    print("Text Analysis: /check")
+    print("Text Analysis: /check (streaming: /check/stream)")
     print("Single Claim: /check-single")
+    print("Additional Context: /additional-context")
+    print("Production serving: python serve.py server2")
+    warm_up_worker()
     app.run(host="0.0.0.0", port=5002, debug=True)
\ No newline at end of file
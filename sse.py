@@ -0,0 +1,25 @@
+import json
+from flask import Response, stream_with_context
+
+def sse_event(event, data):
+    """
+    Format one Server-Sent Events message
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def sse_response(events):
+    """
+    Stream (event, data) pairs from a generator as text/event-stream
+    """
+    def generate():
+        for event, data in events:
+            yield sse_event(event, data)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
@@ -0,0 +1,105 @@
+import os
+import queue
+import threading
+import traceback
+from concurrent.futures import wait
+from claim_dedupe import CLAIM_DEDUPE_THRESHOLD, claim_signature, claim_similarity, claim_tokens
+from claim_executor import submit_verification
+from deadline import DeadlineExceeded, bind_deadline, remaining_seconds
+
+PIPELINED_ANALYSIS = os.environ.get("PIPELINED_ANALYSIS", "0") == "1"
+PIPELINE_QUEUE_SIZE = int(os.environ.get("PIPELINE_QUEUE_SIZE", 4))
+PIPELINE_MAX_CLAIMS = int(os.environ.get("PIPELINE_MAX_CLAIMS", 12))
+
+_DONE = object()
+
+def run_pipelined_analysis(segments, extract_fn, verify_fn, max_claims=PIPELINE_MAX_CLAIMS):
+    """
+    Run transcription, claim extraction and verification at the same time.
+    segments is an iterator of transcript texts in order (e.g. from
+    iter_chunk_transcripts); each one is handed to extract_fn as soon as it
+    arrives and every new claim is verified as soon as it is extracted. The
+    stages are connected by bounded queues. Yields (event, data) pairs:
+    transcript_segment, claim_extracted, claim and error, plus
+    transcript_truncated if the deadline stopped transcription before the last
+    segment. If the request deadline passes first, yields deadline and stops;
+    claims without a claim event by then were not verified in time.
+    """
+    segment_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    claim_queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    events = queue.Queue()
+
+    def transcribe_stage():
+        try:
+            for index, text in enumerate(segments):
+                events.put(("transcript_segment", {"index": index, "text": text}))
+                segment_queue.put(text)
+        except DeadlineExceeded as e:
+            print(f"⏰ Transcription stage stopped: {e}")
+            events.put(("transcript_truncated", {}))
+        except Exception as e:
+            print(f"❌ Transcription stage failed: {e}")
+            traceback.print_exc()
+            events.put(("error", {"error": "Failed to transcribe video", "status": 500}))
+        finally:
+            segment_queue.put(_DONE)
+
+    def extract_stage():
+        seen = []
+        text = None
+        try:
+            while True:
+                text = segment_queue.get()
+                if text is _DONE:
+                    break
+                if not text or len(seen) >= max_claims:
+                    continue
+                for claim_obj in extract_fn(text):
+                    tokens = claim_tokens(claim_obj.get("claim", ""))
+                    signature = claim_signature(claim_obj.get("claim", ""))
+                    if any(
+                        signature == other_signature and claim_similarity(tokens, other) >= CLAIM_DEDUPE_THRESHOLD
+                        for other, other_signature in seen
+                    ):
+                        print(f"🧬 Skipping duplicate claim: {claim_obj.get('claim', '')}")
+                        continue
+                    if len(seen) >= max_claims:
+                        break
+                    seen.append((tokens, signature))
+                    claim_queue.put(claim_obj)
+        except Exception as e:
+            print(f"❌ Claim extraction stage failed: {e}")
+            traceback.print_exc()
+        finally:
+            # Keep draining so the transcription stage never blocks on a full queue
+            while text is not _DONE:
+                text = segment_queue.get()
+            claim_queue.put(_DONE)
+
+    def verify_stage():
+        futures = []
+        while True:
+            claim_obj = claim_queue.get()
+            if claim_obj is _DONE:
+                break
+            index = len(futures)
+            events.put(("claim_extracted", {"index": index, "claim": claim_obj}))
+            future = submit_verification(claim_obj, verify_fn)
+            future.add_done_callback(lambda f, index=index: events.put(("claim", {"index": index, "claim": f.result()})))
+            futures.append(future)
+        wait(futures)
+        events.put((_DONE, None))
+
+    for stage in (transcribe_stage, extract_stage, verify_stage):
+        threading.Thread(target=bind_deadline(stage), name=f"pipeline-{stage.__name__}", daemon=True).start()
+
+    while True:
+        try:
+            event, data = events.get(timeout=remaining_seconds())
+        except queue.Empty:
+            print("⏰ Request deadline reached, returning the pipeline's partial results")
+            yield "deadline", {}
+            return
+        if event is _DONE:
+            return
+        yield event, data
@@ -0,0 +1,18 @@
+import os
+import pytest
+
+# Keep every cache in memory and let the server modules build their provider
+# clients without real keys; no test talks to a real provider.
+os.environ.setdefault("VERDICT_STORE_DB", "")
+os.environ.setdefault("TRANSCRIPT_CACHE_DB", "")
+os.environ.setdefault("SEARCH_CACHE_DB", "")
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+@pytest.fixture(autouse=True)
+def fresh_circuit_breakers():
+    import resilience
+    # Provider failures simulated by one test must not open a breaker for the next
+    resilience._upstreams.clear()
+    yield
+    resilience._upstreams.clear()
@@ -0,0 +1,68 @@
+import uuid
+import pytest
+import server2
+from claim_verification import VERDICT_VERSION
+from verdict_store import invalidate_verdict, store_verdict
+
+@pytest.fixture
+def llama_calls(monkeypatch):
+    calls = []
+
+    def fake_context(claim, result, summary):
+        calls.append((claim, result, summary))
+        return f"Context for {result}: {summary}"
+
+    monkeypatch.setattr(server2, "add_llama_context", fake_context)
+    return calls
+
+def post_context(body):
+    return server2.app.test_client().post("/additional-context", json=body)
+
+def test_context_uses_the_stored_verdict_not_the_client_fields(llama_calls):
+    claim = f"The sky is green {uuid.uuid4().hex}"
+    store_verdict(claim, VERDICT_VERSION, {"result": "FALSE", "summary": "The sky is blue."})
+
+    response = post_context({"claim": claim, "result": "TRUE", "summary": "Poisoned summary"})
+    assert response.status_code == 200
+    assert response.json["result"] == "FALSE"
+    assert response.json["additional_context"] == "Context for FALSE: The sky is blue."
+    assert llama_calls == [(claim, "FALSE", "The sky is blue.")]
+
+def test_claim_missing_from_the_store_uses_the_verdict_the_client_was_sent(llama_calls):
+    # e.g. a fan-out member, a fallback verdict or a verdict held by another worker
+    claim = f"Never stored {uuid.uuid4().hex}"
+    response = post_context({"claim": claim, "result": "UNVERIFIED", "summary": "No sources found."})
+    assert response.status_code == 200
+    assert response.json["additional_context"] == "Context for UNVERIFIED: No sources found."
+    assert llama_calls == [(claim, "UNVERIFIED", "No sources found.")]
+
+def test_client_fields_never_reach_a_stored_verdicts_context(llama_calls):
+    claim = f"The sky is green {uuid.uuid4().hex}"
+    post_context({"claim": claim, "result": "TRUE", "summary": "Poisoned summary"})
+    store_verdict(claim, VERDICT_VERSION, {"result": "FALSE", "summary": "The sky is blue."})
+    response = post_context({"claim": claim, "result": "TRUE", "summary": "Poisoned summary"})
+    assert response.json["additional_context"] == "Context for FALSE: The sky is blue."
+    assert server2.attach_additional_context({"claim": claim, "result": "FALSE", "summary": "The sky is blue."})["additional_context"] == "Context for FALSE: The sky is blue."
+
+@pytest.mark.parametrize("body, status", [
+    ({"result": "PENDING", "summary": ""}, 409),
+    ({}, 400),
+    ({"result": "MAYBE", "summary": "?"}, 400),
+    ({"result": "TRUE", "summary": "x" * 5000}, 400),
+])
+def test_unusable_client_verdicts_are_rejected(llama_calls, body, status):
+    assert post_context(dict(body, claim=f"Unchecked {uuid.uuid4().hex}")).status_code == status
+    assert llama_calls == []
+
+def test_context_is_cached_per_verdict(llama_calls):
+    claim = f"Coffee stunts growth {uuid.uuid4().hex}"
+    store_verdict(claim, VERDICT_VERSION, {"result": "FALSE", "summary": "No evidence."})
+    post_context({"claim": claim})
+    post_context({"claim": claim.upper()})
+    assert len(llama_calls) == 1
+
+    invalidate_verdict(claim, VERDICT_VERSION)
+    store_verdict(claim, VERDICT_VERSION, {"result": "FALSE", "summary": "Newer studies agree."})
+    response = post_context({"claim": claim})
+    assert response.json["additional_context"] == "Context for FALSE: Newer studies agree."
+    assert len(llama_calls) == 2
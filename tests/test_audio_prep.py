@@ -0,0 +1,40 @@
+import audio_prep
+from audio_prep import prepare_audio, prepared_path_for
+
+def run_recorder(monkeypatch):
+    commands = []
+
+    def run(command, **kwargs):
+        commands.append(command)
+        with open(command[-1], "wb") as file:
+            file.write(b"opus")
+
+    monkeypatch.setattr(audio_prep.subprocess, "run", run)
+    return commands
+
+def test_prepared_path_never_overwrites_the_input():
+    assert prepared_path_for("talk.mp3") == "talk.ogg"
+    assert prepared_path_for("talk.ogg") == "talk.prepared.ogg"
+
+def test_audio_is_downmixed_to_16khz_mono_opus_with_trimmed_silences(monkeypatch, tmp_path):
+    commands = run_recorder(monkeypatch)
+    source = tmp_path / "talk.webm"
+    source.write_bytes(b"audio" * 100)
+
+    output = prepare_audio(str(source))
+    command = commands[0]
+    assert output == str(tmp_path / "talk.ogg")
+    assert command[command.index("-ac") + 1] == "1"
+    assert command[command.index("-ar") + 1] == "16000"
+    assert command[command.index("-c:a") + 1] == "libopus"
+    assert "silenceremove" in command[command.index("-af") + 1]
+    assert "libmp3lame" not in command
+
+def test_silence_trimming_can_be_turned_off(monkeypatch, tmp_path):
+    commands = run_recorder(monkeypatch)
+    monkeypatch.setattr(audio_prep, "AUDIO_TRIM_SILENCE", False)
+    source = tmp_path / "talk.webm"
+    source.write_bytes(b"audio")
+
+    prepare_audio(str(source), str(tmp_path / "out.ogg"))
+    assert "-af" not in commands[0]
@@ -0,0 +1,66 @@
+import json
+import threading
+import time
+import pytest
+from batch_verification import VerificationBatcher, parse_batch_response
+from deadline import DeadlineExceeded, deadline_scope, remaining_seconds
+
+def verdicts_for(prompt):
+    count = prompt.count("--- Claim ")
+    return json.dumps([{"id": index, "result": "TRUE"} for index in range(1, count + 1)])
+
+def verify_in_threads(batcher, count, deadline_seconds):
+    results = [None] * count
+
+    def verify(index):
+        with deadline_scope(deadline_seconds):
+            try:
+                results[index] = batcher.verify(f"Claim {index}", None, "evidence")
+            except DeadlineExceeded as e:
+                results[index] = e
+
+    threads = [threading.Thread(target=verify, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_timer_flushed_batch_runs_under_the_claims_deadline():
+    seen = []
+
+    def invoke(prompt):
+        seen.append(remaining_seconds())
+        return verdicts_for(prompt)
+
+    batcher = VerificationBatcher(invoke, max_batch_size=3, max_wait_seconds=0.05)
+    results = verify_in_threads(batcher, 2, 5)
+    assert results == [{"result": "TRUE"}, {"result": "TRUE"}]
+    assert len(seen) == 1 and seen[0] is not None and seen[0] <= 5
+
+def test_waiting_claim_gives_up_at_its_deadline():
+    def slow_invoke(prompt):
+        time.sleep(0.5)
+        return verdicts_for(prompt)
+
+    batcher = VerificationBatcher(slow_invoke, max_batch_size=3, max_wait_seconds=0.01)
+    start = time.monotonic()
+    results = verify_in_threads(batcher, 2, 0.1)
+    assert all(isinstance(result, DeadlineExceeded) for result in results)
+    assert time.monotonic() - start < 0.4
+
+def test_batching_off_returns_none():
+    batcher = VerificationBatcher(verdicts_for, max_batch_size=1)
+    assert batcher.verify("Claim", None, "evidence") is None
+
+def test_parse_batch_response_keeps_good_items():
+    content = '[{"id": 2, "result": "FALSE"}, {"id": 1, "result": "TRUE", "summary": "has a } brace"}, {"id": 3, result: TRUE}]'
+    assert parse_batch_response(content, 3) == [
+        {"result": "TRUE", "summary": "has a } brace"},
+        {"result": "FALSE"},
+        None
+    ]
+
+@pytest.mark.parametrize("content", ["", "not json", "[]"])
+def test_parse_batch_response_without_verdicts(content):
+    assert parse_batch_response(content, 2) == [None, None]
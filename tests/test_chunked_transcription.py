@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import pytest
+import chunked_transcription
+from chunked_transcription import iter_chunk_transcripts, merge_overlap, plan_chunks
+
+def test_overlapping_words_are_dropped():
+    assert merge_overlap("we went to the store today", "to the store today and bought milk") == "and bought milk"
+
+def test_overlap_ignores_case_and_punctuation():
+    assert merge_overlap("It was, in fact, true.", "in fact true. Then we left") == "Then we left"
+
+def test_single_repeated_word_is_kept():
+    assert merge_overlap("the answer is no", "no one expected it") == "no one expected it"
+
+def test_two_word_match_is_kept():
+    assert merge_overlap("I said thank you", "thank you all for coming") == "thank you all for coming"
+
+def test_no_overlap_leaves_text_unchanged():
+    assert merge_overlap("first chunk ends here", "second chunk starts here") == "second chunk starts here"
+
+def test_empty_chunks():
+    assert merge_overlap("", "some words here") == "some words here"
+    assert merge_overlap("some words here", "") == ""
+
+def test_longest_overlap_wins():
+    assert merge_overlap("a b c a b c", "a b c a b c d") == "d"
+
+def test_short_audio_is_one_chunk():
+    assert plan_chunks(100, [], chunk_seconds=300) == [(0.0, 100, False)]
+
+def test_chunks_are_cut_in_silences():
+    # No silence in the second half of the second window, so that one is a hard cut
+    chunks = plan_chunks(700, [(200, 210), (550, 560)], chunk_seconds=300, overlap=2)
+    assert chunks == [(0.0, 205.0, False), (205.0, 505.0, False), (503.0, 700, True)]
+
+def test_hard_cuts_overlap_the_previous_chunk():
+    chunks = plan_chunks(500, [], chunk_seconds=300, overlap=2)
+    assert chunks == [(0.0, 300.0, False), (298.0, 500, True)]
+
+def test_chunks_are_transcribed_in_parallel_and_yielded_in_order(monkeypatch):
+    monkeypatch.setattr(chunked_transcription, "detect_silences", lambda audio_file: [])
+    monkeypatch.setattr(chunked_transcription, "cut_chunk", lambda audio_file, start, end, output_file: output_file)
+    monkeypatch.setattr(chunked_transcription, "CHUNK_SECONDS", 300)
+    texts = ["one two three four five", "three four five six seven", "eight nine"]
+    barrier = threading.Barrier(3, timeout=2)
+
+    def transcribe(chunk_file):
+        index = int(chunk_file.rsplit("_", 1)[1].split(".")[0])
+        barrier.wait()
+        time.sleep(0.05 * (3 - index))
+        return texts[index]
+
+    segments = list(iter_chunk_transcripts("talk.ogg", transcribe, duration=850))
+    assert segments == ["one two three four five", "six seven", "eight nine"]
+
+@pytest.mark.parametrize("chunk_seconds, overlap", [(2, 2), (1, 5), (300, -1)])
+def test_chunk_length_must_exceed_the_overlap(chunk_seconds, overlap):
+    with pytest.raises(ValueError, match="TRANSCRIBE_CHUNK_SECONDS"):
+        plan_chunks(700, [], chunk_seconds=chunk_seconds, overlap=overlap)
+
+def test_bad_chunk_settings_fail_at_startup():
+    env = dict(os.environ, TRANSCRIBE_CHUNK_SECONDS="2", TRANSCRIBE_CHUNK_OVERLAP_SECONDS="2")
+    result = subprocess.run(
+        [sys.executable, "-c", "import chunked_transcription"],
+        env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True, text=True
+    )
+    assert result.returncode != 0
+    assert "must be greater than" in result.stderr
@@ -0,0 +1,58 @@
+from claim_dedupe import claim_signature, claim_similarity, claim_tokens, collapse_near_duplicates, fan_out_verdict
+from claim_executor import verify_claims_concurrently
+
+def test_similarity_ignores_stopwords_and_punctuation():
+    assert claim_similarity(claim_tokens("The Earth is round."), claim_tokens("earth round")) == 1.0
+    assert claim_similarity(claim_tokens("Cats are mammals"), claim_tokens("Rome is in Italy")) == 0.0
+    assert claim_similarity(set(), claim_tokens("anything")) == 0.0
+
+def test_near_duplicates_share_the_most_detailed_representative():
+    claims = [
+        {"claim": "The Eiffel Tower is in Paris"},
+        {"claim": "Bananas are berries"},
+        {"claim": "The Eiffel Tower is located in Paris"},
+    ]
+    representatives, representative_of = collapse_near_duplicates(claims)
+    assert representatives == [1, 2]
+    assert representative_of == [2, 1, 2]
+
+def test_distinct_claims_are_kept():
+    claims = ["Inflation rose 3% in 2022", "Inflation fell 3% in 2023"]
+    representatives, _ = collapse_near_duplicates(claims)
+    assert representatives == [0, 1]
+
+def test_contradictory_claims_stay_separate():
+    claims = [
+        "The sargassum frogfish has adapted fins that look like tiny fingers",
+        "The sargassum frogfish does not have adapted fins that look like tiny fingers",
+    ]
+    assert claim_similarity(claim_tokens(claims[0]), claim_tokens(claims[1])) >= 0.75
+    assert collapse_near_duplicates(claims) == ([0, 1], [0, 1])
+
+def test_signature_tracks_negations_and_numbers():
+    assert claim_signature("It isn't true") == claim_signature("It is not true")
+    assert claim_signature("It cannot fly") != claim_signature("It can fly")
+    assert claim_signature("Population hit 1,000 in 2020") == (0, frozenset({"1000", "2020"}))
+    rose = ["Inflation rose to 3% in 2022 across the euro area", "Inflation rose to 3% in 2023 across the euro area"]
+    assert collapse_near_duplicates(rose)[0] == [0, 1]
+
+def test_fanned_out_verdict_keeps_the_members_own_claim_and_context():
+    verdict = {"claim": "A b c", "result": "TRUE", "context": "rep context", "original_context": "rep context"}
+    member = fan_out_verdict(verdict, {"claim": "a b c!", "context": "member context"}, "A b c")
+    assert member["claim"] == "a b c!"
+    assert member["context"] == "member context"
+    assert member["duplicate_of"] == "A b c"
+    assert verdict["claim"] == "A b c"
+
+def test_duplicates_are_verified_once():
+    calls = []
+
+    def verify(claim_obj):
+        calls.append(claim_obj["claim"])
+        return {"claim": claim_obj["claim"], "result": "TRUE"}
+
+    claims = [{"claim": "Water boils at 100 degrees"}, {"claim": "water boils at 100 degrees!"}]
+    verified = verify_claims_concurrently(claims, verify)
+    assert len(calls) == 1
+    assert [v["claim"] for v in verified] == [c["claim"] for c in claims]
+    assert all(v["result"] == "TRUE" for v in verified)
@@ -0,0 +1,50 @@
+import threading
+import time
+from claim_executor import iter_verified_claims, run_concurrently, verify_claims_concurrently
+
+def verify_echo(claim_obj):
+    return {"claim": claim_obj["claim"], "result": "TRUE"}
+
+def test_verdicts_come_back_in_input_order():
+    delays = {"slow": 0.1, "medium": 0.05, "fast": 0}
+
+    def verify(claim_obj):
+        time.sleep(delays[claim_obj["claim"]])
+        return verify_echo(claim_obj)
+
+    claims = [{"claim": claim} for claim in delays]
+    assert [v["claim"] for v in verify_claims_concurrently(claims, verify, dedupe=False)] == ["slow", "medium", "fast"]
+
+def test_claims_are_verified_concurrently():
+    barrier = threading.Barrier(3, timeout=2)
+
+    def verify(claim_obj):
+        barrier.wait()
+        return verify_echo(claim_obj)
+
+    claims = [{"claim": f"Claim {i}"} for i in range(3)]
+    assert all(v["result"] == "TRUE" for v in verify_claims_concurrently(claims, verify, dedupe=False))
+
+def test_failing_claim_does_not_fail_the_batch():
+    def verify(claim_obj):
+        if claim_obj["claim"] == "bad":
+            raise RuntimeError("boom")
+        return verify_echo(claim_obj)
+
+    verified = verify_claims_concurrently([{"claim": "good"}, {"claim": "bad"}], verify, dedupe=False)
+    assert [v["result"] for v in verified] == ["TRUE", "UNVERIFIED"]
+    assert verified[1]["claim"] == "bad"
+
+def test_results_are_yielded_as_they_finish():
+    def verify(claim_obj):
+        time.sleep(0.1 if claim_obj["claim"] == "slow" else 0)
+        return verify_echo(claim_obj)
+
+    order = [index for index, _ in iter_verified_claims([{"claim": "slow"}, {"claim": "fast"}], verify, dedupe=False)]
+    assert order == [1, 0]
+
+def test_run_concurrently_keeps_order():
+    assert run_concurrently(lambda: (time.sleep(0.05), "a")[1], lambda: "b") == ["a", "b"]
+
+def test_empty_claims():
+    assert verify_claims_concurrently([], verify_echo) == []
@@ -0,0 +1,72 @@
+import pytest
+import conversation_window
+from conversation_window import fit_conversation
+from ttl_cache import TTLCache
+
+@pytest.fixture(autouse=True)
+def small_window(monkeypatch):
+    monkeypatch.setattr(conversation_window, "CONTEXT_WINDOW_TOKENS", 10000)
+    monkeypatch.setattr(conversation_window, "CONVERSATION_TOKEN_BUDGET", 100)
+    monkeypatch.setattr(conversation_window, "CONVERSATION_SUMMARY_TOKENS", 30)
+    monkeypatch.setattr(conversation_window, "CONVERSATION_FOLD_STEP", 4)
+    monkeypatch.setattr(conversation_window, "summary_cache", TTLCache("test_summary", ttl=60, max_entries=100))
+
+def turns(count):
+    # 40 characters each: 10 tokens plus the per-message overhead
+    return [
+        {"role": "user" if index % 2 == 0 else "assistant", "content": f"message {index:02d} ".ljust(40, ".")}
+        for index in range(count)
+    ]
+
+class Summarizer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, previous, messages):
+        self.calls.append(len(messages))
+        return f"{previous or ''}+{len(messages)}"
+
+def test_short_conversation_is_sent_as_is():
+    summarize = Summarizer()
+    prompt, max_tokens = fit_conversation("system", turns(4), 500, summarize)
+    assert [m["content"] for m in prompt[1:]] == [m["content"] for m in turns(4)]
+    assert prompt[0]["content"] == "system"
+    assert max_tokens == 500
+    assert summarize.calls == []
+
+def test_old_turns_fold_into_a_summary_on_a_step_boundary():
+    summarize = Summarizer()
+    messages = turns(20)
+    prompt, _ = fit_conversation("system", messages, 500, summarize, session_key="a")
+
+    kept = prompt[1:]
+    folded = len(messages) - len(kept)
+    assert folded % 4 == 0
+    assert kept == messages[folded:]
+    assert sum(summarize.calls) == folded
+    assert "Summary of the earlier conversation" in prompt[0]["content"]
+
+def test_summaries_are_reused_for_the_same_history_only():
+    summarize = Summarizer()
+    messages = turns(20)
+    fit_conversation("system", messages, 500, summarize, session_key="a")
+    # Each call summarizes one step, as a whole conversation budget holds no more
+    assert summarize.calls == [4, 4, 4, 4]
+
+    # Two more turns move the fold point by one step: only that step is summarized
+    fit_conversation("system", turns(22), 500, summarize, session_key="a")
+    assert summarize.calls[4:] == [4]
+
+    fit_conversation("system", messages, 500, summarize, session_key="b")
+    assert summarize.calls[5:] == [4, 4, 4, 4]
+
+def test_failed_summary_drops_the_folded_turns():
+    prompt, _ = fit_conversation("system", turns(20), 500, lambda previous, messages: None)
+    assert prompt[0]["content"] == "system"
+    assert len(prompt) < 21
+
+def test_max_tokens_shrinks_to_what_is_left_of_the_window(monkeypatch):
+    monkeypatch.setattr(conversation_window, "CONTEXT_WINDOW_TOKENS", 400)
+    prompt, max_tokens = fit_conversation("system", turns(2), 500, Summarizer())
+    used = sum(conversation_window.message_tokens(m) for m in prompt)
+    assert max_tokens == 400 - conversation_window.CONTEXT_SAFETY_TOKENS - used
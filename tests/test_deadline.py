@@ -0,0 +1,182 @@
+import time
+import uuid
+import httpx
+import pytest
+import claim_verification
+import server1
+import server2
+from claim_executor import verify_claims_concurrently
+from deadline import (
+    DeadlineExceeded, bind_deadline, check_deadline, deadline_events, deadline_scope,
+    deadline_seconds_from, remaining_seconds, stage_timeout, REQUEST_DEADLINE_SECONDS, REQUEST_DEADLINE_MAX_SECONDS
+)
+from streaming_pipeline import run_pipelined_analysis
+
+class NoSlotClient:
+    """
+    Stands in for a pooled provider client whose rate limiter finds no slot
+    before the request deadline
+    """
+
+    def _refuse(self, *args, **kwargs):
+        raise DeadlineExceeded("No request slot before the deadline")
+
+    get = post = _refuse
+
+class NoSlotLLM:
+    model_name = "test-model"
+
+    def invoke(self, messages):
+        raise DeadlineExceeded("No groq request slot before the deadline")
+
+class FailingLLM:
+    model_name = "test-model"
+
+    def invoke(self, messages):
+        raise httpx.ConnectError("connection refused")
+
+ORGANIC = {"organic": [{"title": "Source", "snippet": "Evidence", "link": "https://example.org"}]}
+
+def unique_claims(count):
+    run = uuid.uuid4().hex
+    return [{"claim": f"Claim {i} of run {run}", "search_query": f"query {i} {run}"} for i in range(count)]
+
+def test_remaining_seconds_is_none_outside_a_deadline():
+    assert remaining_seconds() is None
+    assert stage_timeout(5) == 5
+    check_deadline()
+
+def test_stage_timeout_is_capped_by_the_deadline():
+    with deadline_scope(1):
+        assert stage_timeout(30) <= 1
+        assert stage_timeout(0.5) == 0.5
+
+def test_expired_deadline_raises():
+    with deadline_scope(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            check_deadline("test")
+        with pytest.raises(DeadlineExceeded):
+            stage_timeout(5)
+
+def test_bind_deadline_carries_the_deadline_to_other_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    with deadline_scope(10), ThreadPoolExecutor(1) as pool:
+        assert pool.submit(remaining_seconds).result() is None
+        assert pool.submit(bind_deadline(remaining_seconds)).result() > 9
+
+def test_deadline_events_applies_while_the_generator_runs():
+    def events():
+        yield "first", remaining_seconds()
+        yield "second", remaining_seconds()
+    seen = list(deadline_events(events, 5))
+    assert [event for event, _ in seen] == ["first", "second"]
+    assert all(0 < remaining <= 5 for _, remaining in seen)
+    assert remaining_seconds() is None
+
+def test_deadline_seconds_from_body_header_and_cap():
+    assert deadline_seconds_from({"deadline_seconds": 12}, {}) == 12
+    assert deadline_seconds_from({}, {"X-Request-Deadline": "7"}) == 7
+    assert deadline_seconds_from({}, {}) == REQUEST_DEADLINE_SECONDS
+    assert deadline_seconds_from({"deadline_seconds": "junk"}, {}) == REQUEST_DEADLINE_SECONDS
+    assert deadline_seconds_from({"deadline_seconds": 10 ** 6}, {}) == REQUEST_DEADLINE_MAX_SECONDS
+
+@pytest.mark.parametrize("value", ["nan", "NaN", "inf", "-inf", "-5", "0"])
+def test_non_finite_or_non_positive_deadline_falls_back_to_the_default(value):
+    assert deadline_seconds_from({}, {"X-Request-Deadline": value}) == REQUEST_DEADLINE_SECONDS
+    assert deadline_seconds_from({"deadline_seconds": value}, {}, default=30) == 30
+
+def test_claims_whose_lookups_run_out_of_time_are_pending(monkeypatch):
+    monkeypatch.setattr(claim_verification, "get_client", lambda provider: NoSlotClient())
+    with deadline_scope(5):
+        verified = verify_claims_concurrently(unique_claims(4), claim_verification.verify_claim, dedupe=False)
+    assert [verification["result"] for verification in verified] == ["PENDING"] * 4
+
+    summary = server2.build_text_response(verified, "text")["analysis_summary"]
+    assert summary["partial"] is True
+    assert summary["pending"] == 4
+
+def test_claims_whose_llm_call_runs_out_of_time_are_pending(monkeypatch):
+    monkeypatch.setattr(claim_verification, "check_claim_with_google_factcheck", lambda claim: {"claims": []})
+    monkeypatch.setattr(claim_verification, "search_with_serper", lambda query, num=8: ORGANIC)
+    monkeypatch.setattr(claim_verification, "llm", NoSlotLLM())
+    with deadline_scope(5):
+        verified = verify_claims_concurrently(unique_claims(3), claim_verification.verify_claim, dedupe=False)
+    assert [verification["result"] for verification in verified] == ["PENDING"] * 3
+
+def test_claims_still_running_at_the_deadline_are_pending(monkeypatch):
+    def slow_verify(claim_obj):
+        time.sleep(0.5)
+        return {"claim": claim_obj["claim"], "result": "TRUE"}
+    with deadline_scope(0.1):
+        verified = verify_claims_concurrently(unique_claims(2), slow_verify, dedupe=False)
+    assert [verification["result"] for verification in verified] == ["PENDING"] * 2
+
+def test_provider_errors_without_a_deadline_are_still_unverified(monkeypatch):
+    monkeypatch.setattr(claim_verification, "llm", FailingLLM())
+    verification = claim_verification.verify_with_serper_and_llama(unique_claims(1)[0], search_results=ORGANIC)
+    assert verification["result"] == "UNVERIFIED"
+
+def segments_cut_off_after(texts):
+    yield from texts
+    raise DeadlineExceeded("Deadline exceeded with 2 chunks left to transcribe")
+
+def test_pipeline_reports_transcription_cut_off_by_the_deadline():
+    events = list(run_pipelined_analysis(
+        segments_cut_off_after(["First part."]),
+        lambda text: [{"claim": text}],
+        lambda claim_obj: {**claim_obj, "result": "TRUE"}
+    ))
+    names = [event for event, _ in events]
+    assert "transcript_truncated" in names
+    assert names.count("claim") == 1
+
+def test_truncated_video_transcript_marks_the_summary_partial(monkeypatch):
+    stored = []
+    monkeypatch.setattr(server1, "iter_chunk_transcripts", lambda audio_file, transcribe: segments_cut_off_after(["The moon is made of cheese."]))
+    monkeypatch.setattr(server1, "extract_claims", lambda text: [{"claim": text, "search_query": text}])
+    monkeypatch.setattr(server1, "verify_claim", lambda claim_obj: {**claim_obj, "result": "FALSE", "confidence": 90})
+    monkeypatch.setattr(server1, "store_transcript", lambda *args: stored.append(args))
+
+    events = dict(server1.pipelined_video_events("video", {"title": "Test"}, "video.ogg"))
+    summary = events["summary"]["analysis_summary"]
+    assert "transcript_truncated" in events
+    assert summary["partial"] is True
+    assert summary["transcript_truncated"] is True
+    assert summary["pending"] == 0
+    assert stored == []
+
+def test_complete_video_response_is_not_partial():
+    claims = [{"claim": "Water is wet", "result": "TRUE", "confidence": 90}]
+    summary = server1.build_video_response(claims, {}, "Water is wet.")["analysis_summary"]
+    assert summary["partial"] is False
+    assert summary["transcript_truncated"] is False
+
+def test_deadline_seconds_from_uses_the_given_default():
+    assert deadline_seconds_from({}, {}, default=1800) == 1800
+    assert deadline_seconds_from({}, {}, default=None) is None
+    assert deadline_seconds_from({"deadline_seconds": 1200}, {}, default=1800) == 1200
+    assert deadline_seconds_from({"deadline_seconds": 60}, {}, default=None) == 60
+
+def test_no_deadline_when_seconds_is_none():
+    with deadline_scope(None):
+        assert remaining_seconds() is None
+        check_deadline()
+
+    def events():
+        yield "remaining", remaining_seconds()
+
+    assert list(deadline_events(events, None)) == [("remaining", None)]
+
+def test_background_jobs_and_video_analysis_skip_the_request_deadline(monkeypatch):
+    submitted = []
+    monkeypatch.setattr(server1.jobs, "submit", lambda kind, fn, *args: submitted.append(args) or "job")
+    monkeypatch.setattr(server1, "JOB_DEADLINE_SECONDS", 0)
+    client = server1.app.test_client()
+
+    client.post("/jobs/transcribe", json={"video_url": "https://youtu.be/dQw4w9WgXcQ"})
+    client.post("/jobs/transcribe", json={"video_url": "https://youtu.be/dQw4w9WgXcQ", "deadline_seconds": 60})
+    assert [args[-1] for args in submitted] == [0, 60]
+
+    with server1.app.test_request_context(json={"video_url": "https://youtu.be/dQw4w9WgXcQ"}):
+        assert server1.video_id_from_request()[2] == server1.VIDEO_DEADLINE_SECONDS > REQUEST_DEADLINE_SECONDS
@@ -0,0 +1,68 @@
+import asyncio
+import json
+import time
+import claim_verification
+import debate_server
+from provider_clients import run_async
+
+def groq_reply(content):
+    return {"choices": [{"message": {"content": content}}]}
+
+def test_claims_are_checked_concurrently_and_in_order(monkeypatch):
+    async def search(query, num=5):
+        await asyncio.sleep(0.1)
+        return {"organic": [{"title": query, "snippet": "Evidence", "link": "https://example.org"}]}
+
+    async def evaluate(messages, **kwargs):
+        status = "FALSE" if "moon" in messages[-1]["content"] else "TRUE"
+        return groq_reply(json.dumps({"status": status, "confidence": 8, "reason": "Sources say so"}))
+
+    monkeypatch.setattr(debate_server, "search_with_serper_async", search)
+    monkeypatch.setattr(debate_server, "call_groq_api_async", evaluate)
+
+    claims = [{"claim": "Water boils at 100C"}, {"claim": "The moon is cheese"}, {"claim": "Paris is in France"}]
+    start = time.monotonic()
+    verified = run_async(debate_server.verify_factual_claims_async(claims))
+    assert time.monotonic() - start < 0.25
+    assert [v["claim"] for v in verified] == [c["claim"] for c in claims]
+    assert [v["status"] for v in verified] == ["TRUE", "FALSE", "TRUE"]
+    assert verified[0]["sources"] == [{"title": "Water boils at 100C", "link": "https://example.org"}]
+
+def test_failed_claim_comes_back_unverified(monkeypatch):
+    async def search(query, num=5):
+        if query == "bad":
+            raise RuntimeError("boom")
+        return None
+
+    monkeypatch.setattr(debate_server, "search_with_serper_async", search)
+    verified = run_async(debate_server.verify_factual_claims_async([{"claim": "bad"}, {"claim": "no results"}]))
+    assert [v["status"] for v in verified] == ["UNVERIFIED", "UNVERIFIED"]
+    assert verified[1]["reason"] == "No search results found"
+
+def test_fact_check_message_extracts_then_verifies(monkeypatch):
+    async def groq(messages, **kwargs):
+        if kwargs.get("operation") == "extract":
+            return groq_reply(json.dumps({"factual_claims": [{"claim": "Sky is blue", "search_query": "sky colour"}]}))
+        return groq_reply('{"status": "TRUE", "confidence": 9, "reason": "Rayleigh scattering"}')
+
+    async def search(query, num=5):
+        assert query == "sky colour"
+        return {"organic": [{"title": "Sky", "snippet": "Blue", "link": "https://example.org/sky"}]}
+
+    monkeypatch.setattr(debate_server, "call_groq_api_async", groq)
+    monkeypatch.setattr(debate_server, "search_with_serper_async", search)
+    assert [v["status"] for v in debate_server.fact_check_message("The sky is blue.")] == ["TRUE"]
+
+def test_message_without_claims(monkeypatch):
+    async def groq(messages, **kwargs):
+        return groq_reply('{"factual_claims": []}')
+
+    monkeypatch.setattr(debate_server, "call_groq_api_async", groq)
+    assert debate_server.fact_check_message("I think so.") == []
+
+def test_debate_search_goes_through_claim_verifications_helper(monkeypatch):
+    assert debate_server.search_with_serper is claim_verification.search_with_serper
+    searched = []
+    monkeypatch.setattr(debate_server, "search_with_serper", lambda query: searched.append(query) or {"organic": []})
+    assert run_async(debate_server.search_with_serper_async("fact check x")) == {"organic": []}
+    assert searched == ["fact check x"]
@@ -0,0 +1,85 @@
+import pytest
+import debate_server
+from debate_sessions import DebateSessionStore, conversation
+
+def test_sessions_record_exchanges_and_hand_out_copies():
+    store = DebateSessionStore()
+    debate_id = store.create("Cats vs dogs", "Dogs are better.")
+    assert store.add_exchange(debate_id, "Cats are cleaner.", [], "Dogs are loyal.")
+
+    session = store.get(debate_id)
+    session["turns"].clear()
+    assert conversation(store.get(debate_id)) == [
+        {"role": "assistant", "content": "Dogs are better."},
+        {"role": "user", "content": "Cats are cleaner."},
+        {"role": "assistant", "content": "Dogs are loyal."}
+    ]
+
+def test_least_recently_used_session_is_evicted():
+    store = DebateSessionStore(max_sessions=2)
+    first = store.create("a", "a")
+    second = store.create("b", "b")
+    store.get(first)
+    store.create("c", "c")
+    assert store.get(second) is None
+    assert store.get(first) is not None
+    assert store.stats()["evicted"] == 1
+
+def test_idle_sessions_expire(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("debate_sessions.time.time", lambda: clock[0])
+    store = DebateSessionStore(ttl=60)
+    debate_id = store.create("a", "a")
+    clock[0] += 61
+    assert store.get(debate_id) is None
+    assert not store.add_exchange(debate_id, "hi", [], "hello")
+    assert store.stats()["expired"] == 1
+
+@pytest.fixture
+def client(monkeypatch):
+    prompts = []
+
+    def fake_groq(messages, temperature=0.7, max_tokens=800, operation=None):
+        prompts.append((operation, messages))
+        return {"choices": [{"message": {"content": f"{operation} reply"}}]}
+
+    monkeypatch.setattr(debate_server, "call_groq_api", fake_groq)
+    monkeypatch.setattr(debate_server, "fact_check_message", lambda text: [])
+    monkeypatch.setattr(debate_server, "debate_sessions", DebateSessionStore())
+    debate_server.app.testing = True
+    client = debate_server.app.test_client()
+    client.prompts = prompts
+    return client
+
+def test_respond_and_judge_from_debate_id(client):
+    started = client.post("/api/debate/start", json={"topic": "Remote work"}).get_json()
+    debate_id = started["debate_id"]
+
+    reply = client.post("/api/debate/respond", json={"debate_id": debate_id, "message": "Offices waste time."})
+    assert reply.get_json()["response"] == "respond reply"
+    assert reply.get_json()["debate_id"] == debate_id
+
+    client.post("/api/debate/respond", json={"debate_id": debate_id, "message": "Commutes are costly."})
+    operation, messages = client.prompts[-1]
+    # The stored turns are sent with only the new message supplied by the client
+    assert [m["content"] for m in messages[1:]] == [
+        "opening reply", "Offices waste time.", "respond reply", "Commutes are costly."
+    ]
+
+    judged = client.post("/api/debate/judge", json={"debate_id": debate_id})
+    assert judged.status_code == 200
+    operation, messages = client.prompts[-1]
+    assert operation == "judge"
+    assert "Human: Commutes are costly." in messages[1]["content"]
+
+def test_unknown_debate_id_is_404(client):
+    assert client.post("/api/debate/respond", json={"debate_id": "missing", "message": "hi"}).status_code == 404
+    assert client.post("/api/debate/judge", json={"debate_id": "missing"}).status_code == 404
+
+def test_full_history_still_accepted(client):
+    reply = client.post("/api/debate/respond", json={
+        "topic": "Remote work",
+        "messages": [{"role": "user", "content": "Offices waste time."}]
+    }).get_json()
+    assert reply["response"] == "respond reply"
+    assert reply["debate_id"] is None
@@ -0,0 +1,41 @@
+from evidence import domain_authority, estimate_tokens, format_evidence, format_evidence_item, pack_evidence
+
+def result(title, snippet, link):
+    return {"title": title, "snippet": snippet, "link": link, "position": 1, "sitelinks": [{"title": "x"}]}
+
+def test_authority_matches_subdomains_and_suffixes():
+    assert domain_authority("https://www.nasa.gov/moon") == 1.0
+    assert domain_authority("https://en.wikipedia.org/wiki/Moon") == 0.6
+    assert domain_authority("https://physics.mit.edu/page") == 0.9
+    assert domain_authority("https://notnasa.gov.example.com") == 0.0
+    assert domain_authority(None) == 0.0
+
+def test_results_are_reduced_and_ranked_by_relevance_and_authority():
+    organic = [
+        result("Cooking tips", "How to boil pasta", "https://blog.example.com"),
+        result("Moon landing 1969", "Apollo 11 landed on the moon in 1969", "https://random.example.com"),
+        result("Apollo 11 moon landing", "NASA landed on the moon in 1969", "https://www.nasa.gov/apollo"),
+    ]
+    packed = pack_evidence(organic, "Apollo 11 landed on the moon in 1969")
+    assert [item["link"] for item in packed] == ["https://www.nasa.gov/apollo", "https://random.example.com", "https://blog.example.com"]
+    assert set(packed[0]) == {"title", "snippet", "link"}
+
+def test_packing_stays_within_the_token_budget():
+    organic = [result(f"Moon fact {i}", "moon " * 40, f"https://example.com/{i}") for i in range(10)]
+    packed = pack_evidence(organic, "moon", token_budget=150)
+    assert 0 < len(packed) < 10
+    assert estimate_tokens(format_evidence(packed)) <= 150 + len(packed)
+
+def test_best_result_is_kept_and_cut_when_it_alone_is_too_long():
+    packed = pack_evidence([result("Moon", "moon " * 500, "https://example.com")], "moon", token_budget=50)
+    assert len(packed) == 1
+    assert packed[0]["snippet"].endswith("...")
+    assert estimate_tokens(format_evidence_item(1, packed[0])) <= 51
+
+def test_missing_fields_get_placeholders():
+    packed = pack_evidence([{"title": None, "snippet": "", "link": ""}], "anything")
+    assert packed == [{"title": "Unknown Title", "snippet": "No snippet available", "link": "#"}]
+
+def test_max_results():
+    organic = [result(f"Moon {i}", "moon", f"https://example.com/{i}") for i in range(5)]
+    assert len(pack_evidence(organic, "moon", max_results=3)) == 3
@@ -0,0 +1,77 @@
+import uuid
+import claim_verification
+import pytest
+from factcheck_fastpath import factcheck_evidence, rating_to_result, verdict_from_factcheck
+
+def review_data(text, rating, url="https://factcheck.example/review"):
+    return {"claims": [{
+        "text": text,
+        "claimant": "A politician",
+        "claimReview": [{"publisher": {"name": "PolitiFact"}, "textualRating": rating, "url": url, "title": "Review"}]
+    }]}
+
+def test_only_clear_ratings_are_used():
+    assert rating_to_result("False") == "FALSE"
+    assert rating_to_result("Pants on Fire!") == "FALSE"
+    assert rating_to_result("TRUE.") == "TRUE"
+    assert rating_to_result("Mostly true") is None
+    assert rating_to_result("Missing context") is None
+    assert rating_to_result(None) is None
+
+def test_matching_review_becomes_the_verdict():
+    verdict = verdict_from_factcheck("Vaccines cause autism", review_data("Vaccines can cause autism.", "False"))
+    assert verdict["result"] == "FALSE"
+    assert verdict["verification_source"] == "google_factcheck"
+    assert verdict["sources"] == [{"name": "PolitiFact", "url": "https://factcheck.example/review"}]
+    assert "A politician" in verdict["detailed_analysis"]
+
+def test_review_of_another_claim_is_ignored():
+    assert verdict_from_factcheck("The moon landing was filmed in 1969", review_data("Vaccines cause autism", "False")) is None
+    assert verdict_from_factcheck("Anything", None) is None
+
+@pytest.mark.parametrize("claim, reviewed, rating", [
+    ("Vaccines do not cause autism", "Vaccines cause autism", "False"),
+    ("The Great Wall of China is not visible from space", "The Great Wall of China is visible from space", "False"),
+    ("Trump won the 2020 election in Georgia", "Biden won the 2020 election in Georgia", "True"),
+    ("Unemployment fell to 4% in 2019", "Unemployment fell to 4% in 2009", "True"),
+])
+def test_review_of_a_contradicting_claim_is_not_a_verdict(claim, reviewed, rating):
+    assert verdict_from_factcheck(claim, review_data(reviewed, rating)) is None
+
+def test_lowercase_transcript_claim_still_matches():
+    assert verdict_from_factcheck("vaccines cause autism", review_data("Vaccines cause autism", "False"))["result"] == "FALSE"
+
+def test_unmatched_reviews_become_llm_evidence(monkeypatch):
+    claim = f"Vaccines do not cause autism {uuid.uuid4().hex}"
+    monkeypatch.setattr(claim_verification, "check_claim_with_google_factcheck", lambda text: review_data("Vaccines cause autism", "False"))
+    monkeypatch.setattr(claim_verification, "search_with_serper", lambda query: {"organic": [{"title": "CDC", "snippet": "No link", "link": "https://cdc.gov"}]})
+    seen = {}
+
+    def llm(claim_obj, search_results=None):
+        seen["organic"] = search_results["organic"]
+        return {"claim": claim_obj["claim"], "result": "TRUE", "sources": []}
+
+    monkeypatch.setattr(claim_verification, "verify_with_serper_and_llama", llm)
+    verdict = claim_verification.verify_claim({"claim": claim})
+    assert verdict["result"] == "TRUE"
+    assert verdict["verification_source"] == "serper_llm"
+    assert [item["link"] for item in seen["organic"]] == ["https://factcheck.example/review", "https://cdc.gov"]
+    assert "rated it \"False\"" in seen["organic"][0]["snippet"]
+
+def test_evidence_is_capped():
+    data = {"claims": [review_data(f"claim {i}", "False")["claims"][0] for i in range(5)]}
+    assert len(factcheck_evidence(data, max_reviews=2)) == 2
+    assert factcheck_evidence(None) == []
+
+def test_fast_path_skips_the_llm(monkeypatch):
+    claim = f"Vaccines cause autism {uuid.uuid4().hex}"
+    monkeypatch.setattr(claim_verification, "check_claim_with_google_factcheck", lambda text: review_data(claim, "False"))
+    monkeypatch.setattr(claim_verification, "search_with_serper", lambda query: None)
+
+    def no_llm(*args, **kwargs):
+        raise AssertionError("the LLM should not be called")
+
+    monkeypatch.setattr(claim_verification, "verify_with_serper_and_llama", no_llm)
+    verdict = claim_verification.verify_claim({"claim": claim})
+    assert verdict["result"] == "FALSE"
+    assert verdict["verification_source"] == "google_factcheck"
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import threading
+import pytest
+import health
+import gateway
+
+def call(path, method="GET", body=None, asgi_app=None):
+    """
+    Drive the gateway (or another ASGI app) through one ASGI request and
+    return (status, json)
+    """
+    payload = json.dumps(body).encode("utf-8") if body is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("localhost", 5000)
+    }
+    messages = [{"type": "http.request", "body": payload, "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run((asgi_app or gateway.app)(scope, receive, send))
+    status = next(message["status"] for message in sent if message["type"] == "http.response.start")
+    body = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return status, json.loads(body) if body else None
+
+@pytest.mark.parametrize("path, error", [
+    ("/transcribe", "No video URL provided"),
+    ("/check", "Missing 'text' field in request"),
+    ("/api/debate/respond", "Missing required parameters")
+])
+def test_routes_each_path_to_the_service_that_defines_it(path, error):
+    assert call(path, "POST", {}) == (400, {"error": error})
+
+def test_unknown_path_is_404():
+    status, payload = call("/nowhere")
+    assert status == 404
+    assert "GET /nowhere" in payload["error"]
+
+def test_stats_merge_every_service():
+    status, payload = call("/stats")
+    assert status == 200
+    # server1 and server2 report the verdict store, server2 its context cache, the debate server its sessions
+    assert {"verdict_store", "additional_context", "debate_sessions", "upstreams"} <= set(payload)
+
+def test_readiness_follows_the_shared_health_state(monkeypatch):
+    monkeypatch.setattr(health, "_ready", threading.Event())
+    monkeypatch.setattr(health, "_draining", threading.Event())
+    assert call("/readyz")[0] == 503
+    health._ready.set()
+    assert call("/readyz") == (200, {"status": "ready"})
+    assert call("/healthz") == (200, {"status": "ok"})
+
+def test_wsgi_body_is_cut_to_its_content_length():
+    def app(environ, start_response):
+        start_response("200 OK", [("Content-Type", "application/json"), ("Content-Length", "5")])
+        return [b"[1,", b"2]trailing garbage"]
+
+    assert call("/", asgi_app=gateway.ConcurrentWsgiToAsgi(app)) == (200, [1, 2])
@@ -0,0 +1,55 @@
+import threading
+import pytest
+from flask import Flask
+import health
+import serve
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(health, "_ready", threading.Event())
+    monkeypatch.setattr(health, "_draining", threading.Event())
+    monkeypatch.setattr(health, "_warm_ups", [])
+    monkeypatch.setattr(health, "_shutdown_hooks", [])
+    app = Flask(__name__)
+    return app
+
+def test_ready_only_after_warm_up_and_until_draining(app):
+    warmed = []
+    health.register_health_routes(app, lambda: warmed.append(1))
+    client = app.test_client()
+
+    assert client.get("/healthz").status_code == 200
+    assert client.get("/readyz").status_code == 503
+
+    health.warm_up_worker()
+    assert warmed == [1]
+    assert client.get("/readyz").json == {"status": "ready"}
+
+    health.begin_draining()
+    assert client.get("/readyz").json == {"status": "draining"}
+    assert client.get("/healthz").status_code == 200
+
+def test_failed_warm_up_still_reports_ready(app):
+    def broken():
+        raise RuntimeError("no network")
+
+    health.register_health_routes(app, broken)
+    health.warm_up_worker()
+    assert health.is_ready()
+
+def test_shutdown_hooks_all_run(app):
+    ran = []
+    health.on_shutdown(lambda: ran.append("first"))
+    health.on_shutdown(lambda: 1 / 0)
+    health.on_shutdown(lambda: ran.append("last"))
+    health.run_shutdown_hooks()
+    assert ran == ["first", "last"]
+
+def test_server_settings_can_be_tuned_per_server(monkeypatch):
+    monkeypatch.setenv("SERVER2_WORKERS", "6")
+    monkeypatch.setenv("SERVER2_PORT", "8002")
+    assert serve.server_settings("server2") == {"bind": "0.0.0.0:8002", "workers": 6, "threads": serve.DEFAULT_THREADS["server2"]}
+    assert serve.server_settings("server1")["workers"] == 1
+
+def test_unknown_server_prints_usage():
+    assert serve.main(["serve.py", "nope"]) == 2
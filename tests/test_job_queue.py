@@ -0,0 +1,73 @@
+import threading
+import time
+from job_queue import JobManager
+
+def wait_for(manager, job_id, status, timeout=2):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = manager.get(job_id)
+        if job["status"] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job never reached {status}: {manager.get(job_id)}")
+
+def test_job_records_stages_progress_and_result():
+    def events(name):
+        yield "video_info", {"title": name}
+        yield "claim", {"index": 0}
+        yield "claim", {"index": 1}
+        yield "summary", {"done": name}
+
+    manager = JobManager(max_workers=1)
+    job_id = manager.submit("transcribe", events, "talk")
+    job = wait_for(manager, job_id, "done")
+    assert job["result"] == {"done": "talk"}
+    assert job["claims_verified"] == 2
+    assert [timing["stage"] for timing in job["stage_timings"]] == ["video_info", "summary"]
+    assert job["finished_at"] is not None
+
+def test_job_is_queued_until_a_worker_is_free():
+    release = threading.Event()
+
+    def blocking():
+        release.wait(2)
+        yield "summary", {}
+
+    manager = JobManager(max_workers=1)
+    first = manager.submit("transcribe", blocking)
+    second = manager.submit("transcribe", blocking)
+    wait_for(manager, first, "running")
+    assert manager.get(second)["status"] == "queued"
+    release.set()
+    wait_for(manager, second, "done")
+
+def test_error_event_and_exceptions_fail_the_job():
+    def error_events():
+        yield "error", {"error": "Failed to download audio from video", "status": 500}
+
+    def crashing():
+        raise RuntimeError("boom")
+        yield
+
+    def no_summary():
+        yield "video_info", {}
+
+    manager = JobManager(max_workers=2)
+    assert wait_for(manager, manager.submit("t", error_events), "failed")["error"] == "Failed to download audio from video"
+    assert wait_for(manager, manager.submit("t", crashing), "failed")["error"] == "boom"
+    assert wait_for(manager, manager.submit("t", no_summary), "failed")["error"] == "Pipeline finished without a result"
+
+def test_finished_jobs_are_pruned():
+    def done():
+        yield "summary", {}
+
+    manager = JobManager(max_workers=1, max_retained=2)
+    job_ids = []
+    for _ in range(3):
+        job_ids.append(manager.submit("t", done))
+        wait_for(manager, job_ids[-1], "done")
+    assert manager.get(job_ids[0]) is None
+    assert manager.get(job_ids[1])["status"] == "done"
+
+def test_unknown_job():
+    assert JobManager(max_workers=1).get("missing") is None
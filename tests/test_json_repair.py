@@ -0,0 +1,43 @@
+import json
+import os
+import time
+import pytest
+from json_repair import fix_broken_json, repair_json_value
+
+CORPUS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "json_repair_corpus.json")
+
+with open(CORPUS_FILE) as corpus_file:
+    CORPUS = json.load(corpus_file)
+
+@pytest.mark.parametrize("case", CORPUS, ids=[case["name"] for case in CORPUS])
+def test_corpus(case):
+    assert json.loads(fix_broken_json(case["input"])) == case["expected"]
+
+def test_unescaped_quotes_stay_inside_the_string():
+    assert repair_json_value('{"summary": "He said "no", then left", "result": "FALSE"}') == {
+        "summary": 'He said "no", then left', "result": "FALSE"
+    }
+
+def test_truncated_output_keeps_what_was_complete():
+    assert repair_json_value('{"result": "TRUE", "summary": "Cut of') == {"result": "TRUE", "summary": "Cut of"}
+    assert repair_json_value('{"result": "TRUE", "sources": [{"name": "NASA"') == {"result": "TRUE", "sources": [{"name": "NASA"}]}
+
+def test_text_without_json():
+    with pytest.raises(ValueError):
+        repair_json_value("no json here")
+    assert fix_broken_json("no json here") == "no json here"
+
+def test_repair_is_linear_time():
+    def seconds_for(size):
+        text = '{"summary": "' + 'word "quoted", ' * size
+        start = time.perf_counter()
+        repair_json_value(text)
+        return time.perf_counter() - start
+
+    small, large = seconds_for(2000), seconds_for(20000)
+    assert large < small * 30
+
+def test_surrogate_escapes_encode_as_utf8():
+    value = repair_json_value('{"summary": "\\ud83d\\ude00 ok \\ud83d alone", "result": "TRUE",}')
+    assert value["summary"] == "\U0001F600 ok \ufffd alone"
+    value["summary"].encode("utf-8")
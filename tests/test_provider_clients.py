@@ -0,0 +1,31 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import provider_clients
+from provider_clients import get_client, provider_timeout, run_async
+from rate_limiter import RateLimitedTransport
+
+def test_each_provider_gets_one_shared_client():
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: get_client("serper"), range(16)))
+    assert all(client is clients[0] for client in clients)
+    assert get_client("groq") is not clients[0]
+
+def test_client_uses_the_provider_timeouts_and_rate_limiter():
+    client = get_client("google_factcheck")
+    assert client.timeout.read == provider_clients.READ_TIMEOUTS["google_factcheck"]
+    assert client.timeout.connect == provider_clients.CONNECT_TIMEOUT
+    assert isinstance(client._transport, RateLimitedTransport)
+
+def test_unknown_provider_gets_a_default_read_timeout():
+    assert provider_timeout("other").read == 30.0
+
+def test_run_async_uses_one_background_loop():
+    async def loop_thread():
+        await asyncio.sleep(0)
+        return asyncio.get_running_loop(), threading.current_thread().name
+
+    first = run_async(loop_thread())
+    second = run_async(loop_thread())
+    assert first == second
+    assert first[1] == "provider-loop"
@@ -0,0 +1,144 @@
+import asyncio
+import time
+import uuid
+import httpx
+import pytest
+import rate_limiter
+from deadline import DeadlineExceeded, deadline_scope
+from rate_limiter import (
+    AsyncRateLimitedTransport, ProviderLimiter, RateLimitedTransport, exhausted_window_seconds, parse_duration, retry_after_seconds
+)
+
+def test_parse_duration_forms():
+    assert parse_duration("7") == 7
+    assert parse_duration("1m2.5s") == 62.5
+    assert parse_duration("250ms") == 0.25
+    assert parse_duration("soon") is None
+    assert parse_duration(None) is None
+
+def test_retry_after_seconds_and_http_dates():
+    assert retry_after_seconds(httpx.Headers({"Retry-After": "3"})) == 3
+    assert retry_after_seconds(httpx.Headers({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0
+    assert retry_after_seconds(httpx.Headers({})) is None
+
+def test_exhausted_window_waits_for_the_reset():
+    headers = httpx.Headers({
+        "x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "2s",
+        "x-ratelimit-remaining-tokens": "100", "x-ratelimit-reset-tokens": "9s"
+    })
+    assert exhausted_window_seconds(headers) == 2
+    assert exhausted_window_seconds(httpx.Headers({"x-ratelimit-remaining-requests": "5"})) is None
+
+def test_concurrency_grows_on_success_and_halves_when_throttled():
+    limiter = ProviderLimiter("test", rate=1000)
+    start = limiter.concurrency_limit
+    for _ in range(10):
+        assert limiter.try_acquire() == 0
+        limiter.release()
+    grown = limiter.concurrency_limit
+    assert grown > start
+
+    limiter.try_acquire()
+    limiter.release(throttled=True, headers=httpx.Headers({"Retry-After": "5"}))
+    assert limiter.concurrency_limit == pytest.approx(grown / 2)
+    assert limiter.try_acquire() > 4
+
+def test_token_bucket_limits_the_rate():
+    limiter = ProviderLimiter("test", rate=1, burst=2)
+    assert limiter.try_acquire() == 0
+    limiter.release()
+    assert limiter.try_acquire() == 0
+    limiter.release()
+    assert limiter.try_acquire() > 0.5
+
+def test_no_slot_before_the_deadline():
+    limiter = ProviderLimiter("test", rate=0.1, burst=1)
+    limiter.try_acquire()
+    limiter.release()
+    with pytest.raises(DeadlineExceeded):
+        limiter.acquire(give_up_at=time.monotonic() + 0.1)
+
+def transport_for(responses):
+    calls = []
+
+    def handle(request):
+        calls.append(request)
+        return responses.pop(0)
+
+    provider = f"test-{uuid.uuid4().hex}"
+    return RateLimitedTransport(provider, httpx.MockTransport(handle)), calls
+
+def test_throttled_requests_are_retried(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "backoff_delay", lambda attempt: 0)
+    transport, calls = transport_for([httpx.Response(429), httpx.Response(503), httpx.Response(200, json={"ok": True})])
+    response = httpx.Client(transport=transport).get("https://provider.example/search")
+    assert response.json() == {"ok": True}
+    assert len(calls) == 3
+    assert transport.limiter.stats()["retries"] == 2
+
+def test_client_errors_are_not_retried(monkeypatch):
+    transport, calls = transport_for([httpx.Response(400)])
+    assert httpx.Client(transport=transport).get("https://provider.example/search").status_code == 400
+    assert len(calls) == 1
+
+def test_request_timeouts_are_fitted_to_the_deadline():
+    seen = []
+
+    def handle(request):
+        seen.append(request.extensions["timeout"])
+        return httpx.Response(200)
+
+    transport = RateLimitedTransport(f"test-{uuid.uuid4().hex}", httpx.MockTransport(handle))
+    with deadline_scope(2):
+        httpx.Client(transport=transport, timeout=30).get("https://provider.example/search")
+    assert all(value <= 2 for value in seen[0].values())
+
+def test_server_errors_are_only_retried_for_idempotent_requests(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "backoff_delay", lambda attempt: 0)
+    transport, calls = transport_for([httpx.Response(500), httpx.Response(200)])
+    assert httpx.Client(transport=transport).post("https://provider.example/chat", json={}).status_code == 500
+    assert len(calls) == 1
+
+    transport, calls = transport_for([httpx.Response(502), httpx.Response(200)])
+    assert httpx.Client(transport=transport).get("https://provider.example/search").status_code == 200
+    assert len(calls) == 2
+
+    transport, calls = transport_for([httpx.Response(429), httpx.Response(200)])
+    assert httpx.Client(transport=transport).post("https://provider.example/chat", json={}).status_code == 200
+    assert len(calls) == 2
+
+def test_dropped_connection_is_not_retried_for_a_post(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "backoff_delay", lambda attempt: 0)
+    calls = []
+
+    def handle(request):
+        calls.append(request)
+        raise httpx.RemoteProtocolError("connection dropped", request=request)
+
+    transport = RateLimitedTransport(f"test-{uuid.uuid4().hex}", httpx.MockTransport(handle))
+    with pytest.raises(httpx.RemoteProtocolError):
+        httpx.Client(transport=transport).post("https://provider.example/chat", json={})
+    assert len(calls) == 1
+    assert transport.limiter.stats()["in_flight"] == 0
+
+class SlowBody(httpx.SyncByteStream):
+    def __iter__(self):
+        yield b"slow "
+        yield b"body"
+
+def test_slot_is_held_until_the_body_is_read():
+    transport, _ = transport_for([httpx.Response(200, stream=SlowBody())])
+    client = httpx.Client(transport=transport)
+    with client.stream("GET", "https://provider.example/search") as response:
+        assert transport.limiter.stats()["in_flight"] == 1
+        assert response.read() == b"slow body"
+    assert transport.limiter.stats()["in_flight"] == 0
+
+def test_async_slot_is_released_after_the_body():
+    async def fetch():
+        transport = AsyncRateLimitedTransport(f"test-{uuid.uuid4().hex}", httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True})))
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("https://provider.example/search")
+        return response.json(), transport.limiter.stats()["in_flight"]
+
+    assert asyncio.run(fetch()) == ({"ok": True}, 0)
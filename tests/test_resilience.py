@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+import pytest
+import resilience
+from deadline import deadline_scope
+from resilience import CircuitOpenError, get_upstream, hedged_call
+
+@pytest.fixture
+def hedging(monkeypatch):
+    monkeypatch.setattr(resilience, "HEDGE_ENABLED", True)
+    monkeypatch.setattr(resilience, "HEDGE_MIN_SAMPLES", 3)
+    monkeypatch.setattr(resilience, "HEDGE_MIN_DELAY_SECONDS", 0.01)
+    monkeypatch.setattr(resilience, "HEDGE_MAX_RATIO", 1.0)
+
+def test_unhedged_calls_run_on_the_callers_thread():
+    threads = []
+    assert hedged_call("test", lambda: threads.append(threading.current_thread()) or "ok") == "ok"
+    assert threads == [threading.current_thread()]
+
+def test_hedge_delay_is_tracked_per_operation(hedging):
+    upstream = get_upstream("test")
+    for _ in range(3):
+        upstream.allow()
+        upstream.record_latency(0.05, "extract")
+        upstream.record_latency(2.0, "verify")
+    assert upstream.hedge_delay("extract") == pytest.approx(0.05)
+    assert upstream.hedge_delay("verify") == pytest.approx(2.0)
+    assert upstream.hedge_delay("judge") is None
+    assert set(upstream.stats()["operations"]) == {"extract", "verify"}
+
+def test_slow_call_is_hedged_on_the_providers_pool(hedging):
+    upstream = get_upstream("test")
+    for _ in range(3):
+        upstream.allow()
+        upstream.record_latency(0.01, "verify")
+    calls = []
+
+    def call():
+        calls.append(threading.current_thread().name)
+        if len(calls) == 1:
+            time.sleep(0.5)
+            return "slow"
+        return "fast"
+
+    assert hedged_call("test", call, operation="verify") == "fast"
+    assert all(name.startswith("hedge-test") for name in calls)
+    assert upstream.stats()["hedge_wins"] == 1
+
+def test_circuit_opens_after_repeated_failures(monkeypatch):
+    monkeypatch.setattr(resilience, "CIRCUIT_FAILURE_THRESHOLD", 2)
+
+    def fail():
+        raise ConnectionError("down")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            hedged_call("test", fail)
+    with pytest.raises(CircuitOpenError):
+        hedged_call("test", fail)
+    assert hedged_call("test", fail, fallback=None) is None
+
+def test_half_open_probe_is_never_hedged(hedging, monkeypatch):
+    monkeypatch.setattr(resilience, "CIRCUIT_RESET_SECONDS", 0)
+    upstream = get_upstream("test")
+    for _ in range(3):
+        upstream.allow()
+        upstream.record_latency(0.01, "verify")
+    upstream.record_failure()
+    upstream.state = resilience.OPEN
+    calls = []
+
+    def slow_probe():
+        calls.append(1)
+        time.sleep(0.1)
+        return "ok"
+
+    assert hedged_call("test", slow_probe, operation="verify") == "ok"
+    assert calls == [1]
+    assert upstream.stats()["circuit"] == resilience.CLOSED
+
+def test_async_call_out_of_deadline_does_not_open_the_circuit(monkeypatch):
+    monkeypatch.setattr(resilience, "CIRCUIT_FAILURE_THRESHOLD", 1)
+
+    async def timeout():
+        await asyncio.sleep(0.02)
+        raise TimeoutError("read timed out")
+
+    with deadline_scope(0.01):
+        with pytest.raises(TimeoutError):
+            asyncio.run(resilience.hedged_call_async("test", timeout))
+    assert get_upstream("test").stats()["circuit"] == resilience.CLOSED
+    assert get_upstream("test").stats()["failures"] == 0
+    with pytest.raises(TimeoutError):
+        asyncio.run(resilience.hedged_call_async("test", timeout))
+    assert get_upstream("test").stats()["circuit"] == resilience.OPEN
@@ -0,0 +1,56 @@
+import os
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from search_cache import cached_search, search_cache_key
+
+RESULTS = {"organic": [{"title": "Result", "snippet": "Text", "link": "https://example.org"}]}
+
+def unique_query():
+    return f"query {uuid.uuid4().hex}"
+
+def test_query_key_ignores_case_and_spacing():
+    assert search_cache_key("  Is  the Earth ROUND ", 8) == search_cache_key("is the earth round", 8)
+    assert search_cache_key("is the earth round", 8) != search_cache_key("is the earth round", 5)
+
+def test_results_are_reused():
+    query = unique_query()
+    calls = []
+    fetch = lambda: calls.append(1) or RESULTS
+    assert cached_search(query, 8, fetch) == RESULTS
+    assert cached_search(query.upper(), 8, fetch) == RESULTS
+    assert calls == [1]
+
+def test_failed_and_empty_searches_are_not_cached():
+    query = unique_query()
+    calls = []
+    cached_search(query, 8, lambda: calls.append(1) or None)
+    cached_search(query, 8, lambda: calls.append(1) or {"organic": []})
+    assert cached_search(query, 8, lambda: calls.append(1) or RESULTS) == RESULTS
+    assert len(calls) == 3
+
+def test_concurrent_searches_are_coalesced():
+    query = unique_query()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return RESULTS
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: cached_search(query, 8, fetch), range(5)))
+    assert results == [RESULTS] * 5
+    assert calls == [1]
+
+def test_search_cache_is_kept_in_the_cache_data_dir(tmp_path):
+    env = {key: value for key, value in os.environ.items() if key != "SEARCH_CACHE_DB"}
+    env["CACHE_DATA_DIR"] = str(tmp_path)
+    output = subprocess.run(
+        [sys.executable, "-c", "import search_cache; print(search_cache.search_cache.stats()['persistent'], search_cache.SEARCH_CACHE_DB)"],
+        env=env, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    assert output[-2:] == ["True", str(tmp_path / "search.sqlite3")]
@@ -0,0 +1,36 @@
+import json
+import server2
+from sse import sse_event
+
+def parse_events(body):
+    events = []
+    for message in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in message.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+def test_sse_event_format():
+    assert sse_event("claim", {"index": 0}) == 'event: claim\ndata: {"index": 0}\n\n'
+
+def test_check_stream_sends_claims_then_each_verdict_then_the_summary(monkeypatch):
+    claims = [{"claim": "Water is wet"}, {"claim": "Fire is cold"}]
+    monkeypatch.setattr(server2, "claims_for_text", lambda text: claims)
+    monkeypatch.setattr(server2, "verify_claim", lambda claim_obj: {
+        "claim": claim_obj["claim"], "result": "TRUE" if "Water" in claim_obj["claim"] else "FALSE", "sources": []
+    })
+
+    response = server2.app.test_client().post("/check/stream", json={"text": "Water is wet. Fire is cold."})
+    assert response.mimetype == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    events = parse_events(response.get_data(as_text=True))
+    names = [event for event, _ in events]
+    assert names == ["claims", "claim", "claim", "summary"]
+    assert events[0][1]["claims"] == claims
+    assert sorted(data["index"] for event, data in events if event == "claim") == [0, 1]
+    summary = events[-1][1]["analysis_summary"]
+    assert (summary["verified_true"], summary["verified_false"]) == (1, 1)
+
+def test_check_stream_reports_missing_text_as_an_error():
+    response = server2.app.test_client().post("/check/stream", json={})
+    assert response.status_code == 400
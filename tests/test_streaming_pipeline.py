@@ -0,0 +1,50 @@
+import threading
+from streaming_pipeline import run_pipelined_analysis
+
+def verify_true(claim_obj):
+    return {**claim_obj, "result": "TRUE"}
+
+def test_claims_are_extracted_while_later_segments_are_still_transcribing():
+    first_claim_extracted = threading.Event()
+
+    def segments():
+        yield "Segment one."
+        # The second segment only arrives once the first one's claim has been extracted
+        assert first_claim_extracted.wait(2)
+        yield "Segment two."
+
+    def extract(text):
+        claims = [{"claim": f"Claim from {text}"}]
+        first_claim_extracted.set()
+        return claims
+
+    # segments() fails unless extraction ran before the second segment was transcribed
+    events = list(run_pipelined_analysis(segments(), extract, verify_true))
+    assert sorted(data["claim"]["claim"] for event, data in events if event == "claim") == [
+        "Claim from Segment one.", "Claim from Segment two."
+    ]
+
+def test_duplicate_claims_across_segments_are_verified_once():
+    events = list(run_pipelined_analysis(
+        iter(["a", "b"]),
+        lambda text: [{"claim": "The Eiffel Tower is in Paris"}],
+        verify_true
+    ))
+    assert [event for event, _ in events].count("claim") == 1
+
+def test_claim_limit():
+    events = list(run_pipelined_analysis(
+        iter(["Rome Paris", "Oslo Lima", "Kyiv Baku"]),
+        lambda text: [{"claim": f"{city} is a capital"} for city in text.split()],
+        verify_true,
+        max_claims=3
+    ))
+    assert [event for event, _ in events].count("claim") == 3
+
+def test_transcription_failure_is_reported():
+    def segments():
+        yield "Segment one."
+        raise RuntimeError("whisper down")
+
+    events = list(run_pipelined_analysis(segments(), lambda text: [], verify_true))
+    assert ("error", {"error": "Failed to transcribe video", "status": 500}) in events
@@ -0,0 +1,17 @@
+import uuid
+from transcript_cache import get_cached_transcript, store_transcript
+
+def test_transcript_is_reused_for_the_same_model():
+    video_id = uuid.uuid4().hex[:11]
+    store_transcript(video_id, "Hello world.", {"title": "Test"}, "whisper-1")
+    cached = get_cached_transcript(video_id, "whisper-1")
+    assert cached["transcript"] == "Hello world."
+    assert cached["video_info"] == {"title": "Test"}
+
+def test_transcript_from_another_model_is_not_reused():
+    video_id = uuid.uuid4().hex[:11]
+    store_transcript(video_id, "Hello world.", {"title": "Test"}, "whisper-1")
+    assert get_cached_transcript(video_id, "gpt-4o-transcribe") is None
+
+def test_unknown_video_misses():
+    assert get_cached_transcript(uuid.uuid4().hex[:11], "whisper-1") is None
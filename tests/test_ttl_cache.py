@@ -0,0 +1,101 @@
+import threading
+import time
+import ttl_cache
+from ttl_cache import TTLCache
+
+def test_reads_do_not_write_to_the_database(tmp_path):
+    cache = TTLCache("test", db_path=str(tmp_path / "cache.sqlite3"))
+    cache.set("key", {"value": 1})
+    changes = cache._db.total_changes
+
+    assert cache.get("key") == {"value": 1}
+    assert TTLCache("test", db_path=str(tmp_path / "cache.sqlite3")).get("key") == {"value": 1}
+    assert cache._db.total_changes == changes
+
+def test_recently_read_entries_survive_the_disk_trim(tmp_path):
+    db_path = str(tmp_path / "cache.sqlite3")
+    cache = TTLCache("test", db_path=db_path, max_disk_entries=2)
+    cache.set("a", 1)
+    time.sleep(0.01)
+    cache.set("b", 2)
+    time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.set("c", 3)
+
+    reopened = TTLCache("test", db_path=db_path)
+    assert reopened.get("a") == 1
+    assert reopened.get("b") is None
+    assert reopened.get("c") == 3
+
+def test_writes_remove_expired_rows(tmp_path):
+    cache = TTLCache("test", db_path=str(tmp_path / "cache.sqlite3"))
+    cache.set("old", 1, ttl=0.01)
+    time.sleep(0.02)
+    cache.set("new", 2)
+    keys = [key for (key,) in cache._db.execute("SELECT key FROM cache_entries WHERE cache = 'test'")]
+    assert keys == ["new"]
+
+def test_touches_are_flushed_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(ttl_cache, "TOUCH_FLUSH_ENTRIES", 2)
+    cache = TTLCache("test", db_path=str(tmp_path / "cache.sqlite3"))
+    cache.set("a", 1)
+    cache.set("b", 2)
+    changes = cache._db.total_changes
+
+    cache.get("a")
+    assert cache._db.total_changes == changes
+    cache.get("b")
+    assert cache._db.total_changes == changes + 2
+
+def test_expired_entries_are_not_returned():
+    cache = TTLCache("test", ttl=0.01)
+    cache.set("key", "value")
+    time.sleep(0.02)
+    assert cache.get("key") is None
+
+def test_concurrent_computations_are_coalesced():
+    cache = TTLCache("test")
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("key", compute))) for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value"] * 4
+    assert calls == [1]
+    assert cache.stats()["coalesced"] == 3
+
+def test_cache_db_path_defaults_to_memory(monkeypatch):
+    monkeypatch.delenv("TEST_CACHE_DB", raising=False)
+    monkeypatch.setattr(ttl_cache, "CACHE_DATA_DIR", "")
+    assert ttl_cache.cache_db_path("TEST_CACHE_DB", "test.sqlite3") is None
+
+def test_cache_db_path_uses_the_data_directory(monkeypatch, tmp_path):
+    data_dir = tmp_path / "data"
+    monkeypatch.delenv("TEST_CACHE_DB", raising=False)
+    monkeypatch.setattr(ttl_cache, "CACHE_DATA_DIR", str(data_dir))
+    assert ttl_cache.cache_db_path("TEST_CACHE_DB", "test.sqlite3") == str(data_dir / "test.sqlite3")
+    assert data_dir.is_dir()
+
+def test_explicit_cache_db_setting_wins(monkeypatch, tmp_path):
+    monkeypatch.setattr(ttl_cache, "CACHE_DATA_DIR", str(tmp_path))
+    monkeypatch.setenv("TEST_CACHE_DB", "/var/lib/sherlock/test.sqlite3")
+    assert ttl_cache.cache_db_path("TEST_CACHE_DB", "test.sqlite3") == "/var/lib/sherlock/test.sqlite3"
+    monkeypatch.setenv("TEST_CACHE_DB", "")
+    assert ttl_cache.cache_db_path("TEST_CACHE_DB", "test.sqlite3") is None
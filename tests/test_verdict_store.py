@@ -0,0 +1,42 @@
+import uuid
+import verdict_store
+from verdict_store import canonicalize_claim, get_verdict, invalidate_verdict, store_verdict, verdict_version
+
+def unique_claim():
+    return f"The Eiffel Tower is in Paris {uuid.uuid4().hex}"
+
+def test_canonical_claim_folds_case_punctuation_and_spacing():
+    assert canonicalize_claim("  The Earth is ROUND!! ") == canonicalize_claim("the earth, is round")
+    assert canonicalize_claim("Ｃａｆé") == "café"
+
+def test_verdict_is_reused_for_a_rephrased_claim():
+    claim = unique_claim()
+    store_verdict(claim, "v1", {"claim": claim, "result": "TRUE", "summary": "Yes.", "confidence": 9})
+    verdict = get_verdict(claim.upper() + "!", "v1")
+    assert verdict["result"] == "TRUE"
+    assert verdict["cached"] is True
+    assert verdict["claim"] == claim.upper() + "!"
+    assert "confidence" not in verdict
+
+def test_verdicts_are_isolated_by_version():
+    claim = unique_claim()
+    store_verdict(claim, "v1", {"result": "TRUE"})
+    assert get_verdict(claim, "v2") is None
+
+def test_version_changes_with_prompt_or_model():
+    assert verdict_version("prompt", "model") == verdict_version("prompt", "model")
+    assert verdict_version("prompt", "model") != verdict_version("prompt 2", "model")
+    assert verdict_version("prompt", "model") != verdict_version("prompt", "model 2")
+
+def test_invalidated_verdict_is_gone():
+    claim = unique_claim()
+    store_verdict(claim, "v1", {"result": "FALSE"})
+    invalidate_verdict(claim, "v1")
+    assert get_verdict(claim, "v1") is None
+
+def test_empty_claim_is_not_stored():
+    store_verdict("?!", "v1", {"result": "TRUE"})
+    assert get_verdict("", "v1") is None
+
+def test_disk_tier_is_capped():
+    assert verdict_store.verdict_cache.max_disk_entries == verdict_store.VERDICT_STORE_MAX_DISK_ENTRIES > 0
@@ -0,0 +1,72 @@
+import os
+import threading
+import pytest
+import server1
+from youtube_media import VIDEO_INFO_DEFAULTS, video_info_from
+
+class BlockingDownloader:
+    """
+    Resolves the page straight away, then holds the download until released
+    """
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def fetch_audio(self, video_id, output_base, on_info=None):
+        video_info = {"title": f"Video {video_id}"}
+        if on_info:
+            on_info(video_info)
+        assert self.release.wait(5)
+        downloaded_file = f"{output_base}.webm"
+        with open(downloaded_file, "wb") as file:
+            file.write(b"audio")
+        return video_info, downloaded_file
+
+@pytest.fixture
+def downloader(monkeypatch):
+    fake = BlockingDownloader()
+    monkeypatch.setattr(server1, "downloader", fake)
+    monkeypatch.setattr(server1, "prepare_audio", lambda source, target: os.replace(source, target))
+    return fake
+
+def test_video_info_arrives_before_the_download_finishes(downloader, tmp_path):
+    audio_file = str(tmp_path / "video.ogg")
+    events = server1.download_audio_events("abc", audio_file)
+
+    assert next(events) == ("video_info", {"title": "Video abc"})
+    assert not os.path.exists(audio_file)
+
+    downloader.release.set()
+    assert next(events) == ("downloaded", {"title": "Video abc"})
+    assert os.path.exists(audio_file)
+
+def test_stopping_early_removes_the_audio_file(downloader, tmp_path):
+    audio_file = str(tmp_path / "video.ogg")
+    events = server1.download_audio_events("abc", audio_file)
+    next(events)
+
+    downloader.release.set()
+    events.close()
+    assert not os.path.exists(audio_file)
+
+def test_audio_file_is_removed_when_chunking_check_fails(downloader, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(server1, "get_cached_transcript", lambda video_id, model: None)
+
+    def probe_fails(audio_file):
+        raise RuntimeError("ffprobe failed")
+
+    monkeypatch.setattr(server1, "needs_chunking", probe_fails)
+    downloader.release.set()
+
+    with pytest.raises(RuntimeError):
+        list(server1._analyze_video_events("abc", True))
+    assert not os.path.exists(tmp_path / "abc.ogg")
+
+def test_video_info_fills_missing_fields():
+    assert video_info_from(None) == VIDEO_INFO_DEFAULTS
+    video_info = video_info_from({"title": "Talk", "view_count": 0, "like_count": None, "extra": 1})
+    assert video_info["title"] == "Talk"
+    assert video_info["view_count"] == 0
+    assert video_info["like_count"] == VIDEO_INFO_DEFAULTS["like_count"]
+    assert "extra" not in video_info
@@ -0,0 +1,34 @@
+import os
+from ttl_cache import TTLCache, cache_db_path
+
+TRANSCRIPT_CACHE_MAX_ENTRIES = int(os.environ.get("TRANSCRIPT_CACHE_MAX_ENTRIES", 64))
+TRANSCRIPT_CACHE_MAX_DISK_ENTRIES = int(os.environ.get("TRANSCRIPT_CACHE_MAX_DISK_ENTRIES", 1000))
+TRANSCRIPT_CACHE_DB = cache_db_path("TRANSCRIPT_CACHE_DB", "transcripts.sqlite3")
+
+transcript_cache = TTLCache(
+    "transcripts",
+    max_entries=TRANSCRIPT_CACHE_MAX_ENTRIES,
+    db_path=TRANSCRIPT_CACHE_DB,
+    max_disk_entries=TRANSCRIPT_CACHE_MAX_DISK_ENTRIES
+)
+
+def get_cached_transcript(video_id, whisper_model):
+    """
+    Return {"transcript", "video_info", "whisper_model"} for a video transcribed
+    earlier with the same Whisper model, or None
+    """
+    entry = transcript_cache.get(video_id)
+    if entry is None:
+        return None
+    if entry.get("whisper_model") != whisper_model:
+        print(f"♻️ Cached transcript for {video_id} used {entry.get('whisper_model')}, re-transcribing with {whisper_model}")
+        return None
+    print(f"⚡ Transcript cache hit for video ID: {video_id}")
+    return entry
+
+def store_transcript(video_id, transcript, video_info, whisper_model):
+    transcript_cache.set(video_id, {
+        "transcript": transcript,
+        "video_info": video_info,
+        "whisper_model": whisper_model
+    })
@@ -0,0 +1,302 @@
+import asyncio
+import copy
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Reads record recency in memory; it reaches the SQLite tier with the next
+# write, or once this many reads or seconds have piled up
+TOUCH_FLUSH_ENTRIES = 256
+TOUCH_FLUSH_SECONDS = 60
+CACHE_DATA_DIR = os.environ.get("CACHE_DATA_DIR", "")
+
+def cache_db_path(setting, filename):
+    """
+    SQLite file for a persistent cache: the path in the setting environment
+    variable if it is set (empty for memory only), otherwise filename inside
+    CACHE_DATA_DIR, or None (memory only) when no data directory is configured
+    """
+    path = os.environ.get(setting)
+    if path is not None:
+        return path or None
+    if not CACHE_DATA_DIR:
+        return None
+    os.makedirs(CACHE_DATA_DIR, exist_ok=True)
+    return os.path.join(CACHE_DATA_DIR, filename)
+
+class TTLCache:
+    """
+    In-memory LRU cache with per-entry TTL, an optional SQLite tier that
+    survives restarts, and coalescing of concurrent computations per key.
+    Values must be JSON-serializable when the SQLite tier is enabled.
+    """
+
+    def __init__(self, name, ttl=None, max_entries=1024, db_path=None, max_disk_entries=None):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._async_inflight = {}
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._touched = {}
+        self._touches_flushed_at = time.monotonic()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        if db_path:
+            self._open_db()
+
+    def _open_db(self):
+        try:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                "cache TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL, accessed_at REAL NOT NULL, PRIMARY KEY (cache, key))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS cache_entries_expiry ON cache_entries (cache, expires_at)")
+            self._db.commit()
+            print(f"💾 {self.name} cache persisted to {self.db_path}")
+        except Exception as e:
+            print(f"⚠️ Could not open {self.name} cache database {self.db_path}: {e}")
+            traceback.print_exc()
+            self._db = None
+
+    def _expires_at(self, ttl):
+        ttl = self.ttl if ttl is None else ttl
+        return time.time() + ttl if ttl else None
+
+    def _db_get(self, key):
+        if self._db is None:
+            return None
+        try:
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM cache_entries WHERE cache = ? AND key = ?",
+                    (self.name, key)
+                ).fetchone()
+                if row is None:
+                    return None
+                value, expires_at = row
+                if expires_at is not None and expires_at <= time.time():
+                    self._db.execute("DELETE FROM cache_entries WHERE cache = ? AND key = ?", (self.name, key))
+                    self._db.commit()
+                    return None
+            return json.loads(value), expires_at
+        except Exception as e:
+            print(f"⚠️ {self.name} cache read failed: {e}")
+            return None
+
+    def _touch(self, key):
+        """
+        Note that key was read, for the SQLite tier's least-recently-used trim
+        """
+        if self._db is None:
+            return
+        with self._lock:
+            self._touched[key] = time.time()
+            due = (len(self._touched) >= TOUCH_FLUSH_ENTRIES
+                   or time.monotonic() - self._touches_flushed_at >= TOUCH_FLUSH_SECONDS)
+        if due:
+            self.flush_touches()
+
+    def _take_touches(self):
+        with self._lock:
+            touched, self._touched = self._touched, {}
+            self._touches_flushed_at = time.monotonic()
+        return [(accessed_at, self.name, key) for key, accessed_at in touched.items()]
+
+    def _write_touches(self, touches):
+        # Caller holds _db_lock and commits
+        if touches:
+            self._db.executemany("UPDATE cache_entries SET accessed_at = ? WHERE cache = ? AND key = ?", touches)
+
+    def flush_touches(self):
+        """
+        Write the recency of entries read since the last flush to the SQLite tier
+        """
+        touches = self._take_touches()
+        if self._db is None or not touches:
+            return
+        try:
+            with self._db_lock:
+                self._write_touches(touches)
+                self._db.commit()
+        except Exception as e:
+            print(f"⚠️ {self.name} cache recency update failed: {e}")
+
+    def _db_set(self, key, value, expires_at):
+        if self._db is None:
+            return
+        touches = self._take_touches()
+        try:
+            with self._db_lock:
+                self._write_touches(touches)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache_entries (cache, key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (self.name, key, json.dumps(value), expires_at, time.time())
+                )
+                # Expired rows nobody reads again would otherwise stay until the size cap pushes them out
+                self._db.execute(
+                    "DELETE FROM cache_entries WHERE cache = ? AND expires_at IS NOT NULL AND expires_at <= ?",
+                    (self.name, time.time())
+                )
+                if self.max_disk_entries:
+                    self._db.execute(
+                        "DELETE FROM cache_entries WHERE cache = ? AND key IN ("
+                        "SELECT key FROM cache_entries WHERE cache = ? ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                        (self.name, self.name, self.max_disk_entries)
+                    )
+                self._db.commit()
+        except Exception as e:
+            print(f"⚠️ {self.name} cache write failed: {e}")
+
+    def _db_delete(self, key=None):
+        if self._db is None:
+            return
+        try:
+            with self._db_lock:
+                if key is None:
+                    self._db.execute("DELETE FROM cache_entries WHERE cache = ?", (self.name,))
+                else:
+                    self._db.execute("DELETE FROM cache_entries WHERE cache = ? AND key = ?", (self.name, key))
+                self._db.commit()
+        except Exception as e:
+            print(f"⚠️ {self.name} cache delete failed: {e}")
+
+    def _memory_set(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            hit = False
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    hit = True
+                else:
+                    del self._entries[key]
+        if hit:
+            self._touch(key)
+            return copy.deepcopy(value)
+
+        stored = self._db_get(key)
+        if stored is not None:
+            value, expires_at = stored
+            self._memory_set(key, value, expires_at)
+            with self._lock:
+                self.hits += 1
+            self._touch(key)
+            return copy.deepcopy(value)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value, ttl=None):
+        expires_at = self._expires_at(ttl)
+        value = copy.deepcopy(value)
+        self._memory_set(key, value, expires_at)
+        self._db_set(key, value, expires_at)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        self._db_delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self._db_delete()
+
+    def get_or_compute(self, key, compute, should_cache=lambda value: value is not None):
+        """
+        Return the cached value for key, or run compute() once even if many
+        threads ask for the same key at the same time
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return copy.deepcopy(future.result())
+
+        try:
+            value = compute()
+            if should_cache(value):
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def aget_or_compute(self, key, compute, should_cache=lambda value: value is not None):
+        """
+        Async counterpart of get_or_compute; compute is a zero-argument coroutine function.
+        Must always be awaited on the same event loop.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        future = self._async_inflight.get(key)
+        if future is not None:
+            with self._lock:
+                self.coalesced += 1
+            return copy.deepcopy(await asyncio.shield(future))
+
+        future = asyncio.get_running_loop().create_future()
+        self._async_inflight[key] = future
+        try:
+            value = await compute()
+            if should_cache(value):
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved so an unwaited future doesn't log it
+            future.exception()
+            raise
+        finally:
+            self._async_inflight.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "persistent": self._db is not None
+            }
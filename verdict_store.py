@@ -0,0 +1,60 @@
+import hashlib
+import os
+import re
+import unicodedata
+from ttl_cache import TTLCache, cache_db_path
+
+VERDICT_STORE_TTL = float(os.environ.get("VERDICT_STORE_TTL", 7 * 24 * 60 * 60))
+VERDICT_STORE_MAX_ENTRIES = int(os.environ.get("VERDICT_STORE_MAX_ENTRIES", 4096))
+VERDICT_STORE_MAX_DISK_ENTRIES = int(os.environ.get("VERDICT_STORE_MAX_DISK_ENTRIES", VERDICT_STORE_MAX_ENTRIES * 10))
+VERDICT_STORE_DB = cache_db_path("VERDICT_STORE_DB", "verdicts.sqlite3")
+
+verdict_cache = TTLCache(
+    "verdicts",
+    ttl=VERDICT_STORE_TTL,
+    max_entries=VERDICT_STORE_MAX_ENTRIES,
+    db_path=VERDICT_STORE_DB,
+    max_disk_entries=VERDICT_STORE_MAX_DISK_ENTRIES
+)
+
+STORED_FIELDS = ["result", "summary", "detailed_analysis", "sources", "verification_source"]
+
+def canonicalize_claim(claim):
+    """
+    Fold case, unicode forms, punctuation and whitespace so trivially different
+    phrasings of the same claim share a verdict
+    """
+    text = unicodedata.normalize("NFKC", str(claim)).lower()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+def verdict_version(prompt, model_name):
+    """
+    Short fingerprint of the verification prompt and model, so changing either
+    stops old verdicts from being served
+    """
+    return hashlib.sha1(f"{model_name}\n{prompt}".encode("utf-8")).hexdigest()[:12]
+
+def _verdict_key(claim, version):
+    return f"{version}:{canonicalize_claim(claim)}"
+
+def get_verdict(claim, version):
+    verdict = verdict_cache.get(_verdict_key(claim, version))
+    if verdict is not None:
+        print(f"⚡ Verdict store hit: {claim}")
+        verdict["claim"] = claim
+        verdict["cached"] = True
+    return verdict
+
+def store_verdict(claim, version, verification):
+    if not canonicalize_claim(claim):
+        return
+    verdict = {field: verification[field] for field in STORED_FIELDS if field in verification}
+    verdict_cache.set(_verdict_key(claim, version), verdict)
+
+def invalidate_verdict(claim, version):
+    verdict_cache.delete(_verdict_key(claim, version))
+    print(f"🗑 Verdict invalidated: {claim}")
+
+def verdict_store_stats():
+    return verdict_cache.stats()
@@ -0,0 +1,81 @@
+import os
+import yt_dlp
+from deadline import check_deadline, stage_timeout
+
+FFMPEG_LOCATION = os.environ.get("FFMPEG_LOCATION", "/opt/homebrew/bin/ffmpeg")
+YTDLP_SOCKET_TIMEOUT = float(os.environ.get("YTDLP_SOCKET_TIMEOUT", 20))
+
+VIDEO_INFO_DEFAULTS = {
+    "title": "YouTube Video",
+    "upload_date": "Unknown Date",
+    "duration": "Unknown Duration",
+    "view_count": "Unknown Views",
+    "like_count": "Unknown Likes"
+}
+
+def video_url_for(video_id):
+    return f"https://www.youtube.com/watch?v={video_id}"
+
+def _abort_past_deadline(progress):
+    # yt-dlp aborts the download when a progress hook raises
+    check_deadline("audio download")
+
+def video_info_from(info):
+    """
+    Pick the fields the API reports out of a yt-dlp info dict
+    """
+    video_info = {}
+    for field, default in VIDEO_INFO_DEFAULTS.items():
+        value = info.get(field) if info else None
+        video_info[field] = value if value is not None else default
+    return video_info
+
+class YouTubeDownloader:
+    """
+    In-process yt-dlp engine. One extract_info() call resolves the video page
+    once and returns both the metadata and the downloaded audio.
+    """
+
+    def __init__(self, ffmpeg_location=FFMPEG_LOCATION, **options):
+        self.base_options = {
+            "quiet": True,
+            "no_warnings": True,
+            "noplaylist": True,
+            "ffmpeg_location": ffmpeg_location,
+            **options
+        }
+
+    def _deadline_options(self):
+        """
+        Socket timeout sized to the request deadline, and a hook that stops
+        the download once it has passed
+        """
+        return {
+            "socket_timeout": stage_timeout(YTDLP_SOCKET_TIMEOUT, "audio download"),
+            "progress_hooks": [_abort_past_deadline]
+        }
+
+    def fetch_audio(self, video_id, output_base, on_info=None):
+        """
+        Download the smallest audio-only stream as-is (no re-encode) and return
+        (video_info, downloaded_file). on_info, if given, is called with the
+        video info as soon as the page is resolved, before the download starts.
+        """
+        options = dict(
+            self.base_options,
+            format="worstaudio[vcodec=none]/worstaudio/bestaudio/best",
+            outtmpl=f"{output_base}.%(ext)s",
+            **self._deadline_options()
+        )
+        with yt_dlp.YoutubeDL(options) as ydl:
+            info = ydl.extract_info(video_url_for(video_id), download=False)
+            video_info = video_info_from(info)
+            if on_info:
+                on_info(video_info)
+            check_deadline("audio download")
+            info = ydl.process_ie_result(info, download=True)
+        downloads = info.get("requested_downloads") or [{}]
+        downloaded_file = downloads[0].get("filepath") or ydl.prepare_filename(info)
+        return video_info, downloaded_file
+
+downloader = YouTubeDownloader()